@@ -0,0 +1,192 @@
+# =====================================================
+# 🗄️ DATA LIFECYCLE (Audit_Log partitions, cold-row archival)
+# =====================================================
+# Audit_Log is range-partitioned by month: future months are pre-created and
+# months past retention are copied to Audit_Log_Archive (or a compressed file)
+# and dropped with ALTER TABLE ... DROP PARTITION, which is instant.
+#
+# Orders / Payment / Review carry foreign keys, which partitioned tables cannot
+# have, so their cold rows are moved to the *_Archive tables in chunks instead.
+# Only finished orders (Delivered / Cancelled) are archived, together with
+# their payments. Lifetime rollups (Vendor_Review_Stats, *_Sales_Summary) keep
+# counting archived rows; their rebuild procedures read the archives too, as
+# do vendor scores (scoring.py, fn_calculate_performance).
+import os
+import time
+from datetime import date, datetime, timedelta
+
+from export import EXPORT_DIR, stream_query
+
+AUDIT_RETENTION_MONTHS = 6
+ORDER_RETENTION_DAYS = 365
+REVIEW_RETENTION_DAYS = 730
+PARTITIONS_AHEAD = 3          # months of empty Audit_Log partitions kept ready
+ARCHIVE_CHUNK = 5000          # rows moved per transaction
+FINISHED_ORDER_STATUSES = ("Delivered", "Cancelled")
+
+AUDIT_PARTITIONS = """
+    SELECT PARTITION_NAME, PARTITION_DESCRIPTION, TABLE_ROWS
+    FROM information_schema.PARTITIONS
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'Audit_Log'
+    ORDER BY PARTITION_ORDINAL_POSITION
+"""
+
+_COLD_ORDERS_WHERE = f"""
+    WHERE Order_Date < %s AND Status IN ({", ".join(f"'{s}'" for s in FINISHED_ORDER_STATUSES)})
+"""
+COLD_ORDERS = "SELECT Order_ID FROM Orders" + _COLD_ORDERS_WHERE + "ORDER BY Order_Date LIMIT %s FOR UPDATE"
+COLD_ORDERS_COUNT = "SELECT COUNT(*) FROM Orders" + _COLD_ORDERS_WHERE
+COLD_REVIEWS = "SELECT Review_ID FROM Review WHERE Review_Date < %s ORDER BY Review_Date LIMIT %s FOR UPDATE"
+COLD_REVIEWS_COUNT = "SELECT COUNT(*) FROM Review WHERE Review_Date < %s"
+
+# (archive statement, delete statement) per chunk; payments go before their orders
+_ORDER_MOVES = [
+    ("INSERT INTO Payment_Archive SELECT * FROM Payment WHERE Order_ID IN ({ids})",
+     "DELETE FROM Payment WHERE Order_ID IN ({ids})"),
+    ("INSERT INTO Orders_Archive SELECT * FROM Orders WHERE Order_ID IN ({ids})",
+     "DELETE FROM Orders WHERE Order_ID IN ({ids})"),
+]
+_REVIEW_MOVES = [
+    ("INSERT INTO Review_Archive SELECT * FROM Review WHERE Review_ID IN ({ids})",
+     "DELETE FROM Review WHERE Review_ID IN ({ids})"),
+]
+
+# Tables changed by an archive run (for cache invalidation)
+ARCHIVE_WRITES = {"orders", "payment", "review", "audit_log"}
+
+
+def month_start(d, months_back=0):
+    total = d.year * 12 + d.month - 1 - months_back
+    return date(total // 12, total % 12 + 1, 1)
+
+
+def _partition_bound(description):
+    # PARTITION_DESCRIPTION looks like "'2026-02-01 00:00:00'" or "MAXVALUE"
+    if description is None or description.upper() == "MAXVALUE":
+        return None
+    return datetime.strptime(description.strip("'")[:10], "%Y-%m-%d").date()
+
+
+def audit_partitions(conn):
+    cur = conn.cursor()
+    cur.execute(AUDIT_PARTITIONS)
+    parts = [(name, _partition_bound(desc), rows or 0) for name, desc, rows in cur.fetchall()]
+    cur.close()
+    conn.rollback()
+    return parts
+
+
+def ensure_partitions(conn, months_ahead=PARTITIONS_AHEAD, today=None):
+    # Splits pmax so every month up to `months_ahead` from now has its own partition
+    today = today or date.today()
+    target = month_start(today, -(months_ahead + 1))
+    bounds = [b for _, b, _ in audit_partitions(conn) if b is not None]
+    added = []
+    cur = conn.cursor()
+    upper = max(bounds) if bounds else month_start(today)
+    while upper < target:
+        nxt = month_start(upper, -1)
+        name = f"p{upper:%Y%m}"
+        cur.execute(f"""
+            ALTER TABLE Audit_Log REORGANIZE PARTITION pmax INTO (
+                PARTITION {name} VALUES LESS THAN ('{nxt:%Y-%m-%d}'),
+                PARTITION pmax VALUES LESS THAN (MAXVALUE)
+            )""")
+        added.append(name)
+        upper = nxt
+    cur.close()
+    return added
+
+
+def archive_audit_log(conn, months=AUDIT_RETENTION_MONTHS, target="table", fmt="csv.gz", today=None, dry_run=False):
+    # Moves whole partitions older than `months` to Audit_Log_Archive or to files
+    cutoff = month_start(today or date.today(), months)
+    archived = []
+    for name, bound, rows in audit_partitions(conn):
+        if bound is None or bound > cutoff:
+            continue
+        if dry_run:
+            archived.append((name, rows, None))
+            continue
+        path = None
+        cur = conn.cursor()
+        if target == "file":
+            path = os.path.join(EXPORT_DIR, "archive", f"audit_log_{name}.{fmt}")
+            # Report what was written, not the TABLE_ROWS estimate
+            rows = stream_query(conn, f"SELECT * FROM Audit_Log PARTITION ({name})", (), path, fmt).rows
+        else:
+            cur.execute(f"INSERT INTO Audit_Log_Archive SELECT * FROM Audit_Log PARTITION ({name})")
+            rows = cur.rowcount
+            conn.commit()
+        # p_history is the catch-all for old rows: empty it rather than dropping it
+        if name == "p_history":
+            cur.execute(f"ALTER TABLE Audit_Log TRUNCATE PARTITION {name}")
+        else:
+            cur.execute(f"ALTER TABLE Audit_Log DROP PARTITION {name}")
+        cur.close()
+        archived.append((name, rows, path))
+    return archived
+
+
+def _count(conn, sql, cutoff):
+    cur = conn.cursor()
+    cur.execute(sql, (cutoff,))
+    n = cur.fetchone()[0]
+    cur.close()
+    conn.rollback()
+    return n
+
+
+def _move_chunks(conn, select_sql, cutoff, moves, chunk_size):
+    # Each chunk is one transaction: lock the cold rows, copy them, delete them
+    moved = 0
+    while True:
+        conn.rollback()
+        cur = conn.cursor()
+        try:
+            cur.execute(select_sql, (cutoff, chunk_size))
+            ids = [r[0] for r in cur.fetchall()]
+            if not ids:
+                conn.rollback()
+                return moved
+            placeholders = ", ".join(["%s"] * len(ids))
+            for archive_sql, _ in moves:
+                cur.execute(archive_sql.format(ids=placeholders), ids)
+            for _, delete_sql in moves:
+                cur.execute(delete_sql.format(ids=placeholders), ids)
+            conn.commit()
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            cur.close()
+        moved += len(ids)
+        if len(ids) < chunk_size:
+            return moved
+
+
+def _cutoff(days):
+    return datetime.combine(date.today(), datetime.min.time()) - timedelta(days=days)
+
+
+def archive_orders(conn, days=ORDER_RETENTION_DAYS, chunk_size=ARCHIVE_CHUNK, dry_run=False):
+    if dry_run:
+        return _count(conn, COLD_ORDERS_COUNT, _cutoff(days))
+    return _move_chunks(conn, COLD_ORDERS, _cutoff(days), _ORDER_MOVES, chunk_size)
+
+
+def archive_reviews(conn, days=REVIEW_RETENTION_DAYS, chunk_size=ARCHIVE_CHUNK, dry_run=False):
+    if dry_run:
+        return _count(conn, COLD_REVIEWS_COUNT, _cutoff(days))
+    return _move_chunks(conn, COLD_REVIEWS, _cutoff(days), _REVIEW_MOVES, chunk_size)
+
+
+def run_archival(conn, audit_months=AUDIT_RETENTION_MONTHS, order_days=ORDER_RETENTION_DAYS,
+                 review_days=REVIEW_RETENTION_DAYS, audit_target="table", dry_run=False):
+    started = time.perf_counter()
+    report = {"partitions_added": [] if dry_run else ensure_partitions(conn)}
+    report["audit_partitions"] = archive_audit_log(conn, audit_months, audit_target, dry_run=dry_run)
+    report["orders"] = archive_orders(conn, order_days, dry_run=dry_run)
+    report["reviews"] = archive_reviews(conn, review_days, dry_run=dry_run)
+    report["elapsed_s"] = time.perf_counter() - started
+    return report
@@ -0,0 +1,335 @@
+# =====================================================
+# 🔐 AUTHENTICATION (password hashing, session tokens, rate limiting)
+# =====================================================
+# Passwords are stored as "pbkdf2_sha256$<iterations>$<salt>$<hash>". Rows
+# still holding plaintext are accepted once and re-hashed on that login, or
+# in bulk with `python maintenance.py migrate-passwords`.
+#
+# A successful login issues an HMAC-signed session token (kept in the page
+# URL, see the limits next to SESSION_SECRET), so a reconnecting browser is
+# signed back in without a database round-trip. Login attempts go through per-account and per-IP token buckets
+# before any hashing happens, so bursts are rejected for almost nothing.
+#
+# Usage:
+#   python auth.py calibrate [--target-ms 100]     # pick AUTH_HASH_ITERATIONS for this CPU
+#   python auth.py hash PASSWORD
+import argparse
+import base64
+import binascii
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import sys
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from dotenv import load_dotenv
+except ImportError:   # plain environment variables still work
+    load_dotenv = None
+
+if load_dotenv is not None:
+    load_dotenv()
+
+HASH_ALGORITHM = "pbkdf2_sha256"
+# Login cost: each attempt spends one PBKDF2 of this many rounds (see `calibrate`)
+HASH_ITERATIONS = int(os.getenv("AUTH_HASH_ITERATIONS", "260000"))
+SALT_BYTES = 16
+# Stored hashes claiming more rounds than this are rejected rather than hashed
+MAX_HASH_ITERATIONS = 10 * HASH_ITERATIONS
+
+# Signing key for session tokens; share it across app servers. Without it a
+# random per-process key is used and sessions end when the process restarts.
+# Limits of these bearer tokens:
+#   - The token lives in the page URL (Streamlit has no writable cookies), so it
+#     travels with copied links and lands in browser history and proxy logs.
+#     Anyone holding it is signed in until it expires: keep AUTH_SESSION_TTL short.
+#   - Logout revokes a token only in the process that served the logout; other
+#     app servers sharing AUTH_SECRET accept it until it expires. Rotating
+#     AUTH_SECRET ends every session everywhere.
+SESSION_SECRET = os.getenv("AUTH_SECRET", "").encode() or secrets.token_bytes(32)
+SESSION_TTL = int(os.getenv("AUTH_SESSION_TTL", str(8 * 3600)))   # seconds
+SESSION_CACHE_SIZE = 10000
+
+# Token buckets: BURST attempts at once, then one more every REFILL_S seconds
+ACCOUNT_BURST = 5
+ACCOUNT_REFILL_S = 30.0
+IP_BURST = 30
+IP_REFILL_S = 2.0
+# Reverse proxies in front of the app that append to X-Forwarded-For. 0 uses the
+# socket peer address; behind a proxy that is the proxy itself, so every user
+# would share one IP bucket. Never set this higher than the real number of
+# proxies: the client writes the leftmost entries itself.
+TRUSTED_PROXY_HOPS = int(os.getenv("AUTH_TRUSTED_PROXY_HOPS", "0"))
+LIMITER_MAX_KEYS = 100000
+
+MIGRATE_BATCH = 500
+
+Identity = namedtuple("Identity", "role user_id name")
+
+# role -> (table, id column) for password migration
+PASSWORD_TABLES = {"Admin": ("Admin", "Admin_ID"), "Vendor": ("Vendor", "Vendor_ID"),
+                   "Customer": ("Customer", "Customer_ID")}
+
+
+# -----------------------------------------------------
+# Password hashing
+# -----------------------------------------------------
+def _b64(raw):
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode()
+
+
+def _unb64(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _pbkdf2(password, salt, iterations):
+    return hashlib.pbkdf2_hmac("sha256", password.encode(), salt, iterations)
+
+
+def hash_password(password, iterations=None):
+    iterations = iterations or HASH_ITERATIONS
+    salt = secrets.token_bytes(SALT_BYTES)
+    return f"{HASH_ALGORITHM}${iterations}${_b64(salt)}${_b64(_pbkdf2(password, salt, iterations))}"
+
+
+def is_hashed(stored):
+    return stored.startswith(HASH_ALGORITHM + "$")
+
+
+_DUMMY_HASH = hash_password(secrets.token_urlsafe(16))
+
+
+def verify_password(password, stored):
+    # Returns (ok, needs_rehash). An unknown account (stored=None) still pays
+    # for one hash so response times don't reveal which accounts exist.
+    if stored is None:
+        verify_password(password, _DUMMY_HASH)
+        return False, False
+    if not is_hashed(stored):
+        return hmac.compare_digest(password.encode(), stored.encode()), True
+    try:
+        _, iterations, salt, digest = stored.split("$")
+        iterations = int(iterations)
+        if not 0 < iterations <= MAX_HASH_ITERATIONS:
+            return False, False   # a corrupt count would overflow or hang the login thread
+        ok = hmac.compare_digest(_pbkdf2(password, _unb64(salt), iterations), _unb64(digest))
+    except (TypeError, ValueError, OverflowError, binascii.Error):
+        return False, False   # malformed stored hash: treat as a failed check
+    return ok, ok and iterations != HASH_ITERATIONS
+
+
+def calibrate(target_ms=100, start=10000):
+    # Iterations that take roughly target_ms on this machine
+    started = time.perf_counter()
+    _pbkdf2("calibrate", b"salt" * 4, start)
+    per_iteration_ms = (time.perf_counter() - started) * 1000 / start
+    return max(start, int(target_ms / per_iteration_ms) // 1000 * 1000)
+
+
+# -----------------------------------------------------
+# Signed session tokens
+# -----------------------------------------------------
+class SessionTokens:
+    def __init__(self, secret=SESSION_SECRET, ttl=SESSION_TTL, cache_size=SESSION_CACHE_SIZE):
+        self._secret = secret
+        self.ttl = ttl
+        self.cache_size = cache_size
+        self._lock = threading.Lock()
+        self._cache = OrderedDict()   # token -> (Identity, expires, jti), most recent last
+        self._revoked = {}            # jti -> expires (revocation is per process)
+
+    def _sign(self, payload):
+        return _b64(hmac.new(self._secret, payload.encode(), hashlib.sha256).digest())
+
+    def _decode(self, token):
+        # Any malformed or forged token (including non-ASCII input from the URL) is just invalid
+        try:
+            payload, _, signature = token.partition(".")
+            if not signature or not hmac.compare_digest(signature.encode(), self._sign(payload).encode()):
+                return None
+            claims = json.loads(_unb64(payload))
+            return Identity(claims["r"], claims["u"], claims["n"]), float(claims["exp"]), claims["jti"]
+        except (TypeError, ValueError, KeyError, binascii.Error):
+            return None
+
+    def issue(self, identity):
+        claims = {"r": identity.role, "u": identity.user_id, "n": identity.name,
+                  "exp": int(time.time()) + self.ttl, "jti": secrets.token_urlsafe(8)}
+        payload = _b64(json.dumps(claims, separators=(",", ":")).encode())
+        token = f"{payload}.{self._sign(payload)}"
+        self._remember(token, identity, claims["exp"], claims["jti"])
+        return token
+
+    def _remember(self, token, identity, expires, jti):
+        with self._lock:
+            self._cache[token] = (identity, expires, jti)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def resolve(self, token):
+        if not token:
+            return None
+        with self._lock:
+            entry = self._cache.get(token)
+            if entry is not None:
+                self._cache.move_to_end(token)
+        if entry is None:
+            # Issued by another process (or evicted): the signature is enough
+            entry = self._decode(token)
+            if entry is None:
+                return None
+            self._remember(token, *entry)
+        identity, expires, jti = entry
+        if expires <= time.time():
+            return None
+        with self._lock:
+            if jti in self._revoked:
+                return None
+        return identity
+
+    def revoke(self, token):
+        entry = self._decode(token) if token else None
+        if entry is None:
+            return
+        now = time.time()
+        with self._lock:
+            self._cache.pop(token, None)
+            self._revoked = {j: exp for j, exp in self._revoked.items() if exp > now}
+            self._revoked[entry[2]] = entry[1]
+
+
+# -----------------------------------------------------
+# Login rate limiting (in-memory token buckets)
+# -----------------------------------------------------
+def client_address(peer, forwarded_for="", hops=TRUSTED_PROXY_HOPS):
+    # The address the nearest trusted proxy saw, or None when it can't be known
+    if hops <= 0:
+        return peer or None
+    chain = [a.strip() for a in forwarded_for.split(",") if a.strip()]
+    return chain[-hops] if len(chain) >= hops else None
+
+
+class TokenBucket:
+    def __init__(self, burst, refill_s, max_keys=LIMITER_MAX_KEYS):
+        self.burst = burst
+        self.refill_s = refill_s
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._buckets = {}   # key -> (tokens, updated_at)
+
+    def take(self, key):
+        # Returns 0 when allowed, else seconds until the next attempt is allowed
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) / self.refill_s)
+            if tokens < 1:
+                self._buckets[key] = (tokens, now)
+                return (1 - tokens) * self.refill_s
+            self._buckets[key] = (tokens - 1, now)
+            if len(self._buckets) > self.max_keys:
+                self._prune(now)
+            return 0.0
+
+    def reset(self, key):
+        with self._lock:
+            self._buckets.pop(key, None)
+
+    def _prune(self, now):
+        # Buckets that have refilled completely carry no state worth keeping
+        full = now - self.burst * self.refill_s
+        self._buckets = {k: v for k, v in self._buckets.items() if v[1] > full}
+
+
+class LoginLimiter:
+    def __init__(self):
+        self.accounts = TokenBucket(ACCOUNT_BURST, ACCOUNT_REFILL_S)
+        self.ips = TokenBucket(IP_BURST, IP_REFILL_S)
+        self._lock = threading.Lock()
+        self._metrics = {"attempts": 0, "limited": 0}
+
+    def check(self, role, identifier, ip):
+        # Without a trustworthy address only the account bucket applies; a shared
+        # "unknown" bucket would let one burst lock everybody out
+        wait = (ip is not None and self.ips.take(ip)) or self.accounts.take(f"{role}:{identifier.strip().lower()}")
+        with self._lock:
+            self._metrics["attempts"] += 1
+            self._metrics["limited"] += int(wait > 0)
+        return wait
+
+    def succeeded(self, role, identifier):
+        self.accounts.reset(f"{role}:{identifier.strip().lower()}")
+
+    def stats(self):
+        with self._lock:
+            return dict(self._metrics)
+
+
+sessions = SessionTokens()
+login_limiter = LoginLimiter()
+
+
+# -----------------------------------------------------
+# Bulk migration of plaintext passwords
+# -----------------------------------------------------
+def migrate_passwords(conn, batch_size=MIGRATE_BATCH, workers=None, progress=None):
+    # PBKDF2 releases the GIL, so a thread pool hashes on every core
+    migrated = {}
+    with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        for role, (table, id_column) in PASSWORD_TABLES.items():
+            select = f"SELECT {id_column}, Password FROM {table} WHERE {id_column} > %s ORDER BY {id_column} LIMIT %s"
+            # Password is re-checked so a concurrent login migration is not overwritten
+            update = f"UPDATE {table} SET Password = %s WHERE {id_column} = %s AND Password = %s"
+            migrated[table] = 0
+            last_id = 0
+            while True:
+                cur = conn.cursor()
+                cur.execute(select, (last_id, batch_size))
+                rows = cur.fetchall()
+                conn.rollback()
+                if not rows:
+                    cur.close()
+                    break
+                last_id = rows[-1][0]
+                plain = [(row_id, pwd) for row_id, pwd in rows if not is_hashed(pwd)]
+                hashes = list(pool.map(hash_password, [pwd for _, pwd in plain]))
+                try:
+                    if plain:
+                        cur.executemany(update, [(h, row_id, pwd) for h, (row_id, pwd) in zip(hashes, plain)])
+                        conn.commit()
+                except BaseException:
+                    conn.rollback()
+                    raise
+                finally:
+                    cur.close()
+                migrated[table] += len(plain)
+                if progress:
+                    progress(table, migrated[table], last_id)
+    return migrated
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Password hashing helpers")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("calibrate", help="suggest AUTH_HASH_ITERATIONS for a target login cost")
+    p.add_argument("--target-ms", type=float, default=100)
+    p = sub.add_parser("hash", help="hash a password (e.g. to seed an Admin row)")
+    p.add_argument("password")
+    args = parser.parse_args(argv)
+
+    if args.command == "calibrate":
+        iterations = calibrate(args.target_ms)
+        print(f"AUTH_HASH_ITERATIONS={iterations}  (~{args.target_ms:.0f} ms per login, "
+              f"~{1000 / args.target_ms:,.0f} logins/s per core)")
+    if args.command == "hash":
+        print(hash_password(args.password))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
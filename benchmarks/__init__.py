@@ -0,0 +1 @@
+# Benchmarks for the portal's data-access paths (run with `python -m benchmarks.<name>`)
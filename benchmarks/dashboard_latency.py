@@ -0,0 +1,211 @@
+# =====================================================
+# ⏱️ DASHBOARD LATENCY BENCHMARK
+# =====================================================
+# Replays the exact queries each dashboard page issues (queries.APP_QUERIES),
+# straight against the database with the result cache bypassed, and reports
+# latency percentiles, rows transferred and DataFrame memory per page.
+# Results can be stored as a baseline and later runs compared against it.
+#
+# Usage:
+#   python -m benchmarks.seed --orders 200000          # optional: grow the tables first
+#   python -m benchmarks.dashboard_latency [--runs 20] [--page admin.orders ...]
+#       [--save-baseline NAME] [--compare NAME] [--threshold 0.25] [--json]
+# Exits with status 1 when --compare finds a page slower than the baseline by more than --threshold.
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from benchmarks.order_throughput import percentile
+from db import ConnectionPool, create_connection
+from queries import APP_QUERIES
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+
+# Page -> the APP_QUERIES it runs on one render (read-only queries only)
+PAGES = {
+    "admin.vendors": ["admin.vendors.first_page", "admin.row_estimate"],
+    "admin.vendors.next": ["admin.vendors.next_page"],
+    "admin.products": ["admin.products.first_page", "admin.row_estimate"],
+    "admin.orders": ["admin.orders.recent_first_page", "admin.row_estimate"],
+    "admin.orders.next": ["admin.orders.recent_next_page"],
+    "admin.orders.all_time": ["admin.orders.first_page", "admin.row_estimate"],
+    "admin.payments": ["admin.payments.recent_first_page", "admin.row_estimate"],
+    "admin.reviews": ["admin.reviews.recent_first_page", "admin.row_estimate"],
+    "admin.audit_log": ["admin.audit_log.recent_first_page", "admin.row_estimate"],
+    "admin.audit_log.all_time": ["admin.audit_log.first_page", "admin.row_estimate"],
+    "admin.vendor_performance": ["admin.vendor_performance", "admin.performance_trend", "admin.rollup_watermark"],
+    "admin.sales_report": ["admin.sales_report"],
+    "vendor.products": ["vendor.products"],
+    "vendor.orders": ["vendor.orders"],
+    "vendor.reviews": ["vendor.reviews"],
+    "vendor.performance": ["vendor.performance", "vendor.performance_trend", "admin.rollup_watermark"],
+    "vendor.sales_report": ["vendor.total_sales", "vendor.product_sales"],
+    "customer.browse": ["customer.product_browse"],
+    "customer.search": ["customer.product_search"],
+    "customer.search_category": ["customer.product_search_category"],
+    "customer.search_prefix": ["customer.product_search_prefix"],
+    "customer.orders": ["customer.orders"],
+    "customer.write_review": ["customer.reviewable_products"],
+    "customer.leaderboard": ["customer.leaderboard"],
+}
+
+# Registry sample params use ID 1; per-user pages are replayed for random users instead
+_PER_USER = {"vendor": "SELECT Vendor_ID FROM Vendor", "customer": "SELECT Customer_ID FROM Customer"}
+
+
+def _user_ids(conn):
+    ids = {}
+    cur = conn.cursor()
+    for role, sql in _PER_USER.items():
+        cur.execute(sql)
+        ids[role] = [r[0] for r in cur.fetchall()] or [1]
+    cur.close()
+    conn.rollback()
+    return ids
+
+
+def _params_for(name, params, ids, rng):
+    role = name.split(".", 1)[0]
+    if role in ids and params[:1] == (1,):
+        return (rng.choice(ids[role]),) + tuple(params[1:])
+    return params
+
+
+def _run_query(conn, sql, params):
+    cur = conn.cursor()
+    started = time.perf_counter()
+    cur.execute(sql, params)
+    rows = cur.fetchall()
+    df = pd.DataFrame.from_records(rows, columns=[d[0] for d in cur.description])
+    elapsed = time.perf_counter() - started
+    cur.close()
+    conn.rollback()   # end the read snapshot like the app does
+    return elapsed, len(df), int(df.memory_usage(deep=True).sum())
+
+
+def run(pages=None, runs=20, warmup=2, rng_seed=1):
+    rng = random.Random(rng_seed)
+    pool = ConnectionPool(create_connection, size=1)
+    results = {}
+    with pool.connection() as conn:
+        ids = _user_ids(conn)
+        for page in pages or PAGES:
+            latencies, rows, memory = [], [], []
+            for i in range(warmup + runs):
+                total_s, total_rows, total_bytes = 0.0, 0, 0
+                for name in PAGES[page]:
+                    sql, params = APP_QUERIES[name]
+                    elapsed, n, size = _run_query(conn, sql, _params_for(name, params, ids, rng))
+                    total_s += elapsed
+                    total_rows += n
+                    total_bytes += size
+                if i >= warmup:
+                    latencies.append(total_s)
+                    rows.append(total_rows)
+                    memory.append(total_bytes)
+            latencies.sort()
+            results[page] = {
+                "queries": len(PAGES[page]),
+                "p50_ms": percentile(latencies, 50) * 1000,
+                "p95_ms": percentile(latencies, 95) * 1000,
+                "p99_ms": percentile(latencies, 99) * 1000,
+                "avg_rows": sum(rows) / len(rows),
+                "avg_bytes": sum(memory) / len(memory),
+            }
+        volumes = _volumes(conn)
+    pool.close()
+    return {"taken_at": datetime.now().isoformat(timespec="seconds"), "runs": runs,
+            "volumes": volumes, "pages": results}
+
+
+def _volumes(conn):
+    cur = conn.cursor()
+    volumes = {}
+    for table in ("Vendor", "Customer", "Product", "Orders", "Payment", "Review", "Audit_Log"):
+        cur.execute(f"SELECT COUNT(*) FROM {table}")
+        volumes[table] = cur.fetchone()[0]
+    cur.close()
+    conn.rollback()
+    return volumes
+
+
+def _baseline_path(name):
+    return os.path.join(BASELINE_DIR, f"{name}.json")
+
+
+def save_baseline(report, name):
+    os.makedirs(BASELINE_DIR, exist_ok=True)
+    with open(_baseline_path(name), "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def compare(report, baseline, threshold=0.25):
+    # A page regresses when its p95 grows by more than `threshold` (fraction) over the baseline
+    regressions = []
+    for page, now in report["pages"].items():
+        before = baseline["pages"].get(page)
+        if not before or not before["p95_ms"]:
+            continue
+        change = now["p95_ms"] / before["p95_ms"] - 1
+        now["p95_change"] = change
+        if change > threshold:
+            regressions.append(page)
+    return regressions
+
+
+def _fmt_bytes(n):
+    for unit in ("B", "KB", "MB"):
+        if n < 1024:
+            return f"{n:.0f} {unit}"
+        n /= 1024
+    return f"{n:.1f} GB"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay dashboard queries and report per-page latency")
+    parser.add_argument("--runs", type=int, default=20, help="measured renders per page")
+    parser.add_argument("--warmup", type=int, default=2, help="unmeasured renders per page")
+    parser.add_argument("--page", action="append", choices=sorted(PAGES), help="limit to these pages")
+    parser.add_argument("--save-baseline", metavar="NAME")
+    parser.add_argument("--compare", metavar="NAME", help="compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed p95 growth over the baseline before failing (0.25 = +25%%)")
+    parser.add_argument("--json", action="store_true", help="print the full report as JSON")
+    args = parser.parse_args(argv)
+
+    report = run(args.page, args.runs, args.warmup)
+    regressions = []
+    if args.compare:
+        with open(_baseline_path(args.compare)) as f:
+            regressions = compare(report, json.load(f), args.threshold)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print("📦 " + ", ".join(f"{t} {n:,}" for t, n in report["volumes"].items()))
+        print(f"{'page':<28}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'rows':>10}{'memory':>11}")
+        for page, r in report["pages"].items():
+            line = (f"{page:<28}{r['p50_ms']:>9.1f}{r['p95_ms']:>9.1f}{r['p99_ms']:>9.1f}"
+                    f"{r['avg_rows']:>10.0f}{_fmt_bytes(r['avg_bytes']):>11}")
+            if "p95_change" in r:
+                flag = "⚠️" if page in regressions else "  "
+                line += f"  {flag} {r['p95_change']:+.0%} p95"
+            print(line)
+
+    if args.save_baseline:
+        save_baseline(report, args.save_baseline)
+        print(f"💾 baseline saved to {_baseline_path(args.save_baseline)}")
+    if regressions:
+        print(f"❌ {len(regressions)} page(s) slower than baseline '{args.compare}': {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
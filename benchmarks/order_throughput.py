@@ -0,0 +1,153 @@
+# =====================================================
+# 📈 ORDER PLACEMENT THROUGHPUT BENCHMARK
+# =====================================================
+# Simulates N concurrent customers placing orders through orders.place_order()
+# and reports orders/sec, latency percentiles, deadlock retries and whether any
+# product was oversold.
+#
+# Usage:
+#   python -m benchmarks.order_throughput --customers 16 --orders-per-customer 50 [--hot-products 3]
+#
+# ⚠️ Writes real Orders/Payment rows and consumes stock in the configured database.
+import argparse
+import random
+import sys
+import threading
+import time
+
+from mysql.connector import Error
+
+from db import ConnectionPool, create_connection
+from orders import InsufficientStock, place_order
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def _stock(conn, product_ids):
+    cur = conn.cursor()
+    placeholders = ", ".join(["%s"] * len(product_ids))
+    cur.execute(f"SELECT Product_ID, Stock FROM Product WHERE Product_ID IN ({placeholders})", tuple(product_ids))
+    stock = dict(cur.fetchall())
+    cur.close()
+    conn.rollback()
+    return stock
+
+
+def _sample_ids(conn, hot_products, customers):
+    cur = conn.cursor()
+    cur.execute("SELECT Product_ID FROM Product WHERE Stock > 0 ORDER BY Product_ID LIMIT %s", (hot_products,))
+    product_ids = [r[0] for r in cur.fetchall()]
+    cur.execute("SELECT Customer_ID FROM Customer ORDER BY Customer_ID LIMIT %s", (customers,))
+    customer_ids = [r[0] for r in cur.fetchall()]
+    cur.close()
+    conn.rollback()
+    return product_ids, customer_ids
+
+
+def run(customers=16, orders_per_customer=50, hot_products=3, quantity=1, payment_method="UPI"):
+    pool = ConnectionPool(create_connection, size=customers + 1)
+    with pool.connection() as conn:
+        product_ids, customer_ids = _sample_ids(conn, hot_products, customers)
+        if not product_ids or not customer_ids:
+            raise SystemExit("Need at least one in-stock product and one customer (seed the database first)")
+        stock_before = _stock(conn, product_ids)
+
+    latencies, attempts, units = [], [], {}
+    counts = {"placed": 0, "sold_out": 0, "errors": 0}
+    lock = threading.Lock()
+    barrier = threading.Barrier(customers)
+
+    def customer(i):
+        rng = random.Random(i)
+        customer_id = customer_ids[i % len(customer_ids)]
+        local_lat, local_attempts, local_units = [], [], {}
+        local = {"placed": 0, "sold_out": 0, "errors": 0}
+        with pool.connection() as conn:
+            barrier.wait()
+            for _ in range(orders_per_customer):
+                product_id = rng.choice(product_ids)
+                started = time.perf_counter()
+                try:
+                    result = place_order(conn, customer_id, product_id, quantity, payment_method)
+                except InsufficientStock:
+                    local["sold_out"] += 1
+                    continue
+                except Error:
+                    local["errors"] += 1
+                    continue
+                local_lat.append(time.perf_counter() - started)
+                local_attempts.append(result.attempts)
+                local_units[product_id] = local_units.get(product_id, 0) + quantity
+                local["placed"] += 1
+        with lock:
+            latencies.extend(local_lat)
+            attempts.extend(local_attempts)
+            for pid, n in local_units.items():
+                units[pid] = units.get(pid, 0) + n
+            for k, v in local.items():
+                counts[k] += v
+
+    threads = [threading.Thread(target=customer, args=(i,)) for i in range(customers)]
+    started = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    with pool.connection() as conn:
+        stock_after = _stock(conn, product_ids)
+    pool.close()
+
+    # Every unit sold must have come out of stock exactly once, and stock never goes negative
+    oversold = [pid for pid in product_ids
+                if stock_after.get(pid, 0) < 0
+                or stock_before[pid] - stock_after.get(pid, 0) != units.get(pid, 0)]
+
+    latencies.sort()
+    return {
+        "customers": customers,
+        "elapsed_s": elapsed,
+        "orders_per_s": counts["placed"] / elapsed if elapsed else 0.0,
+        "placed": counts["placed"],
+        "sold_out": counts["sold_out"],
+        "errors": counts["errors"],
+        "retries": sum(a - 1 for a in attempts),
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "stock_mismatch": oversold,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Concurrent order placement benchmark")
+    parser.add_argument("--customers", type=int, default=16, help="concurrent simulated customers")
+    parser.add_argument("--orders-per-customer", type=int, default=50)
+    parser.add_argument("--hot-products", type=int, default=3,
+                        help="number of products all customers compete for (lower = more contention)")
+    parser.add_argument("--quantity", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    r = run(args.customers, args.orders_per_customer, args.hot_products, args.quantity)
+    print(f"👥 {r['customers']} customers, {r['placed']} orders in {r['elapsed_s']:.2f}s "
+          f"→ {r['orders_per_s']:.1f} orders/s")
+    print(f"⏱️  latency p50 {r['p50_ms']:.1f} ms · p95 {r['p95_ms']:.1f} ms · p99 {r['p99_ms']:.1f} ms")
+    print(f"🔁 deadlock/lock-wait retries: {r['retries']} · sold out: {r['sold_out']} · errors: {r['errors']}")
+    if r["stock_mismatch"]:
+        print(f"❌ stock does not match units sold for products {r['stock_mismatch']} "
+              "(other traffic during the run also causes this)")
+        return 1
+    print("✅ no overselling: stock consumed equals units ordered")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
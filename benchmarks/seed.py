@@ -0,0 +1,178 @@
+# =====================================================
+# 🌱 SYNTHETIC DATA SEEDER
+# =====================================================
+# Fills vendor_performance_db with reproducible synthetic volumes so the
+# benchmarks can measure how pages behave as the tables grow.
+#
+# Usage:
+#   python -m benchmarks.seed --vendors 1000 --customers 20000 --products-per-vendor 20 \
+#       --orders 200000 --reviews 50000 [--seed 42] [--history-days 730]
+#
+# Orders, payments and reviews are dated uniformly over the last
+# --history-days, so date-windowed pages, rollups and archive cut-offs see a
+# realistic spread instead of a single day.
+#
+# ⚠️ Inserts into the configured database; run against a scratch schema.
+import argparse
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+from db import ConnectionPool, create_connection
+
+CATEGORIES = ["Electronics", "Clothing", "Grocery", "Books", "Home", "Others"]
+STATUSES = ["Pending", "Processing", "Shipped", "Delivered", "Delivered", "Delivered", "Cancelled"]
+METHODS = ["Credit Card", "Debit Card", "UPI", "NetBanking", "Cash", "Wallet"]
+PAYMENT_STATUSES = ["Completed"] * 17 + ["Pending", "Failed", "Refunded"]
+SENTIMENTS = ["Positive", "Neutral", "Negative"]
+WORDS = ["wireless", "cotton", "organic", "classic", "smart", "portable", "deluxe", "mini",
+         "phone", "shirt", "rice", "novel", "lamp", "charger", "jacket", "tea", "atlas", "kettle"]
+
+BATCH_SIZE = 1000
+SEED_HISTORY_DAYS = 730       # ~2 years: past archive.ORDER_RETENTION_DAYS, many rollup months
+PAYMENT_DELAY_S = 3600        # payments land within an hour of their order
+
+
+def _insert_many(conn, sql, rows):
+    cur = conn.cursor()
+    for i in range(0, len(rows), BATCH_SIZE):
+        cur.executemany(sql, rows[i:i + BATCH_SIZE])
+        conn.commit()
+    cur.close()
+
+
+def _max_id(conn, table, column):
+    cur = conn.cursor()
+    cur.execute(f"SELECT IFNULL(MAX({column}), 0) FROM {table}")
+    value = cur.fetchone()[0]
+    cur.close()
+    conn.rollback()
+    return value
+
+
+def _ids(conn, sql):
+    cur = conn.cursor()
+    cur.execute(sql)
+    rows = cur.fetchall()
+    cur.close()
+    conn.rollback()
+    return rows
+
+
+def seed(vendors=100, customers=1000, products_per_vendor=10, orders=10000, reviews=2000, rng_seed=42,
+         history_days=SEED_HISTORY_DAYS):
+    rng = random.Random(rng_seed)
+    now = datetime.now().replace(microsecond=0)
+
+    def past():
+        return now - timedelta(seconds=rng.randrange(history_days * 86400))
+
+    pool = ConnectionPool(create_connection, size=1)
+    timings = {}
+    with pool.connection() as conn:
+        run = _max_id(conn, "Vendor", "Vendor_ID")   # keeps emails unique across repeated seeds
+
+        started = time.perf_counter()
+        _insert_many(conn, """
+            INSERT INTO Vendor (Name, Email, Password, Contact_No, Business_Type)
+            VALUES (%s,%s,%s,%s,%s)
+        """, [(f"Vendor {run + i}", f"vendor{run + i}@bench.local", "bench", f"9{rng.randrange(10**9):09d}",
+               rng.choice(CATEGORIES)) for i in range(vendors)])
+        timings["vendors"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        _insert_many(conn, """
+            INSERT INTO Customer (Name, Email, Password, Phone, Address, Gender)
+            VALUES (%s,%s,%s,%s,%s,%s)
+        """, [(f"Customer {run}-{i}", f"customer{run}-{i}@bench.local", "bench", f"8{rng.randrange(10**9):09d}",
+               f"{rng.randrange(1, 999)} Bench Street", rng.choice(["Male", "Female", "Other"]))
+              for i in range(customers)])
+        timings["customers"] = time.perf_counter() - started
+
+        vendor_ids = [r[0] for r in _ids(conn, f"SELECT Vendor_ID FROM Vendor WHERE Email LIKE 'vendor%@bench.local' AND Vendor_ID > {run}")]
+        customer_ids = [r[0] for r in _ids(conn, f"SELECT Customer_ID FROM Customer WHERE Email LIKE 'customer{run}-%@bench.local'")]
+
+        started = time.perf_counter()
+        products = []
+        for vendor_id in vendor_ids:
+            for j in range(products_per_vendor):
+                name = f"{rng.choice(WORDS).title()} {rng.choice(WORDS)} {j}"
+                products.append((name, " ".join(rng.choices(WORDS, k=12)), round(rng.uniform(10, 5000), 2),
+                                 10**6, rng.choice(CATEGORIES), vendor_id))
+        _insert_many(conn, """
+            INSERT INTO Product (Name, Description, Price, Stock, Category, Vendor_ID)
+            VALUES (%s,%s,%s,%s,%s,%s)
+        """, products)
+        timings["products"] = time.perf_counter() - started
+
+        product_rows = _ids(conn, f"SELECT Product_ID, Vendor_ID, Price FROM Product WHERE Vendor_ID IN "
+                                  f"(SELECT Vendor_ID FROM Vendor WHERE Vendor_ID > {run})")
+
+        started = time.perf_counter()
+        first_order = _max_id(conn, "Orders", "Order_ID") + 1
+        order_rows = []
+        for _ in range(orders):
+            product_id = rng.choice(product_rows)[0]
+            order_rows.append((rng.choice(customer_ids), product_id, rng.randint(1, 5), rng.choice(STATUSES), past()))
+        order_rows.sort(key=lambda r: r[-1])   # Order_IDs grow with Order_Date, as in production
+        _insert_many(conn, """
+            INSERT INTO Orders (Customer_ID, Product_ID, Quantity, Status, Order_Date)
+            VALUES (%s,%s,%s,%s,%s)
+        """, order_rows)
+        timings["orders"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        prices = {pid: price for pid, _, price in product_rows}
+        placed = _ids(conn, f"SELECT Order_ID, Customer_ID, Product_ID, Quantity, Order_Date FROM Orders "
+                            f"WHERE Order_ID >= {first_order}")
+        _insert_many(conn, """
+            INSERT INTO Payment (Order_ID, Customer_ID, Payment_Method, Payment_Status, Amount, Payment_Date)
+            VALUES (%s,%s,%s,%s,%s,%s)
+        """, [(oid, cid, rng.choice(METHODS), rng.choice(PAYMENT_STATUSES), prices[pid] * qty,
+               min(now, ordered + timedelta(seconds=rng.randrange(PAYMENT_DELAY_S))))
+              for oid, cid, pid, qty, ordered in placed])
+        timings["payments"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        vendor_of = {pid: vid for pid, vid, _ in product_rows}
+        pairs = set()
+        attempts = 0
+        while len(pairs) < reviews and attempts < reviews * 10:
+            pairs.add((rng.choice(customer_ids), rng.choice(product_rows)[0]))
+            attempts += 1
+        review_rows = []
+        for cid, pid in pairs:
+            rating = rng.choices([1, 2, 3, 4, 5], weights=[1, 1, 2, 4, 5])[0]
+            review_rows.append((cid, vendor_of[pid], pid, " ".join(rng.choices(WORDS, k=8)), rating,
+                                SENTIMENTS[0] if rating >= 4 else rng.choice(SENTIMENTS[1:]), past()))
+        _insert_many(conn, """
+            INSERT INTO Review (Customer_ID, Vendor_ID, Product_ID, Comment, Rating, Sentiment, Review_Date)
+            VALUES (%s,%s,%s,%s,%s,%s,%s)
+        """, review_rows)
+        timings["reviews"] = time.perf_counter() - started
+    pool.close()
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Seed synthetic benchmark data")
+    parser.add_argument("--vendors", type=int, default=100)
+    parser.add_argument("--customers", type=int, default=1000)
+    parser.add_argument("--products-per-vendor", type=int, default=10)
+    parser.add_argument("--orders", type=int, default=10000)
+    parser.add_argument("--reviews", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--history-days", type=int, default=SEED_HISTORY_DAYS,
+                        help="spread order / payment / review dates over this many past days")
+    args = parser.parse_args(argv)
+
+    timings = seed(args.vendors, args.customers, args.products_per_vendor, args.orders, args.reviews, args.seed,
+                   args.history_days)
+    for table, seconds in timings.items():
+        print(f"🌱 {table:<10} {seconds:8.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
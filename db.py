@@ -0,0 +1,439 @@
+# =====================================================
+# 🔌 DATABASE ACCESS LAYER (Connection Pool, read replicas)
+# =====================================================
+# Configured from the environment (or a .env file, see .env.example):
+#   DB_HOST / DB_PORT / DB_USER / DB_PASSWORD / DB_NAME   primary (all writes)
+#   DB_REPLICAS=host[:port],...                           read replicas (optional)
+#   DB_REPLICA_MAX_LAG=5                                  seconds behind before falling back
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import partial
+
+import mysql.connector
+from mysql.connector.errors import PoolError
+
+try:
+    from dotenv import load_dotenv
+except ImportError:   # plain environment variables still work
+    load_dotenv = None
+
+if load_dotenv is not None:
+    load_dotenv()
+
+DB_CONFIG = {
+    "host": os.getenv("DB_HOST", "localhost"),
+    "port": int(os.getenv("DB_PORT", "3306")),
+    "user": os.getenv("DB_USER", "root"),
+    "password": os.getenv("DB_PASSWORD", ""),
+    "database": os.getenv("DB_NAME", "vendor_performance_db"),
+}
+DB_REPLICAS = [h.strip() for h in os.getenv("DB_REPLICAS", "").split(",") if h.strip()]
+
+# Replica routing
+REPLICA_MAX_LAG = float(os.getenv("DB_REPLICA_MAX_LAG", "5"))             # seconds
+REPLICA_CHECK_INTERVAL = float(os.getenv("DB_REPLICA_CHECK_INTERVAL", "10"))  # re-measure lag this often
+REPLICA_CHECK_TIMEOUT = 1.0    # seconds to wait for a replica connection when measuring lag
+
+# Pool tuning
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))   # max open connections per process (per server)
+POOL_CHECKOUT_TIMEOUT = 5.0    # seconds to wait for a free connection
+POOL_MAX_IDLE = 300.0          # close pooled connections idle longer than this
+POOL_HEALTH_CHECK_AFTER = 30.0 # ping connections idle longer than this before reuse
+POOL_LEASE_IDLE_TIMEOUT = 120.0  # reclaim session leases unused for this long
+POOL_REAP_INTERVAL = 10.0
+
+
+def create_connection(config=None):
+    return mysql.connector.connect(**(config or DB_CONFIG))
+
+
+def replica_config(address):
+    host, _, port = address.partition(":")
+    return {**DB_CONFIG,
+            "host": host,
+            "port": int(port) if port else DB_CONFIG["port"],
+            "user": os.getenv("DB_REPLICA_USER", DB_CONFIG["user"]),
+            "password": os.getenv("DB_REPLICA_PASSWORD", DB_CONFIG["password"])}
+
+
+class PoolTimeout(PoolError):
+    pass
+
+
+def _ping(conn):
+    try:
+        return conn.is_connected()
+    except Exception:
+        return False
+
+
+def _close_quietly(conn):
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+# -----------------------------------------------------
+# Session lease: one pooled connection pinned to a Streamlit
+# session and reused across reruns until it goes idle.
+# -----------------------------------------------------
+class SessionLease:
+    def __init__(self, pool):
+        self._pool = pool
+        self._conn = None
+        self._busy = False
+        self.last_used = time.monotonic()
+
+    @contextmanager
+    def connection(self):
+        pool = self._pool
+        with pool._cond:
+            self._busy = True
+            conn = self._conn
+            idle_for = time.monotonic() - self.last_used
+            if conn is not None:
+                pool._metrics["checkouts"] += 1
+                pool._metrics["lease_reuses"] += 1
+        try:
+            if conn is not None and idle_for > pool.health_check_after and not pool._ping(conn):
+                pool.release(conn, discard=True)
+                conn = None
+            if conn is None:
+                conn = pool.acquire()
+                with pool._cond:
+                    self._conn = conn
+                    pool._leases.add(self)
+        except BaseException:
+            with pool._cond:
+                self._conn = conn
+                self._busy = False
+            raise
+
+        try:
+            yield conn
+        finally:
+            # End any open read snapshot so the next rerun sees fresh data
+            try:
+                conn.rollback()
+            except Exception:
+                with pool._cond:
+                    self._conn = None
+                    pool._leases.discard(self)
+                pool.release(conn, discard=True)
+            with pool._cond:
+                self._busy = False
+                self.last_used = time.monotonic()
+
+    def release(self):
+        pool = self._pool
+        with pool._cond:
+            conn, self._conn = self._conn, None
+            pool._leases.discard(self)
+        if conn is not None:
+            pool.release(conn)
+
+
+# -----------------------------------------------------
+# Process-wide connection pool
+# -----------------------------------------------------
+class ConnectionPool:
+    def __init__(self, connect, size=POOL_SIZE, checkout_timeout=POOL_CHECKOUT_TIMEOUT,
+                 max_idle=POOL_MAX_IDLE, health_check_after=POOL_HEALTH_CHECK_AFTER,
+                 lease_idle_timeout=POOL_LEASE_IDLE_TIMEOUT, ping=_ping):
+        self._connect = connect
+        self._ping = ping
+        self.size = size
+        self.checkout_timeout = checkout_timeout
+        self.max_idle = max_idle
+        self.health_check_after = health_check_after
+        self.lease_idle_timeout = lease_idle_timeout
+
+        self._cond = threading.Condition()
+        self._idle = deque()        # (conn, returned_at), most recent on the right
+        self._open = 0              # idle + checked out
+        self._leases = set()
+        self._last_reap = time.monotonic()
+        self._metrics = {
+            "checkouts": 0,      # connections handed out (incl. lease reuse)
+            "lease_reuses": 0,   # checkouts served by a session's pinned connection
+            "waits": 0,          # checkouts that had to wait for a free slot
+            "misses": 0,         # checkouts that had to open a new connection
+            "timeouts": 0,       # checkouts that gave up after checkout_timeout
+            "discarded": 0,      # broken connections dropped by health checks
+            "reaped": 0,         # idle connections closed by the reaper
+            "revoked_leases": 0, # session leases reclaimed (idle timeout or pool exhausted)
+        }
+
+    # ---- checkout / return ----
+    def acquire(self, timeout=None):
+        timeout = self.checkout_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        waited = False
+        self._maybe_reap()
+
+        while True:
+            with self._cond:
+                while not self._idle and self._open >= self.size:
+                    # Connections parked on idle sessions go back into circulation first
+                    if self._reclaim_lease():
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._metrics["timeouts"] += 1
+                        raise PoolTimeout(msg=f"No database connection free after {timeout:.1f}s")
+                    if not waited:
+                        waited = True
+                        self._metrics["waits"] += 1
+                    self._cond.wait(remaining)
+
+                if self._idle:
+                    conn, returned_at = self._idle.pop()
+                    self._metrics["checkouts"] += 1
+                    needs_check = time.monotonic() - returned_at > self.health_check_after
+                else:
+                    conn = None
+                    self._open += 1
+                    self._metrics["checkouts"] += 1
+                    self._metrics["misses"] += 1
+
+            if conn is None:
+                try:
+                    return self._connect()
+                except BaseException:
+                    with self._cond:
+                        self._open -= 1
+                        self._cond.notify()
+                    raise
+
+            if not needs_check or self._ping(conn):
+                return conn
+
+            # Stale connection: drop it and try again
+            _close_quietly(conn)
+            with self._cond:
+                self._open -= 1
+                self._metrics["discarded"] += 1
+                self._cond.notify()
+
+    def release(self, conn, discard=False):
+        if discard:
+            _close_quietly(conn)
+        with self._cond:
+            if discard:
+                self._open -= 1
+                self._metrics["discarded"] += 1
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+        self._maybe_reap()
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        except BaseException:
+            try:
+                conn.rollback()
+            except Exception:
+                self.release(conn, discard=True)
+                raise
+            self.release(conn)
+            raise
+        else:
+            try:
+                conn.rollback()
+            except Exception:
+                self.release(conn, discard=True)
+            else:
+                self.release(conn)
+
+    def lease(self):
+        return SessionLease(self)
+
+    def _reclaim_lease(self):
+        # Caller holds self._cond. Moves the connection of the least recently used
+        # lease that is not mid-request to _idle; the session re-acquires on its next use.
+        candidates = [lease for lease in self._leases if not lease._busy and lease._conn is not None]
+        if not candidates:
+            return False
+        lease = min(candidates, key=lambda l: l.last_used)
+        conn, lease._conn = lease._conn, None
+        self._leases.discard(lease)
+        self._idle.appendleft((conn, lease.last_used))
+        self._metrics["revoked_leases"] += 1
+        return True
+
+    # ---- housekeeping ----
+    def _maybe_reap(self):
+        if time.monotonic() - self._last_reap >= POOL_REAP_INTERVAL:
+            self.reap()
+
+    def reap(self):
+        now = time.monotonic()
+        to_close = []
+        to_return = []
+        with self._cond:
+            self._last_reap = now
+            for lease in list(self._leases):
+                if not lease._busy and now - lease.last_used > self.lease_idle_timeout:
+                    if lease._conn is not None:
+                        to_return.append(lease._conn)
+                        lease._conn = None
+                    self._leases.discard(lease)
+                    self._metrics["revoked_leases"] += 1
+            keep = deque()
+            for conn, returned_at in self._idle:
+                if now - returned_at > self.max_idle:
+                    to_close.append(conn)
+                else:
+                    keep.append((conn, returned_at))
+            self._idle = keep
+            self._open -= len(to_close)
+            self._metrics["reaped"] += len(to_close)
+            for conn in to_return:
+                self._idle.append((conn, now))
+            if to_close or to_return:
+                self._cond.notify_all()
+        for conn in to_close:
+            _close_quietly(conn)
+
+    def close(self):
+        with self._cond:
+            idle, self._idle = self._idle, deque()
+            self._open -= len(idle)
+        for conn, _ in idle:
+            _close_quietly(conn)
+
+    def stats(self):
+        with self._cond:
+            stats = dict(self._metrics)
+            stats.update({
+                "size": self.size,
+                "open": self._open,
+                "idle": len(self._idle),
+                "in_use": self._open - len(self._idle),
+                "leases": len(self._leases),
+            })
+        return stats
+
+
+# -----------------------------------------------------
+# Read routing: round-robin over replicas that are within
+# REPLICA_MAX_LAG of the primary; the primary when none are.
+# -----------------------------------------------------
+def replica_lag(conn):
+    # Seconds behind the source, or None when replication is not running
+    cur = conn.cursor(dictionary=True)
+    try:
+        cur.execute("SHOW REPLICA STATUS")
+    except mysql.connector.Error:   # MySQL < 8.0.22
+        cur.execute("SHOW SLAVE STATUS")
+    row = cur.fetchone()
+    cur.close()
+    if row is None:
+        return None
+    lag = row.get("Seconds_Behind_Source", row.get("Seconds_Behind_Master"))
+    return None if lag is None else float(lag)
+
+
+class ReadRouter:
+    def __init__(self, primary, replicas, max_lag=REPLICA_MAX_LAG, check_interval=REPLICA_CHECK_INTERVAL,
+                 lag=replica_lag):
+        self.primary = primary
+        self.replicas = replicas            # [(name, ConnectionPool)]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._lag = lag
+        self._lock = threading.Lock()
+        self._next = 0
+        self._health = {name: {"lag_s": None, "healthy": False, "checked": None} for name, _ in replicas}
+        self._metrics = {"replica_reads": 0, "primary_fallbacks": 0, "lag_checks": 0, "check_errors": 0}
+
+    def _healthy(self, name, pool):
+        now = time.monotonic()
+        with self._lock:
+            health = self._health[name]
+            if health["checked"] is not None and now - health["checked"] < self.check_interval:
+                return health["healthy"]
+            health["checked"] = now     # one thread re-measures, the rest use the last result
+            self._metrics["lag_checks"] += 1
+        lag = None
+        try:
+            conn = pool.acquire(timeout=REPLICA_CHECK_TIMEOUT)
+        except Exception:
+            conn = None
+        if conn is not None:
+            try:
+                lag = self._lag(conn)
+            except Exception:
+                pool.release(conn, discard=True)
+            else:
+                pool.release(conn)
+        with self._lock:
+            if lag is None:
+                self._metrics["check_errors"] += 1
+            health.update(lag_s=lag, healthy=lag is not None and lag <= self.max_lag)
+            return health["healthy"]
+
+    def pool(self):
+        with self._lock:
+            start = self._next
+            self._next = (self._next + 1) % max(len(self.replicas), 1)
+        for i in range(len(self.replicas)):
+            name, pool = self.replicas[(start + i) % len(self.replicas)]
+            if self._healthy(name, pool):
+                with self._lock:
+                    self._metrics["replica_reads"] += 1
+                return pool
+        with self._lock:
+            self._metrics["primary_fallbacks"] += 1
+        return self.primary
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._metrics)
+            stats["max_lag_s"] = self.max_lag
+            stats["replicas"] = {name: {"lag_s": h["lag_s"], "healthy": h["healthy"]}
+                                 for name, h in self._health.items()}
+        for name, pool in self.replicas:
+            stats["replicas"][name]["pool"] = pool.stats()
+        return stats
+
+
+_pool = None
+_router = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    # Primary: writes, callproc, transactions and anything that must see its own writes
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(create_connection)
+    return _pool
+
+
+def get_router():
+    # None when no replicas are configured
+    global _router
+    if _router is None and DB_REPLICAS:
+        primary = get_pool()
+        with _pool_lock:
+            if _router is None:
+                replicas = [(address, ConnectionPool(partial(create_connection, replica_config(address))))
+                            for address in DB_REPLICAS]
+                _router = ReadRouter(primary, replicas)
+    return _router
+
+
+def get_read_pool():
+    # Read-only queries: a replica within REPLICA_MAX_LAG, else the primary
+    router = get_router()
+    return router.pool() if router is not None else get_pool()
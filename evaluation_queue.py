@@ -0,0 +1,183 @@
+# =====================================================
+# 🧮 VENDOR EVALUATION QUEUE (debounced background re-scoring)
+# =====================================================
+# trg_enqueue_vendor_evaluation records "vendor X needs re-evaluation" in
+# Vendor_Evaluation_Queue (one row per vendor, so a burst of reviews coalesces
+# into a single evaluation). Worker threads claim due vendors in batches with
+# FOR UPDATE SKIP LOCKED, so any number of app processes and CLI workers can
+# drain the same queue without evaluating a vendor twice.
+import logging
+import os
+import socket
+import threading
+import time
+
+from mysql.connector import Error
+
+import queries as q
+from db import get_pool
+from query_cache import result_cache
+from scoring import SCORING_WRITES, score_vendors
+
+EVAL_WORKERS = 2
+EVAL_BATCH_SIZE = 100
+EVAL_DEBOUNCE = 5.0         # seconds a vendor must be quiet before it is evaluated
+EVAL_MAX_DELAY = 60.0       # ...unless its oldest request has waited this long
+EVAL_POLL_INTERVAL = 2.0    # idle workers re-check the queue this often
+EVAL_CLAIM_TIMEOUT = 300    # seconds before a crashed worker's claim can be taken over
+EVAL_MAX_ATTEMPTS = 5       # failing vendors stay queued (with Last_Error) after this
+EVAL_RETRY_BACKOFF = 30     # seconds, multiplied by the attempt number
+
+log = logging.getLogger("vendor_portal.evaluation_queue")
+
+
+def evaluate_vendors(conn, vendor_ids):
+    # Re-score the batch in one set-based pass; returns {vendor_id: error message} for failures
+    try:
+        score_vendors(conn, vendor_ids)
+        return {}
+    except Error as e:
+        return {vendor_id: str(e) for vendor_id in vendor_ids}
+
+
+def queue_stats(conn):
+    cur = conn.cursor(dictionary=True)
+    cur.execute(q.EVALUATION_QUEUE_STATS)
+    row = cur.fetchone()
+    cur.close()
+    conn.rollback()
+    return {k: int(v or 0) for k, v in row.items()}
+
+
+class EvaluationWorker:
+    def __init__(self, workers=EVAL_WORKERS, batch_size=EVAL_BATCH_SIZE, debounce=EVAL_DEBOUNCE,
+                 max_delay=EVAL_MAX_DELAY, poll_interval=EVAL_POLL_INTERVAL, pool=None):
+        self.workers = workers
+        self.batch_size = batch_size
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.poll_interval = poll_interval
+        self._pool = pool
+        self._threads = []
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._name = f"{socket.gethostname()}:{os.getpid()}"
+        self._metrics = {
+            "batches": 0,
+            "vendors_evaluated": 0,
+            "requests_coalesced": 0,
+            "failures": 0,
+            "last_batch_ms": 0.0,
+            "max_lag_s": 0.0,
+            "last_lag_s": 0.0,
+        }
+
+    @property
+    def pool(self):
+        return self._pool or get_pool()
+
+    # -------------------------------------------------
+    # One batch: claim -> evaluate -> complete / requeue / fail
+    # -------------------------------------------------
+    def _claim(self, conn, worker_name):
+        cur = conn.cursor()
+        try:
+            cur.execute(q.CLAIM_EVALUATIONS, (EVAL_CLAIM_TIMEOUT, EVAL_MAX_ATTEMPTS,
+                                              self.debounce, self.max_delay, self.batch_size))
+            claimed = cur.fetchall()
+            cur.executemany(q.MARK_EVALUATION_CLAIMED, [(worker_name, row[0]) for row in claimed])
+            conn.commit()
+            return claimed
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            cur.close()
+
+    def _settle(self, conn, claimed, failures):
+        cur = conn.cursor()
+        for vendor_id, requested, last_requested, _ in claimed:
+            if vendor_id in failures:
+                cur.execute(q.FAIL_EVALUATION, (failures[vendor_id][:255], EVAL_RETRY_BACKOFF, vendor_id))
+                continue
+            cur.execute(q.COMPLETE_EVALUATION, (vendor_id, last_requested))
+            if cur.rowcount == 0:
+                # More reviews arrived while evaluating: keep the row for another pass
+                cur.execute(q.REQUEUE_EVALUATION, (requested, vendor_id))
+        conn.commit()
+        cur.close()
+
+    def run_once(self, worker_name=None):
+        # Processes at most one batch; returns the number of vendors evaluated
+        started = time.perf_counter()
+        with self.pool.connection() as conn:
+            conn.rollback()
+            claimed = self._claim(conn, worker_name or self._name)
+            if not claimed:
+                return 0
+            failures = evaluate_vendors(conn, [row[0] for row in claimed])
+            self._settle(conn, claimed, failures)
+
+        result_cache.invalidate(SCORING_WRITES)
+        lags = [float(row[3] or 0) for row in claimed]
+        with self._lock:
+            m = self._metrics
+            m["batches"] += 1
+            m["vendors_evaluated"] += len(claimed) - len(failures)
+            m["requests_coalesced"] += sum(row[1] for row in claimed) - len(claimed)
+            m["failures"] += len(failures)
+            m["last_batch_ms"] = (time.perf_counter() - started) * 1000
+            m["last_lag_s"] = max(lags)
+            m["max_lag_s"] = max(m["max_lag_s"], max(lags))
+        return len(claimed)
+
+    def drain(self):
+        # Evaluates everything due right now (CLI / tests); returns vendors processed
+        total = 0
+        while True:
+            n = self.run_once()
+            if n == 0:
+                return total
+            total += n
+
+    # -------------------------------------------------
+    # Background threads
+    # -------------------------------------------------
+    def _loop(self, index):
+        worker_name = f"{self._name}/{index}"
+        while not self._stop.is_set():
+            try:
+                busy = self.run_once(worker_name) == self.batch_size
+            except Exception:
+                log.exception("vendor evaluation batch failed")
+                busy = False
+            if not busy:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+    def start(self):
+        with self._lock:
+            if any(t.is_alive() for t in self._threads):
+                return
+            self._stop.clear()
+            self._threads = [threading.Thread(target=self._loop, args=(i,), daemon=True,
+                                              name=f"vendor-evaluation-{i}")
+                             for i in range(self.workers)]
+            for t in self._threads:
+                t.start()
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        self._wake.set()
+        for t in self._threads:
+            t.join(timeout)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._metrics)
+            stats["running_workers"] = sum(t.is_alive() for t in self._threads)
+        return stats
+
+
+evaluation_worker = EvaluationWorker()
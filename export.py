@@ -0,0 +1,150 @@
+# =====================================================
+# 📤 STREAMING EXPORTS (CSV / Parquet)
+# =====================================================
+# Rows are pulled from an unbuffered cursor EXPORT_CHUNK at a time and written
+# straight to disk, so memory stays bounded by one chunk however large the
+# export is.
+#
+# Usage:
+#   python export.py orders [--from 2026-01-01] [--to 2026-02-01] [--format csv|csv.gz|parquet] [-o FILE]
+import argparse
+import csv
+import gzip
+import os
+import sys
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+import queries as q
+from db import get_read_pool
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:   # Parquet export is optional
+    pa = pq = None
+
+EXPORT_CHUNK = 10000
+EXPORT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "exports")
+FORMATS = ["csv", "csv.gz", "parquet"] if pa is not None else ["csv", "csv.gz"]
+
+ExportResult = namedtuple("ExportResult", "path rows bytes elapsed_s rows_per_s")
+
+
+def default_path(name, start=None, end=None, fmt="csv"):
+    window = f"_{start:%Y%m%d}-{end:%Y%m%d}" if start and end else ""
+    stamp = datetime.now().strftime("%Y%m%d%H%M%S")
+    return os.path.join(EXPORT_DIR, f"{name}{window}_{stamp}.{fmt}")
+
+
+def _csv_writer(path, columns, compress):
+    f = gzip.open(path, "wt", newline="") if compress else open(path, "w", newline="")
+    writer = csv.writer(f)
+    writer.writerow(columns)
+    return f, writer.writerows
+
+
+def _parquet_writer(path, columns):
+    state = {}
+
+    def write(rows):
+        arrays = list(zip(*rows)) or [[] for _ in columns]
+        if "writer" not in state:
+            # Schema comes from the first chunk; all-NULL columns fall back to strings
+            first = pa.table({c: pa.array(a) for c, a in zip(columns, arrays)})
+            schema = pa.schema([pa.field(f.name, pa.string() if pa.types.is_null(f.type) else f.type)
+                                for f in first.schema])
+            state["schema"] = schema
+            state["writer"] = pq.ParquetWriter(path, schema)
+        schema = state["schema"]
+        table = pa.table([pa.array(a, type=f.type) for a, f in zip(arrays, schema)], schema=schema)
+        state["writer"].write_table(table)
+
+    def close():
+        if "writer" in state:
+            state["writer"].close()
+        else:
+            pq.write_table(pa.table({c: pa.array([], pa.string()) for c in columns}), path)
+
+    return close, write
+
+
+def stream_query(conn, sql, params, path, fmt="csv", chunk_size=EXPORT_CHUNK, progress=None):
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported export format {fmt!r} (available: {', '.join(FORMATS)})")
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    started = time.perf_counter()
+    rows = 0
+    conn.rollback()
+    cur = conn.cursor(buffered=False)
+    try:
+        cur.execute(sql, params)
+        columns = [d[0] for d in cur.description]
+        if fmt == "parquet":
+            close, write = _parquet_writer(path, columns)
+        else:
+            f, write = _csv_writer(path, columns, compress=fmt == "csv.gz")
+            close = f.close
+        try:
+            while True:
+                chunk = cur.fetchmany(chunk_size)
+                if not chunk:
+                    break
+                write(chunk)
+                rows += len(chunk)
+                if progress:
+                    progress(rows, time.perf_counter() - started)
+        finally:
+            close()
+    finally:
+        conn.consume_results()   # an aborted export leaves unread rows on the wire
+        cur.close()
+        conn.rollback()
+
+    elapsed = time.perf_counter() - started
+    return ExportResult(path, rows, os.path.getsize(path), elapsed, rows / elapsed if elapsed else 0.0)
+
+
+def stream_export(conn, name, start=None, end=None, fmt="csv", path=None, chunk_size=EXPORT_CHUNK, progress=None):
+    sql, params = q.export_query(q.EXPORTS[name], start, end)
+    path = path or default_path(name, start, end, fmt)
+    return stream_query(conn, sql, params, path, fmt, chunk_size, progress)
+
+
+def _day(value):
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def date_window(start=None, end=None):
+    # Inclusive calendar dates -> [start 00:00, day after end 00:00)
+    lo = datetime.combine(start, datetime.min.time()) if start else None
+    hi = datetime.combine(end + timedelta(days=1), datetime.min.time()) if end else None
+    return lo, hi
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Stream an admin table or report to CSV / Parquet")
+    parser.add_argument("name", choices=sorted(q.EXPORTS))
+    parser.add_argument("--from", dest="start", type=_day, help="first day to include (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="end", type=_day, help="last day to include (YYYY-MM-DD)")
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("-o", "--output", help=f"output file (default: under {EXPORT_DIR})")
+    parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK)
+    args = parser.parse_args(argv)
+
+    def progress(rows, elapsed):
+        if rows % (args.chunk_size * 10) == 0:
+            print(f"  … {rows:,} rows ({rows / elapsed:,.0f} rows/s)")
+
+    start, end = date_window(args.start, args.end)
+    with get_read_pool().connection() as conn:
+        r = stream_export(conn, args.name, start, end, args.format, args.output, args.chunk_size, progress)
+    print(f"✅ {r.rows:,} rows → {r.path} ({r.bytes / 1024 / 1024:,.1f} MB) in {r.elapsed_s:.1f}s, "
+          f"{r.rows_per_s:,.0f} rows/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
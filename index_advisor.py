@@ -0,0 +1,108 @@
+# =====================================================
+# 🔍 INDEX ADVISOR
+# =====================================================
+# EXPLAINs every query the portal issues (queries.APP_QUERIES) and flags full
+# table scans, full index scans, filesorts and temporary tables, so plan
+# regressions show up as the schema evolves.
+#
+# Usage:
+#   python index_advisor.py [--min-rows 1000] [--json]
+# Exits with status 1 when a query has a finding not listed in ACCEPTED_FINDINGS.
+import argparse
+import json
+import sys
+
+from db import get_pool
+from queries import APP_QUERIES
+
+# Plans that are expected and not regressions: query name -> reason
+ACCEPTED_FINDINGS = {
+    "admin.row_estimate": "information_schema lookup, not a table scan",
+    "admin.sales_report": "ranks every vendor; one summary row per vendor",
+    "admin.export.sales_report": "full report export; one summary row per vendor",
+    "customer.leaderboard": "ranks every vendor; one summary row per vendor",
+}
+
+_EXPLAINABLE = ("SELECT", "UPDATE", "DELETE")
+
+
+def explain(conn, sql, params=()):
+    cur = conn.cursor(dictionary=True)
+    cur.execute("EXPLAIN " + sql, params)
+    plan = cur.fetchall()
+    cur.close()
+    return plan
+
+
+def findings_for(plan, min_rows=1000):
+    findings = []
+    for row in plan:
+        table = row.get("table") or ""
+        if table.startswith("<"):
+            # derived tables / union results are reported through their source rows
+            continue
+        rows = row.get("rows") or 0
+        extra = row.get("Extra") or ""
+        access = row.get("type")
+        if rows < min_rows:
+            continue
+        if access == "ALL":
+            findings.append(f"full table scan of {table} (~{rows:,} rows)")
+        elif access == "index":
+            findings.append(f"full index scan of {table} (~{rows:,} rows)")
+        if "Using filesort" in extra:
+            findings.append(f"filesort on {table}")
+        if "Using temporary" in extra:
+            findings.append(f"temporary table for {table}")
+    return findings
+
+
+def analyze(min_rows=1000):
+    report = []
+    with get_pool().connection() as conn:
+        for name, (sql, params) in APP_QUERIES.items():
+            if not sql.lstrip().upper().startswith(_EXPLAINABLE):
+                continue
+            try:
+                plan = explain(conn, sql, params)
+            except Exception as e:
+                report.append({"query": name, "error": str(e), "findings": [], "accepted": False})
+                continue
+            report.append({
+                "query": name,
+                "findings": findings_for(plan, min_rows),
+                "accepted": name in ACCEPTED_FINDINGS,
+                "plan": plan,
+            })
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="EXPLAIN every portal query and flag scans / filesorts")
+    parser.add_argument("--min-rows", type=int, default=1000,
+                        help="ignore plan steps estimated to read fewer rows than this")
+    parser.add_argument("--json", action="store_true", help="print the full report as JSON")
+    args = parser.parse_args(argv)
+
+    report = analyze(args.min_rows)
+    regressions = [r for r in report if r.get("error") or (r["findings"] and not r["accepted"])]
+
+    if args.json:
+        print(json.dumps(report, indent=2, default=str))
+    else:
+        for r in report:
+            if r.get("error"):
+                print(f"❌ {r['query']}: EXPLAIN failed: {r['error']}")
+            elif not r["findings"]:
+                print(f"✅ {r['query']}")
+            elif r["accepted"]:
+                print(f"☑️  {r['query']}: {'; '.join(r['findings'])} (accepted: {ACCEPTED_FINDINGS[r['query']]})")
+            else:
+                print(f"⚠️  {r['query']}: {'; '.join(r['findings'])}")
+        print(f"\n{len(report)} queries checked, {len(regressions)} need attention")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
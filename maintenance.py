@@ -0,0 +1,197 @@
+# =====================================================
+# 🛠️ MAINTENANCE JOBS
+# =====================================================
+# Usage:
+#   python maintenance.py reconcile-ratings [--fix]
+#   python maintenance.py rebuild-sales
+#   python maintenance.py evaluate-queue [--drain] [--no-debounce] [--workers 2] [--batch-size 100]
+#   python maintenance.py queue-status
+#   python maintenance.py rescore-vendors [--chunk-size 20000] [--dry-run]
+#   python maintenance.py rollup-performance [--rebuild] [--lookback-days 7]
+#   python maintenance.py partitions [--months-ahead 3]
+#   python maintenance.py migrate-passwords [--batch-size 500] [--workers N]
+#   python maintenance.py archive [--audit-months 6] [--order-days 365] [--review-days 730]
+#       [--audit-to table|file] [--dry-run]
+import argparse
+import sys
+import time
+
+import archive
+from auth import MIGRATE_BATCH, migrate_passwords
+from db import get_pool
+from evaluation_queue import EVAL_BATCH_SIZE, EVAL_WORKERS, EvaluationWorker, queue_stats
+from rollups import ROLLUP_LOOKBACK_DAYS, refresh_rollups
+from scoring import RESCORE_CHUNK, rescore_all
+
+
+def _call(cur, proc, args=()):
+    cur.callproc(proc, list(args))
+    return [row for result in cur.stored_results() for row in result.fetchall()]
+
+
+# -----------------------------------------------------
+# Vendor review aggregates (Vendor_Review_Stats)
+# -----------------------------------------------------
+def reconcile_ratings(fix=False):
+    # Compare the running aggregates kept by trg_update_vendor_rating with a
+    # full re-aggregation of Review; optionally rebuild them.
+    with get_pool().connection() as conn:
+        cur = conn.cursor()
+        mismatches = _call(cur, "sp_check_vendor_review_stats")
+        if fix and mismatches:
+            _call(cur, "sp_rebuild_vendor_review_stats")
+            conn.commit()
+        cur.close()
+    return mismatches
+
+
+# -----------------------------------------------------
+# Sales rollups (Vendor_Sales_Summary / Product_Sales_Summary)
+# -----------------------------------------------------
+def rebuild_sales():
+    with get_pool().connection() as conn:
+        cur = conn.cursor()
+        _call(cur, "sp_rebuild_sales_summary")
+        conn.commit()
+        cur.execute("SELECT COUNT(*), IFNULL(SUM(Total_Revenue), 0) FROM Vendor_Sales_Summary")
+        vendors, revenue = cur.fetchone()
+        cur.close()
+    return vendors, revenue
+
+
+# -----------------------------------------------------
+# Vendor evaluation queue (Vendor_Evaluation_Queue)
+# -----------------------------------------------------
+def evaluate_queue(drain=False, debounce=True, workers=EVAL_WORKERS, batch_size=EVAL_BATCH_SIZE):
+    kwargs = {} if debounce else {"debounce": 0, "max_delay": 0}
+    worker = EvaluationWorker(workers=workers, batch_size=batch_size, **kwargs)
+    if drain:
+        return worker.drain()
+    worker.start()
+    try:
+        while True:
+            time.sleep(10)
+            print(worker.stats())
+    except KeyboardInterrupt:
+        worker.stop()
+    return worker.stats()["vendors_evaluated"]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Vendor Performance maintenance jobs")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("reconcile-ratings", help="verify Vendor_Review_Stats against Review")
+    p.add_argument("--fix", action="store_true", help="rebuild the aggregates if they disagree")
+
+    sub.add_parser("rebuild-sales", help="recompute the sales rollups from Orders and Payment")
+
+    p = sub.add_parser("evaluate-queue", help="run vendor evaluation workers against the queue")
+    p.add_argument("--drain", action="store_true", help="process everything due, then exit")
+    p.add_argument("--no-debounce", action="store_true", help="evaluate queued vendors immediately")
+    p.add_argument("--workers", type=int, default=EVAL_WORKERS)
+    p.add_argument("--batch-size", type=int, default=EVAL_BATCH_SIZE)
+
+    sub.add_parser("queue-status", help="show evaluation queue depth and lag")
+
+    p = sub.add_parser("rescore-vendors", help="recompute every vendor's performance score in bulk")
+    p.add_argument("--chunk-size", type=int, default=RESCORE_CHUNK, help="vendor IDs per set-based pass")
+    p.add_argument("--dry-run", action="store_true", help="compute scores without writing them")
+
+    p = sub.add_parser("rollup-performance", help="refresh the day / week / month performance rollups")
+    p.add_argument("--rebuild", action="store_true", help="recompute all history, archives included")
+    p.add_argument("--lookback-days", type=int, default=ROLLUP_LOOKBACK_DAYS,
+                   help="days before the watermark to re-aggregate (late status / payment changes)")
+
+    p = sub.add_parser("partitions", help="pre-create upcoming monthly Audit_Log partitions")
+    p.add_argument("--months-ahead", type=int, default=archive.PARTITIONS_AHEAD)
+
+    p = sub.add_parser("archive", help="move cold Audit_Log partitions, orders and reviews to archive storage")
+    p.add_argument("--audit-months", type=int, default=archive.AUDIT_RETENTION_MONTHS,
+                   help="keep this many months of Audit_Log partitions")
+    p.add_argument("--order-days", type=int, default=archive.ORDER_RETENTION_DAYS,
+                   help="archive finished orders (and their payments) older than this")
+    p.add_argument("--review-days", type=int, default=archive.REVIEW_RETENTION_DAYS)
+    p.add_argument("--audit-to", choices=["table", "file"], default="table",
+                   help="Audit_Log_Archive table or compressed CSV files under exports/archive")
+    p.add_argument("--dry-run", action="store_true", help="report what would be archived")
+
+    p = sub.add_parser("migrate-passwords", help="hash every password still stored in plaintext")
+    p.add_argument("--batch-size", type=int, default=MIGRATE_BATCH)
+    p.add_argument("--workers", type=int, default=None, help="hashing threads (default: CPU count)")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "reconcile-ratings":
+        mismatches = reconcile_ratings(fix=args.fix)
+        for row in mismatches:
+            print("Vendor %s: expected (count=%s, sum=%s, positive=%s), stored (count=%s, sum=%s, positive=%s)"
+                  % (row[0], row[1], row[3], row[5], row[2], row[4], row[6]))
+        if not mismatches:
+            print("✅ Vendor review aggregates match Review")
+            return 0
+        print(f"{'🔧 Rebuilt' if args.fix else '❌ Found'} {len(mismatches)} mismatched vendor(s)")
+        return 0 if args.fix else 1
+
+    if args.command == "rebuild-sales":
+        vendors, revenue = rebuild_sales()
+        print(f"✅ Rebuilt sales rollups for {vendors} vendor(s), total revenue ₹{revenue:,.2f}")
+
+    if args.command == "evaluate-queue":
+        evaluated = evaluate_queue(args.drain, not args.no_debounce, args.workers, args.batch_size)
+        print(f"✅ Evaluated {evaluated} vendor(s)")
+
+    if args.command == "queue-status":
+        with get_pool().connection() as conn:
+            stats = queue_stats(conn)
+        print(f"🧮 {stats['Depth']} vendor(s) queued ({stats['Pending_Requests']} requests), "
+              f"{stats['In_Progress']} in progress, {stats['Failing']} failing, "
+              f"oldest waiting {stats['Oldest_Lag_S']}s")
+
+    if args.command == "rescore-vendors":
+        def progress(done, upto, last):
+            print(f"  … {done:,} vendors (IDs up to {min(upto, last):,} of {last:,})")
+
+        with get_pool().connection() as conn:
+            r = rescore_all(conn, args.chunk_size, args.dry_run, progress)
+        print(f"{'🧪 Computed' if args.dry_run else '✅ Rescored'} {r['vendors']:,} vendor(s) in {r['elapsed_s']:.1f}s "
+              f"({r['vendors_per_s']:,.0f}/s; read {r['read_s']:.1f}s, compute {r['compute_s']:.1f}s, "
+              f"write {r['write_s']:.1f}s)")
+
+    if args.command == "rollup-performance":
+        with get_pool().connection() as conn:
+            r = refresh_rollups(conn, args.rebuild, args.lookback_days)
+        print(f"{'🔧 Rebuilt' if r['rebuild'] else '✅ Refreshed'} rollups from {r['since']:%Y-%m-%d}: "
+              f"{r['periods']['day']:,} day, {r['periods']['week']:,} week, {r['periods']['month']:,} month "
+              f"row(s) in {r['elapsed_s']:.1f}s (watermark {r['watermark']:%Y-%m-%d %H:%M:%S})")
+        if r["late_days"]:
+            print(f"  … plus {r['late_days']:,} older day(s) with late order / payment changes")
+
+    if args.command == "partitions":
+        with get_pool().connection() as conn:
+            added = archive.ensure_partitions(conn, args.months_ahead)
+        print(f"✅ Added partitions: {', '.join(added)}" if added else "✅ Audit_Log partitions are up to date")
+
+    if args.command == "archive":
+        with get_pool().connection() as conn:
+            r = archive.run_archival(conn, args.audit_months, args.order_days, args.review_days,
+                                     args.audit_to, args.dry_run)
+        verb = "Would archive" if args.dry_run else "Archived"
+        for name, rows, path in r["audit_partitions"]:
+            print(f"🗄️ {verb} Audit_Log partition {name} (~{rows:,} rows){' → ' + path if path else ''}")
+        if r["partitions_added"]:
+            print(f"➕ Added partitions: {', '.join(r['partitions_added'])}")
+        print(f"✅ {verb} {r['orders']:,} order(s) with their payments and {r['reviews']:,} review(s) "
+              f"in {r['elapsed_s']:.1f}s")
+    if args.command == "migrate-passwords":
+        def progress(table, done, last_id):
+            print(f"  … {table}: {done:,} hashed (IDs up to {last_id:,})")
+
+        with get_pool().connection() as conn:
+            migrated = migrate_passwords(conn, args.batch_size, args.workers, progress)
+        print("✅ Hashed " + ", ".join(f"{n:,} {table}" for table, n in migrated.items()) + " password(s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+# =====================================================
+# 🚚 ORDER STATUS TRANSITIONS (bulk, vendor-scoped)
+# =====================================================
+# Moves many orders to a new status in one transaction: the vendor's orders
+# are locked and filtered by ownership and legal source status, updated with
+# one set-based UPDATE, and audited with one INSERT ... SELECT. The same
+# transition table is enforced by trg_orders_status_transition in the schema.
+import time
+from collections import namedtuple
+
+from mysql.connector import Error
+
+import queries as q
+from orders import MAX_RETRIES, RETRYABLE_ERRNOS, retry_delay
+from query_cache import tables_written
+
+STATUSES = ["Pending", "Processing", "Shipped", "Delivered", "Cancelled"]
+
+# Legal moves; keep in sync with trg_orders_status_transition
+TRANSITIONS = {
+    "Pending": ["Processing", "Cancelled"],
+    "Processing": ["Shipped", "Cancelled"],
+    "Shipped": ["Delivered"],
+    "Delivered": [],
+    "Cancelled": [],
+}
+
+STATUS_BATCH = 1000     # orders per transaction
+
+StatusUpdateResult = namedtuple("StatusUpdateResult", "updated not_found illegal elapsed_s")
+
+# Tables a transition writes (for cache invalidation)
+STATUS_WRITES = (tables_written(q.UPDATE_ORDER_STATUSES) | tables_written(q.AUDIT_ORDER_UPDATES)
+                 | tables_written(q.ENQUEUE_VENDOR_EVALUATION))
+
+
+def sources_for(status):
+    return [s for s, targets in TRANSITIONS.items() if status in targets]
+
+
+def _transition_once(conn, vendor_id, order_ids, status, sources, user):
+    ids = q.id_list(len(order_ids))
+    cur = conn.cursor()
+    try:
+        cur.execute(q.VENDOR_ORDER_STATUSES_FOR_UPDATE.format(ids=ids), (*order_ids, vendor_id))
+        current = dict(cur.fetchall())
+        legal = [i for i, s in current.items() if s in sources]
+        illegal = {i: s for i, s in current.items() if s not in sources}
+        if legal:
+            ids = q.id_list(len(legal))
+            cur.execute(q.UPDATE_ORDER_STATUSES.format(ids=ids, sources=q.id_list(len(sources))),
+                        (status, *legal, *sources))
+            cur.execute(q.AUDIT_ORDER_UPDATES.format(ids=ids), (user, *legal))
+            cur.execute(q.ENQUEUE_VENDOR_EVALUATION, (vendor_id,))
+        conn.commit()
+        return legal, [i for i in order_ids if i not in current], illegal
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+
+
+def transition_orders(conn, vendor_id, order_ids, status, user=None, retries=MAX_RETRIES):
+    # Orders the vendor doesn't own are reported as not_found; orders whose
+    # current status can't move to `status` are reported in illegal {id: status}
+    if status not in TRANSITIONS:
+        raise ValueError(f"Unknown order status {status!r}")
+    sources = sources_for(status)
+    order_ids = list(dict.fromkeys(int(i) for i in order_ids))
+    user = user or f"vendor:{vendor_id}"
+    started = time.perf_counter()
+    updated, not_found, illegal = [], [], {}
+    conn.rollback()
+    for lo in range(0, len(order_ids), STATUS_BATCH):
+        batch = order_ids[lo:lo + STATUS_BATCH]
+        for attempt in range(1, retries + 2):
+            try:
+                done, missing, bad = _transition_once(conn, vendor_id, batch, status, sources, user)
+                break
+            except Error as e:
+                if e.errno not in RETRYABLE_ERRNOS or attempt > retries:
+                    raise
+                time.sleep(retry_delay(attempt))
+        updated += done
+        not_found += missing
+        illegal.update(bad)
+    return StatusUpdateResult(updated, not_found, illegal, time.perf_counter() - started)
@@ -0,0 +1,82 @@
+# =====================================================
+# 🛍️ ORDER PLACEMENT SERVICE
+# =====================================================
+# One transaction per order: the product row is locked (SELECT ... FOR UPDATE)
+# so the stock check and trg_reduce_stock's decrement cannot interleave with
+# another buyer, then Orders and Payment are inserted and committed together.
+import random
+import time
+from collections import namedtuple
+
+from mysql.connector import Error
+
+import queries as q
+from query_cache import tables_written
+
+# ER_LOCK_DEADLOCK, ER_LOCK_WAIT_TIMEOUT: the transaction was rolled back, safe to retry
+RETRYABLE_ERRNOS = {1213, 1205}
+MAX_RETRIES = 3
+RETRY_BACKOFF = 0.05   # seconds, doubled per attempt (with jitter)
+
+OrderResult = namedtuple("OrderResult", "order_id amount attempts")
+
+# Tables an order writes, directly or through triggers (for cache invalidation)
+ORDER_WRITES = tables_written(q.INSERT_ORDER) | tables_written(q.INSERT_PAYMENT)
+
+
+class OrderError(Exception):
+    pass
+
+
+class InvalidProduct(OrderError):
+    pass
+
+
+class InsufficientStock(OrderError):
+    def __init__(self, available):
+        super().__init__(f"Only {available} left in stock")
+        self.available = available
+
+
+def retry_delay(attempt):
+    # Jittered, so transactions that deadlocked together don't retry in lockstep
+    return RETRY_BACKOFF * (2 ** (attempt - 1)) * (0.5 + random.random())
+
+
+def _place_once(conn, customer_id, product_id, quantity, payment_method):
+    cur = conn.cursor()
+    try:
+        cur.execute(q.PRODUCT_PRICE_STOCK_FOR_UPDATE, (product_id,))
+        row = cur.fetchone()
+        if row is None:
+            raise InvalidProduct(f"Product #{product_id} does not exist")
+        price, stock = row
+        if quantity > stock:
+            raise InsufficientStock(stock)
+
+        cur.execute(q.INSERT_ORDER, (customer_id, product_id, quantity))
+        order_id = cur.lastrowid
+        amount = price * quantity
+        cur.execute(q.INSERT_PAYMENT, (order_id, customer_id, payment_method, amount))
+        conn.commit()
+        return order_id, amount
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+
+
+def place_order(conn, customer_id, product_id, quantity, payment_method, retries=MAX_RETRIES):
+    if quantity < 1:
+        raise OrderError("Quantity must be at least 1")
+    # A previous read on this connection may still hold a snapshot; start clean
+    conn.rollback()
+    for attempt in range(1, retries + 2):
+        try:
+            order_id, amount = _place_once(conn, customer_id, product_id, quantity, payment_method)
+            return OrderResult(order_id, amount, attempt)
+        except Error as e:
+            if e.errno not in RETRYABLE_ERRNOS or attempt > retries:
+                raise
+            time.sleep(retry_delay(attempt))
@@ -0,0 +1,189 @@
+# =====================================================
+# 📥 BULK PRODUCT IMPORT (CSV / Excel)
+# =====================================================
+# Validates an uploaded sheet against the Product constraints column-wise, then
+# upserts valid rows with multi-row INSERT ... ON DUPLICATE KEY UPDATE
+# statements, IMPORT_BATCH rows each, committed every IMPORT_TXN_ROWS rows.
+# A batch the server rejects is retried row by row so errors point at rows.
+#
+# Usage:
+#   python product_import.py VENDOR_ID products.csv
+import argparse
+import os
+import sys
+import time
+from collections import namedtuple
+
+import pandas as pd
+from mysql.connector import Error
+
+from db import get_pool
+
+CATEGORIES = ["Electronics", "Clothing", "Grocery", "Books", "Home", "Others"]
+COLUMNS = ["Name", "Description", "Price", "Stock", "Category"]
+REQUIRED = ["Name", "Price"]
+NAME_MAX = 100
+PRICE_MAX = 99999999.99          # DECIMAL(10,2)
+STOCK_MAX = 2**31 - 1            # INT
+IMPORT_BATCH = 1000              # rows per multi-row INSERT
+IMPORT_TXN_ROWS = 10000          # rows per transaction
+
+ImportResult = namedtuple("ImportResult", "inserted updated failed errors elapsed_s rows_per_s")
+
+_UPSERT_HEAD = "INSERT INTO Product (Name, Description, Price, Stock, Category, Vendor_ID) VALUES "
+_UPSERT_ROW = "(%s,%s,%s,%s,%s,%s)"
+_UPSERT_TAIL = """
+    ON DUPLICATE KEY UPDATE
+        Description = VALUES(Description),
+        Price = VALUES(Price),
+        Stock = VALUES(Stock),
+        Category = VALUES(Category)
+"""
+EXISTING_NAMES = "SELECT Name FROM Product WHERE Vendor_ID = %s"
+
+
+def upsert_sql(rows):
+    return _UPSERT_HEAD + ",".join([_UPSERT_ROW] * rows) + _UPSERT_TAIL
+
+
+def template_csv():
+    return ",".join(COLUMNS) + "\nWireless Mouse,2.4 GHz with USB receiver,799.00,150,Electronics\n"
+
+
+def read_upload(file, filename):
+    # Excel needs openpyxl; CSV works with pandas alone
+    if filename.lower().endswith((".xlsx", ".xls")):
+        df = pd.read_excel(file, dtype=str)
+    else:
+        df = pd.read_csv(file, dtype=str, keep_default_na=False)
+    by_lower = {c.strip().lower(): c for c in df.columns}
+    missing = [c for c in REQUIRED if c.lower() not in by_lower]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+    df = df.rename(columns={by_lower[c.lower()]: c for c in COLUMNS if c.lower() in by_lower})
+    for c in COLUMNS:
+        if c not in df.columns:
+            df[c] = ""
+    return df[COLUMNS].fillna("")
+
+
+def validate(df):
+    # Returns (clean rows, errors); "Row" is the line number in the uploaded file
+    rows = pd.Series(df.index + 2, index=df.index)
+    name = df["Name"].astype(str).str.strip()
+    desc = df["Description"].astype(str).str.strip()
+    # Rounded before the checks, so 0.001 fails here rather than against DECIMAL(10,2) in the batch
+    price = pd.to_numeric(df["Price"].astype(str).str.replace(",", "").str.strip(), errors="coerce").round(2)
+    stock_raw = df["Stock"].astype(str).str.strip()
+    stock = pd.to_numeric(stock_raw.where(stock_raw != "", "0"), errors="coerce")
+    category = df["Category"].astype(str).str.strip().str.title().replace("", "Others")
+
+    checks = [
+        ("Name", name == "", "Name is required"),
+        ("Name", name.str.len() > NAME_MAX, f"Name longer than {NAME_MAX} characters"),
+        ("Price", price.isna(), "Price is not a number"),
+        ("Price", price <= 0, "Price must be greater than 0"),
+        ("Price", price > PRICE_MAX, "Price is too large"),
+        ("Stock", stock.isna() | (stock % 1 != 0), "Stock must be a whole number"),
+        ("Stock", stock < 0, "Stock cannot be negative"),
+        ("Stock", stock > STOCK_MAX, "Stock is too large"),
+        ("Category", ~category.isin(CATEGORIES), f"Category must be one of {', '.join(CATEGORIES)}"),
+        # Product names are unique per vendor (case-insensitive collation); first occurrence wins
+        ("Name", (name != "") & name.str.casefold().duplicated(), "Duplicate name in file"),
+    ]
+    errors = [pd.DataFrame({"Row": rows[mask], "Column": col, "Error": msg})
+              for col, mask, msg in checks if mask.any()]
+    errors = pd.concat(errors, ignore_index=True).sort_values("Row") if errors else \
+        pd.DataFrame(columns=["Row", "Column", "Error"])
+
+    ok = ~rows.isin(errors["Row"])
+    clean = pd.DataFrame({
+        "Row": rows[ok],
+        "Name": name[ok],
+        "Description": desc[ok],
+        "Price": price[ok],
+        "Stock": stock[ok].astype("int64"),
+        "Category": category[ok],
+    })
+    return clean, errors
+
+
+def _params(batch, vendor_id):
+    params = []
+    for name, desc, price, stock, category in batch.itertuples(index=False, name=None):
+        params.extend((name, desc or None, float(price), int(stock), category, vendor_id))
+    return params
+
+
+def import_products(conn, vendor_id, clean, batch_size=IMPORT_BATCH, txn_rows=IMPORT_TXN_ROWS, progress=None):
+    started = time.perf_counter()
+    conn.rollback()
+    cur = conn.cursor()
+    cur.execute(EXISTING_NAMES, (vendor_id,))
+    existing = {r[0].casefold() for r in cur.fetchall()}
+
+    done, failed = 0, []
+    txn_start = 0      # first row not yet committed
+    values = clean[["Name", "Description", "Price", "Stock", "Category"]]
+    try:
+        for lo in range(0, len(clean), batch_size):
+            batch = values.iloc[lo:lo + batch_size]
+            hi = lo + len(batch)
+            try:
+                cur.execute(upsert_sql(len(batch)), _params(batch, vendor_id))
+            except Error:
+                # The whole transaction is rolled back; redo its rows one by one to find the bad ones
+                conn.rollback()
+                for i in range(txn_start, hi):
+                    try:
+                        cur.execute(upsert_sql(1), _params(values.iloc[i:i + 1], vendor_id))
+                        conn.commit()
+                        done += 1
+                    except Error as e:
+                        conn.rollback()
+                        failed.append({"Row": int(clean["Row"].iloc[i]), "Column": "", "Error": e.msg})
+                txn_start = hi
+                continue
+            if hi - txn_start >= txn_rows:
+                conn.commit()
+                done += hi - txn_start
+                txn_start = hi
+            if progress:
+                progress(hi, len(clean))
+        conn.commit()
+        done += len(clean) - txn_start
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+
+    failed_rows = {f["Row"] for f in failed}
+    imported = clean[~clean["Row"].isin(failed_rows)]
+    updated = int(imported["Name"].str.casefold().isin(existing).sum())
+    elapsed = time.perf_counter() - started
+    return ImportResult(done - updated, updated, len(failed), pd.DataFrame(failed, columns=["Row", "Column", "Error"]),
+                        elapsed, done / elapsed if elapsed else 0.0)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk import products for a vendor from CSV / Excel")
+    parser.add_argument("vendor_id", type=int)
+    parser.add_argument("file")
+    parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH)
+    args = parser.parse_args(argv)
+
+    df = read_upload(args.file, os.path.basename(args.file))
+    clean, errors = validate(df)
+    with get_pool().connection() as conn:
+        r = import_products(conn, args.vendor_id, clean, args.batch_size)
+    errors = pd.concat([errors, r.errors], ignore_index=True)
+    for row in errors.itertuples(index=False):
+        print(f"❌ row {row.Row}: {row.Column + ': ' if row.Column else ''}{row.Error}")
+    print(f"✅ {r.inserted:,} inserted, {r.updated:,} updated, {len(errors):,} rejected "
+          f"in {r.elapsed_s:.1f}s ({r.rows_per_s:,.0f} rows/s)")
+    return 1 if len(errors) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
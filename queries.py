@@ -0,0 +1,471 @@
+# =====================================================
+# 📜 SQL ISSUED BY THE PORTAL
+# =====================================================
+# Every statement the Streamlit app runs lives here so tooling (index advisor,
+# benchmarks) can replay exactly what the dashboards issue.
+from collections import namedtuple
+
+from search import search_query
+
+# -----------------------------------------------------
+# Authentication
+# -----------------------------------------------------
+# Looked up by login name only; the password hash (last column) is checked in auth.py
+LOGIN_ADMIN = "SELECT Admin_ID, Username, Password FROM Admin WHERE Username=%s"
+LOGIN_VENDOR = "SELECT Vendor_ID, Name, Password FROM Vendor WHERE Email=%s"
+LOGIN_CUSTOMER = "SELECT Customer_ID, Name, Password FROM Customer WHERE Email=%s"
+LOGIN_QUERIES = {"Admin": LOGIN_ADMIN, "Vendor": LOGIN_VENDOR, "Customer": LOGIN_CUSTOMER}
+
+# Re-hash on login (plaintext rows, or a changed AUTH_HASH_ITERATIONS)
+REHASH_PASSWORD = {
+    "Admin": "UPDATE Admin SET Password=%s WHERE Admin_ID=%s",
+    "Vendor": "UPDATE Vendor SET Password=%s WHERE Vendor_ID=%s",
+    "Customer": "UPDATE Customer SET Password=%s WHERE Customer_ID=%s",
+}
+
+INSERT_VENDOR = """
+    INSERT INTO Vendor (Name, Email, Password, Contact_No, Business_Type)
+    VALUES (%s,%s,%s,%s,%s)
+"""
+INSERT_CUSTOMER = """
+    INSERT INTO Customer (Name, Email, Password, Phone, Address, Gender)
+    VALUES (%s,%s,%s,%s,%s,%s)
+"""
+
+# -----------------------------------------------------
+# Paginated tables (keyset pagination)
+# -----------------------------------------------------
+# keys: [(sql_expr, output_column)] forming a unique ordering, e.g. the primary key
+# window_column: date column for "recent rows only" filters (partition pruning on Audit_Log)
+PageSpec = namedtuple("PageSpec", "columns source keys count_table descending window_column", defaults=(None,))
+
+ADMIN_VENDORS_PAGE = PageSpec(
+    """Vendor_ID, Name, Email, Contact_No, Business_Type, Avg_Review_Rating,
+       Customer_Satisfaction_Rate, Performance_Score, Vendor_Status,
+       Registration_Date, Last_Evaluation_Date, Last_Feedback_Date""",
+    "Vendor", [("Vendor_ID", "Vendor_ID")], "Vendor", False)
+
+ADMIN_PRODUCTS_PAGE = PageSpec(
+    "Product_ID, Name, Price, Stock, Category, Vendor_ID",
+    "Product", [("Product_ID", "Product_ID")], "Product", False)
+
+ADMIN_ORDERS_PAGE = PageSpec(
+    "O.Order_ID, C.Name AS Customer, P.Name AS Product, O.Quantity, O.Status, O.Order_Date",
+    """Orders O
+       JOIN Customer C ON O.Customer_ID = C.Customer_ID
+       JOIN Product P ON O.Product_ID = P.Product_ID""",
+    [("O.Order_ID", "Order_ID")], "Orders", True, "O.Order_Date")
+
+ADMIN_PAYMENTS_PAGE = PageSpec(
+    "Payment_ID, Order_ID, Customer_ID, Payment_Method, Payment_Status, Amount, Currency, Payment_Date",
+    "Payment", [("Payment_ID", "Payment_ID")], "Payment", True, "Payment_Date")
+
+ADMIN_REVIEWS_PAGE = PageSpec(
+    """R.Review_ID, C.Name AS Customer, V.Name AS Vendor, P.Name AS Product,
+       R.Rating, R.Sentiment, R.Comment, R.Review_Date""",
+    """Review R
+       JOIN Customer C ON R.Customer_ID = C.Customer_ID
+       JOIN Vendor V ON R.Vendor_ID = V.Vendor_ID
+       JOIN Product P ON R.Product_ID = P.Product_ID""",
+    [("R.Review_ID", "Review_ID")], "Review", True, "R.Review_Date")
+
+ADMIN_AUDIT_PAGE = PageSpec(
+    "Log_ID, Table_Name, Operation, Record_ID, Operation_Time",
+    "Audit_Log", [("Operation_Time", "Operation_Time"), ("Log_ID", "Log_ID")], "Audit_Log", True,
+    "Operation_Time")
+
+ESTIMATED_ROW_COUNT = """
+    SELECT TABLE_ROWS FROM information_schema.TABLES
+    WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+"""
+
+
+def _seek_predicate(key_exprs, op):
+    # (a, b) < (x, y) spelled out so MySQL turns it into a range scan on the index
+    clauses = []
+    for i, expr in enumerate(key_exprs):
+        equal = [f"{e} = %s" for e in key_exprs[:i]]
+        clauses.append("(" + " AND ".join(equal + [f"{expr} {op} %s"]) + ")")
+    return "(" + " OR ".join(clauses) + ")"
+
+
+def _seek_params(values):
+    params = []
+    for i in range(len(values)):
+        params.extend(values[:i + 1])
+    return params
+
+
+def keyset_query(spec, after=None, page_size=50, since=None):
+    key_exprs = [expr for expr, _ in spec.keys]
+    direction = "DESC" if spec.descending else "ASC"
+    query = f"SELECT {spec.columns} FROM {spec.source}"
+    clauses, params = [], []
+    if since is not None and spec.window_column:
+        clauses.append(f"{spec.window_column} >= %s")
+        params.append(since)
+    if after is not None:
+        clauses.append(_seek_predicate(key_exprs, "<" if spec.descending else ">"))
+        params.extend(_seek_params(list(after)))
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    query += " ORDER BY " + ", ".join(f"{e} {direction}" for e in key_exprs) + " LIMIT %s"
+    params.append(page_size)
+    return query, tuple(params)
+
+
+# -----------------------------------------------------
+# Admin dashboard
+# -----------------------------------------------------
+ADMIN_VENDOR_PERFORMANCE = """
+    SELECT Vendor_ID, Avg_Review_Rating, Last_Feedback_Date
+    FROM Vendor_Performance
+    ORDER BY Avg_Review_Rating DESC
+"""
+
+# Trend columns shared by the vendor and admin charts (rollups.py keeps the sums current)
+_TREND_COLUMNS = """
+    Period_Start,
+    ROUND(Rating_Sum / NULLIF(Rated_Count, 0), 2) AS Avg_Rating,
+    ROUND(Positive_Count * 100 / NULLIF(Review_Count, 0), 2) AS Satisfaction_Rate,
+    Review_Count AS Reviews,
+    Orders_Count AS Orders,
+    Delivered_Count AS Delivered,
+    Cancelled_Count AS Cancelled,
+    ROUND(Cancelled_Count * 100 / NULLIF(Orders_Count, 0), 2) AS Cancel_Rate,
+    Revenue
+"""
+
+PLATFORM_PERFORMANCE_TREND = f"""
+    SELECT {_TREND_COLUMNS}, Active_Vendors
+    FROM Platform_Performance_Rollup
+    WHERE Grain = %s AND Period_Start >= %s
+    ORDER BY Period_Start
+"""
+
+ROLLUP_WATERMARK = "SELECT Watermark FROM Rollup_Watermark WHERE Name = 'vendor_performance'"
+
+SALES_REPORT = """
+    SELECT
+        v.Vendor_ID,
+        v.Name,
+        v.Business_Type,
+        v.Avg_Review_Rating,
+        IFNULL(s.Total_Revenue, 0) AS Total_Sales
+    FROM Vendor v
+    LEFT JOIN Vendor_Sales_Summary s ON s.Vendor_ID = v.Vendor_ID
+    ORDER BY Total_Sales DESC
+"""
+
+# -----------------------------------------------------
+# Admin exports (export.py): streamed, optionally filtered on date_column
+# -----------------------------------------------------
+ExportSpec = namedtuple("ExportSpec", "columns source date_column")
+
+EXPORTS = {
+    "orders": ExportSpec(
+        """O.Order_ID, O.Customer_ID, C.Name AS Customer, O.Product_ID, P.Name AS Product,
+           P.Vendor_ID, O.Quantity, O.Status, O.Order_Date""",
+        """Orders O
+           JOIN Customer C ON O.Customer_ID = C.Customer_ID
+           JOIN Product P ON O.Product_ID = P.Product_ID""",
+        "O.Order_Date"),
+    "payments": ExportSpec(
+        "Payment_ID, Order_ID, Customer_ID, Payment_Method, Payment_Status, Amount, Currency, Payment_Date",
+        "Payment", "Payment_Date"),
+    "reviews": ExportSpec(
+        "Review_ID, Customer_ID, Vendor_ID, Product_ID, Rating, Sentiment, Comment, Review_Date",
+        "Review", "Review_Date"),
+    "audit_log": ExportSpec(
+        "Log_ID, Table_Name, Operation, Record_ID, User_Executed, Operation_Time",
+        "Audit_Log", "Operation_Time"),
+    "sales_report": ExportSpec(
+        """v.Vendor_ID, v.Name, v.Business_Type, v.Avg_Review_Rating,
+           IFNULL(s.Orders_Count, 0) AS Orders_Count, IFNULL(s.Units_Sold, 0) AS Units_Sold,
+           IFNULL(s.Total_Revenue, 0) AS Total_Sales""",
+        "Vendor v LEFT JOIN Vendor_Sales_Summary s ON s.Vendor_ID = v.Vendor_ID",
+        None),
+}
+
+
+def export_query(spec, start=None, end=None):
+    # start inclusive, end exclusive; no ORDER BY so rows stream straight off the scan
+    query = f"SELECT {spec.columns} FROM {spec.source}"
+    clauses, params = [], []
+    if spec.date_column and start is not None:
+        clauses.append(f"{spec.date_column} >= %s")
+        params.append(start)
+    if spec.date_column and end is not None:
+        clauses.append(f"{spec.date_column} < %s")
+        params.append(end)
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    return query, tuple(params)
+
+
+# -----------------------------------------------------
+# Vendor dashboard
+# -----------------------------------------------------
+VENDOR_PRODUCTS = "SELECT * FROM Product WHERE Vendor_ID=%s"
+
+VENDOR_ORDERS = """
+    SELECT
+        O.Order_ID,
+        C.Name AS Customer,
+        P.Name AS Product,
+        O.Quantity,
+        O.Status,
+        O.Order_Date
+    FROM Orders O
+    JOIN Customer C ON O.Customer_ID = C.Customer_ID
+    JOIN Product P ON O.Product_ID = P.Product_ID
+    WHERE P.Vendor_ID=%s
+    ORDER BY O.Order_Date DESC
+"""
+
+# Bulk status transitions (order_status.py); {ids} / {sources} are %s placeholder lists.
+# Locks only the vendor's own orders (not their Product rows) for the transaction.
+VENDOR_ORDER_STATUSES_FOR_UPDATE = """
+    SELECT O.Order_ID, O.Status
+    FROM Orders O
+    JOIN Product P ON O.Product_ID = P.Product_ID
+    WHERE O.Order_ID IN ({ids}) AND P.Vendor_ID=%s
+    FOR UPDATE OF O
+"""
+
+UPDATE_ORDER_STATUSES = "UPDATE Orders SET Status=%s WHERE Order_ID IN ({ids}) AND Status IN ({sources})"
+
+AUDIT_ORDER_UPDATES = """
+    INSERT INTO Audit_Log (Table_Name, Operation, Record_ID, User_Executed)
+    SELECT 'Orders', 'UPDATE', Order_ID, %s
+    FROM Orders
+    WHERE Order_ID IN ({ids})
+"""
+
+# Delivered / cancelled counts feed the performance score
+ENQUEUE_VENDOR_EVALUATION = """
+    INSERT INTO Vendor_Evaluation_Queue (Vendor_ID)
+    VALUES (%s)
+    ON DUPLICATE KEY UPDATE
+        Requested_Count = Requested_Count + 1,
+        Last_Requested_At = CURRENT_TIMESTAMP(3)
+"""
+
+
+def id_list(n):
+    return ", ".join(["%s"] * n)
+
+VENDOR_REVIEWS = """
+    SELECT R.Review_ID, C.Name AS Customer, R.Rating, R.Sentiment, R.Comment, R.Review_Date
+    FROM Review R
+    JOIN Customer C ON R.Customer_ID = C.Customer_ID
+    WHERE R.Vendor_ID=%s
+    ORDER BY R.Review_Date DESC
+"""
+
+VENDOR_PERFORMANCE = """
+    SELECT Vendor_ID, Avg_Review_Rating, Last_Feedback_Date
+    FROM Vendor
+    WHERE Vendor_ID=%s
+"""
+
+VENDOR_PERFORMANCE_TREND = f"""
+    SELECT {_TREND_COLUMNS}
+    FROM Vendor_Performance_Rollup
+    WHERE Vendor_ID = %s AND Grain = %s AND Period_Start >= %s
+    ORDER BY Period_Start
+"""
+
+VENDOR_TOTAL_SALES = """
+    SELECT IFNULL(MAX(Total_Revenue), 0) AS Total_Sales
+    FROM Vendor_Sales_Summary
+    WHERE Vendor_ID = %s
+"""
+
+VENDOR_PRODUCT_SALES = """
+    SELECT
+        pr.Name AS Product,
+        IFNULL(s.Orders_Count, 0) AS Orders_Count,
+        IFNULL(s.Units_Sold, 0) AS Units_Sold,
+        IFNULL(s.Revenue, 0) AS Revenue
+    FROM Product pr
+    LEFT JOIN Product_Sales_Summary s ON s.Product_ID = pr.Product_ID
+    WHERE pr.Vendor_ID = %s
+    ORDER BY Revenue DESC
+"""
+
+INSERT_PRODUCT = """
+    INSERT INTO Product (Name, Description, Price, Stock, Category, Vendor_ID)
+    VALUES (%s,%s,%s,%s,%s,%s)
+"""
+
+# -----------------------------------------------------
+# Customer dashboard
+# -----------------------------------------------------
+# Product search is built per term by search.search_query()
+PRODUCT_BROWSE = """
+    SELECT P.Product_ID, P.Name, P.Description, P.Price, P.Stock, P.Category,
+           V.Name AS Vendor, V.Avg_Review_Rating AS Vendor_Rating
+    FROM Product P
+    JOIN Vendor V ON P.Vendor_ID = V.Vendor_ID
+    ORDER BY V.Avg_Review_Rating DESC
+    LIMIT %s OFFSET %s
+"""
+
+PRODUCT_PRICE_STOCK_FOR_UPDATE = "SELECT Price, Stock FROM Product WHERE Product_ID=%s FOR UPDATE"
+INSERT_ORDER = "INSERT INTO Orders (Customer_ID, Product_ID, Quantity, Status) VALUES (%s,%s,%s,'Pending')"
+INSERT_PAYMENT = """
+    INSERT INTO Payment (Order_ID, Customer_ID, Payment_Method, Payment_Status, Amount)
+    VALUES (%s,%s,%s,'Completed',%s)
+"""
+
+CUSTOMER_ORDERS = """
+    SELECT O.Order_ID, P.Name AS Product, O.Quantity, O.Status, O.Order_Date
+    FROM Orders O
+    JOIN Product P ON O.Product_ID = P.Product_ID
+    WHERE O.Customer_ID=%s
+    ORDER BY O.Order_Date DESC
+"""
+
+REVIEWABLE_PRODUCTS = """
+    SELECT DISTINCT O.Product_ID, P.Name
+    FROM Orders O
+    JOIN Product P ON O.Product_ID = P.Product_ID
+    WHERE O.Customer_ID=%s AND O.Status='Delivered'
+"""
+
+PRODUCT_VENDOR = "SELECT Vendor_ID FROM Product WHERE Product_ID=%s"
+# Archived reviews still count: a product can only be reviewed once
+REVIEW_EXISTS = """
+    SELECT (SELECT COUNT(*) FROM Review WHERE Customer_ID=%s AND Product_ID=%s)
+         + (SELECT COUNT(*) FROM Review_Archive WHERE Customer_ID=%s AND Product_ID=%s)
+"""
+INSERT_REVIEW = """
+    INSERT INTO Review (Customer_ID, Vendor_ID, Product_ID, Comment, Rating, Sentiment)
+    VALUES (%s,%s,%s,%s,%s,%s)
+"""
+
+LEADERBOARD = """
+    SELECT
+        v.Vendor_ID,
+        v.Name,
+        v.Business_Type,
+        v.Avg_Review_Rating,
+        IFNULL(s.Total_Revenue, 0) AS Total_Sales
+    FROM Vendor v
+    LEFT JOIN Vendor_Sales_Summary s ON s.Vendor_ID = v.Vendor_ID
+    ORDER BY v.Avg_Review_Rating DESC, Total_Sales DESC
+"""
+
+# -----------------------------------------------------
+# Vendor evaluation queue (evaluation_queue.py)
+# -----------------------------------------------------
+# Rows become due once the vendor has been quiet for the debounce window (or has
+# waited max_delay), are not backing off, and are unclaimed or their claim expired.
+CLAIM_EVALUATIONS = """
+    SELECT Vendor_ID, Requested_Count, Last_Requested_At,
+           TIMESTAMPDIFF(MICROSECOND, First_Requested_At, NOW(3)) / 1000000 AS Lag_S
+    FROM Vendor_Evaluation_Queue
+    WHERE (Claimed_At IS NULL OR Claimed_At < NOW(3) - INTERVAL %s SECOND)
+      AND Not_Before <= NOW(3)
+      AND Attempts < %s
+      AND (Last_Requested_At <= NOW(3) - INTERVAL %s SECOND
+           OR First_Requested_At <= NOW(3) - INTERVAL %s SECOND)
+    ORDER BY First_Requested_At
+    LIMIT %s
+    FOR UPDATE SKIP LOCKED
+"""
+MARK_EVALUATION_CLAIMED = """
+    UPDATE Vendor_Evaluation_Queue SET Claimed_At = NOW(3), Claimed_By = %s WHERE Vendor_ID = %s
+"""
+# Only removes the row if no new request arrived while the vendor was being evaluated
+COMPLETE_EVALUATION = "DELETE FROM Vendor_Evaluation_Queue WHERE Vendor_ID = %s AND Last_Requested_At = %s"
+REQUEUE_EVALUATION = """
+    UPDATE Vendor_Evaluation_Queue
+    SET Claimed_At = NULL, Claimed_By = NULL, Attempts = 0, Last_Error = NULL,
+        Requested_Count = GREATEST(Requested_Count - %s, 1),
+        First_Requested_At = Last_Requested_At
+    WHERE Vendor_ID = %s
+"""
+FAIL_EVALUATION = """
+    UPDATE Vendor_Evaluation_Queue
+    SET Claimed_At = NULL, Claimed_By = NULL, Attempts = Attempts + 1, Last_Error = %s,
+        Not_Before = NOW(3) + INTERVAL %s * Attempts SECOND   -- Attempts is already incremented
+    WHERE Vendor_ID = %s
+"""
+EVALUATION_QUEUE_STATS = """
+    SELECT COUNT(*) AS Depth,
+           IFNULL(SUM(Requested_Count), 0) AS Pending_Requests,
+           IFNULL(SUM(Claimed_At IS NOT NULL), 0) AS In_Progress,
+           IFNULL(SUM(Attempts > 0), 0) AS Failing,
+           IFNULL(TIMESTAMPDIFF(SECOND, MIN(First_Requested_At), NOW(3)), 0) AS Oldest_Lag_S
+    FROM Vendor_Evaluation_Queue
+"""
+
+# -----------------------------------------------------
+# Registry: name -> (sql, sample params) for every read/update the app issues.
+# Sample params only need to be plausible; they are used for EXPLAIN and replay.
+# -----------------------------------------------------
+_SAMPLE_CURSOR = {
+    "Vendor": (1000,),
+    "Product": (1000,),
+    "Orders": (1000000,),
+    "Payment": (1000000,),
+    "Review": (1000000,),
+    "Audit_Log": ("2026-01-01 00:00:00", 1000000),
+}
+
+
+def _page_queries(name, spec):
+    first = keyset_query(spec, None, 50)
+    seek = keyset_query(spec, _SAMPLE_CURSOR[spec.count_table], 50)
+    pages = {f"{name}.first_page": first, f"{name}.next_page": seek}
+    if spec.window_column:
+        pages[f"{name}.recent_first_page"] = keyset_query(spec, None, 50, "2026-01-01 00:00:00")
+        pages[f"{name}.recent_next_page"] = keyset_query(spec, _SAMPLE_CURSOR[spec.count_table], 50,
+                                                         "2026-01-01 00:00:00")
+    return pages
+
+
+APP_QUERIES = {
+    "auth.login_admin": (LOGIN_ADMIN, ("admin",)),
+    "auth.login_vendor": (LOGIN_VENDOR, ("vendor@example.com",)),
+    "auth.login_customer": (LOGIN_CUSTOMER, ("customer@example.com",)),
+    **{f"auth.rehash_{role.lower()}": (sql, ("pbkdf2_sha256$...", 1)) for role, sql in REHASH_PASSWORD.items()},
+    **_page_queries("admin.vendors", ADMIN_VENDORS_PAGE),
+    **_page_queries("admin.products", ADMIN_PRODUCTS_PAGE),
+    **_page_queries("admin.orders", ADMIN_ORDERS_PAGE),
+    **_page_queries("admin.payments", ADMIN_PAYMENTS_PAGE),
+    **_page_queries("admin.reviews", ADMIN_REVIEWS_PAGE),
+    **_page_queries("admin.audit_log", ADMIN_AUDIT_PAGE),
+    "admin.row_estimate": (ESTIMATED_ROW_COUNT, ("Orders",)),
+    "admin.vendor_performance": (ADMIN_VENDOR_PERFORMANCE, ()),
+    "admin.performance_trend": (PLATFORM_PERFORMANCE_TREND, ("week", "2025-10-01")),
+    "admin.rollup_watermark": (ROLLUP_WATERMARK, ()),
+    "admin.sales_report": (SALES_REPORT, ()),
+    **{f"admin.export.{name}": export_query(spec, "2026-01-01", "2026-02-01") for name, spec in EXPORTS.items()},
+    "vendor.products": (VENDOR_PRODUCTS, (1,)),
+    "vendor.orders": (VENDOR_ORDERS, (1,)),
+    "vendor.order_statuses_for_update": (VENDOR_ORDER_STATUSES_FOR_UPDATE.format(ids=id_list(3)), (1, 2, 3, 1)),
+    "vendor.update_order_statuses": (UPDATE_ORDER_STATUSES.format(ids=id_list(3), sources=id_list(1)),
+                                     ("Shipped", 1, 2, 3, "Processing")),
+    "vendor.audit_order_updates": (AUDIT_ORDER_UPDATES.format(ids=id_list(3)), ("vendor:1", 1, 2, 3)),
+    "vendor.enqueue_evaluation": (ENQUEUE_VENDOR_EVALUATION, (1,)),
+    "vendor.reviews": (VENDOR_REVIEWS, (1,)),
+    "vendor.performance": (VENDOR_PERFORMANCE, (1,)),
+    "vendor.performance_trend": (VENDOR_PERFORMANCE_TREND, (1, "week", "2025-10-01")),
+    "vendor.total_sales": (VENDOR_TOTAL_SALES, (1,)),
+    "vendor.product_sales": (VENDOR_PRODUCT_SALES, (1,)),
+    "customer.product_search": search_query("phone"),
+    "customer.product_search_category": search_query("books"),
+    "customer.product_search_prefix": search_query("tv"),
+    "customer.product_browse": (PRODUCT_BROWSE, (26, 0)),
+    "customer.product_price_stock": (PRODUCT_PRICE_STOCK_FOR_UPDATE, (1,)),
+    "customer.orders": (CUSTOMER_ORDERS, (1,)),
+    "customer.reviewable_products": (REVIEWABLE_PRODUCTS, (1,)),
+    "customer.product_vendor": (PRODUCT_VENDOR, (1,)),
+    "customer.review_exists": (REVIEW_EXISTS, (1, 1, 1, 1)),
+    "customer.leaderboard": (LEADERBOARD, ()),
+    "worker.claim_evaluations": (CLAIM_EVALUATIONS, (300, 5, 5, 60, 100)),
+    "worker.queue_stats": (EVALUATION_QUEUE_STATS, ()),
+}
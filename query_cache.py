@@ -0,0 +1,177 @@
+# =====================================================
+# 🗃️ QUERY RESULT CACHE (TTL + LRU + write invalidation)
+# =====================================================
+import re
+import threading
+import time
+from collections import OrderedDict
+
+DEFAULT_TTL = 60                      # seconds
+CACHE_MAX_BYTES = 256 * 1024 * 1024   # memory cap across all cached frames
+
+# Tables written as a side effect of writing another table (triggers in
+# vendor_performance.sql). Keep in sync with the schema.
+TRIGGER_WRITES = {
+    "review": {"vendor", "vendor_performance", "vendor_review_stats", "vendor_evaluation_queue"},
+    "orders": {"product", "product_sales_summary", "vendor_sales_summary"},
+    "payment": {"product_sales_summary", "vendor_sales_summary"},
+    "vendor": {"audit_log", "vendor_sales_summary"},
+}
+
+# Tables written by stored procedures called through callproc()
+PROCEDURE_WRITES = {
+    "sp_evaluate_vendor": {"vendor", "vendor_performance"},
+    "sp_rebuild_vendor_review_stats": {"vendor", "vendor_review_stats"},
+    "sp_rebuild_sales_summary": {"product_sales_summary", "vendor_sales_summary"},
+}
+
+_READ_RE = re.compile(r"\b(?:FROM|JOIN)\s+`?(\w+)`?", re.IGNORECASE)
+_WRITE_RE = re.compile(
+    r"^\s*(?:INSERT\s+(?:IGNORE\s+)?INTO|REPLACE\s+INTO|UPDATE|DELETE\s+FROM)\s+`?(\w+)`?",
+    re.IGNORECASE,
+)
+
+
+def _with_side_effects(tables):
+    tables = set(tables)
+    pending = list(tables)
+    while pending:
+        for extra in TRIGGER_WRITES.get(pending.pop(), ()):
+            if extra not in tables:
+                tables.add(extra)
+                pending.append(extra)
+    return tables
+
+
+def tables_read(sql):
+    return {t.lower() for t in _READ_RE.findall(sql)}
+
+
+def tables_written(sql):
+    match = _WRITE_RE.match(sql)
+    return _with_side_effects({match.group(1).lower()}) if match else set()
+
+
+def procedure_writes(name):
+    return _with_side_effects(PROCEDURE_WRITES.get(name, ()))
+
+
+def make_key(sql, params=None):
+    return " ".join(sql.split()), tuple(params) if params else ()
+
+
+def _frame_size(df):
+    try:
+        return int(df.memory_usage(deep=True).sum())
+    except Exception:
+        return 0
+
+
+class _Entry:
+    __slots__ = ("value", "expires", "tables", "size")
+
+    def __init__(self, value, expires, tables, size):
+        self.value = value
+        self.expires = expires
+        self.tables = tables
+        self.size = size
+
+
+class QueryCache:
+    def __init__(self, max_bytes=CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()   # key -> _Entry, least recently used first
+        self._by_table = {}             # table -> set of keys reading it
+        self._versions = {}             # table -> write generation
+        self._written_at = {}           # table -> monotonic time of the last write
+        self._bytes = 0
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "invalidations": 0}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            if entry.expires <= time.monotonic():
+                self._drop(key)
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry.value
+
+    def version(self, tables):
+        # Snapshot of write generations; changes whenever any of the tables is written
+        with self._lock:
+            return tuple(self._versions.get(t, 0) for t in sorted(tables))
+
+    def put(self, key, value, ttl, tables, version=None):
+        tables = frozenset(tables)
+        size = _frame_size(value)
+        with self._lock:
+            # A write landed while this result was being read: don't cache stale data
+            if version is not None and version != tuple(self._versions.get(t, 0) for t in sorted(tables)):
+                return
+            if size > self.max_bytes:
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = _Entry(value, time.monotonic() + ttl, tables, size)
+            self._bytes += size
+            for table in tables:
+                self._by_table.setdefault(table, set()).add(key)
+            while self._bytes > self.max_bytes and self._entries:
+                self._drop(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def written_within(self, tables, seconds):
+        # True if this process wrote any of the tables in the last `seconds`
+        cutoff = time.monotonic() - seconds
+        with self._lock:
+            return any(self._written_at.get(t, float("-inf")) > cutoff for t in tables)
+
+    def invalidate(self, tables):
+        now = time.monotonic()
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+                self._written_at[table] = now
+                for key in list(self._by_table.get(table, ())):
+                    self._drop(key)
+                    self._stats["invalidations"] += 1
+
+    def discard(self, keys):
+        # Drop specific results (e.g. a user asked to refresh them)
+        with self._lock:
+            for key in keys:
+                self._drop(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._by_table.clear()
+            self._bytes = 0
+
+    def _drop(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        self._bytes -= entry.size
+        for table in entry.tables:
+            keys = self._by_table.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_table[table]
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({"entries": len(self._entries), "bytes": self._bytes, "max_bytes": self.max_bytes})
+        return stats
+
+
+result_cache = QueryCache()
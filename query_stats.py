@@ -0,0 +1,273 @@
+# =====================================================
+# 🩺 QUERY INSTRUMENTATION (timings, histograms, slow-query log)
+# =====================================================
+# Every data access in the app goes through tracer.trace(): it times each phase
+# (connect / execute / fetch / frame / commit), counts rows, tags the query with
+# its APP_QUERIES name and the dashboard section that issued it, and aggregates
+# everything into per-query latency histograms.
+import contextvars
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+import queries as q
+
+SLOW_QUERY_MS = 500          # queries slower than this are logged
+SLOW_LOG_SIZE = 50           # slow queries kept for the admin Performance tab
+BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+PHASES = ("connect", "execute", "fetch", "frame", "commit")
+
+log = logging.getLogger("vendor_portal.slow_queries")
+
+_caller = contextvars.ContextVar("query_caller", default="portal")
+
+
+def set_caller(name):
+    # Label for the dashboard section issuing the next queries, e.g. "admin/Orders"
+    _caller.set(name)
+
+
+def current_caller():
+    return _caller.get()
+
+
+def _normalize(sql):
+    return " ".join(sql.split())
+
+
+def _known_queries():
+    names = {}
+    # Module constants first so registry names win for shared SQL
+    for const, value in vars(q).items():
+        if const.isupper() and isinstance(value, str):
+            names[_normalize(value)] = const.lower()
+    for name, (sql, _) in q.APP_QUERIES.items():
+        names[_normalize(sql)] = name
+    return names
+
+
+_NAMES = _known_queries()
+
+
+def query_name(sql):
+    sql = _normalize(sql)
+    name = _NAMES.get(sql)
+    if name is None:
+        name = "adhoc." + hashlib.md5(sql.encode()).hexdigest()[:8]
+    return name
+
+
+class Span:
+    def __init__(self, name, sql, params, caller):
+        self.name = name
+        self.sql = sql
+        self.params = params
+        self.caller = caller
+        self.rows = 0
+        self.phases = {}
+        self._phase = None
+        self._phase_start = None
+        self.started = time.perf_counter()
+
+    def start(self, phase):
+        # Ends the running phase (if any) and starts timing the next one
+        now = time.perf_counter()
+        if self._phase is not None:
+            self.phases[self._phase] = self.phases.get(self._phase, 0.0) + now - self._phase_start
+        self._phase, self._phase_start = phase, now
+
+    def finish(self):
+        self.start(None)
+        return time.perf_counter() - self.started
+
+
+class _QueryStats:
+    def __init__(self, sql):
+        self.sql = sql
+        self.calls = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.rows = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)   # last bucket is +Inf
+
+    def observe(self, elapsed, rows, phases, error):
+        self.calls += 1
+        self.errors += bool(error)
+        self.rows += rows
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+        for phase, seconds in phases.items():
+            self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+        ms = elapsed * 1000
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    def quantile_ms(self, pct):
+        # Upper bound of the bucket holding the pct-th observation
+        if not self.calls:
+            return 0.0
+        target = self.calls * pct / 100.0
+        seen = 0
+        for bound, count in zip(BUCKETS_MS, self.buckets):
+            seen += count
+            if seen >= target:
+                return float(bound)
+        return self.max * 1000
+
+
+class QueryTracer:
+    def __init__(self, slow_ms=SLOW_QUERY_MS, slow_log_size=SLOW_LOG_SIZE):
+        self.slow_ms = slow_ms
+        self._stats = {}
+        self._slow = deque(maxlen=slow_log_size)
+        self._lock = threading.Lock()
+        self.since = time.time()
+
+    def _entry(self, name, caller, sql):
+        entry = self._stats.get((name, caller))
+        if entry is None:
+            entry = self._stats[(name, caller)] = _QueryStats(_normalize(sql)[:300])
+        return entry
+
+    @contextmanager
+    def trace(self, sql, params=None, name=None):
+        span = Span(name or query_name(sql), sql, params, current_caller())
+        error = None
+        try:
+            yield span
+        except BaseException as e:
+            error = e
+            raise
+        finally:
+            self.record(span, span.finish(), error)
+
+    def record(self, span, elapsed, error=None):
+        with self._lock:
+            self._entry(span.name, span.caller, span.sql).observe(elapsed, span.rows, span.phases, error)
+            if elapsed * 1000 >= self.slow_ms:
+                self._slow.append({
+                    "at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                    "query": span.name,
+                    "caller": span.caller,
+                    "ms": round(elapsed * 1000, 1),
+                    "rows": span.rows,
+                    "phases_ms": {k: round(v * 1000, 1) for k, v in span.phases.items()},
+                    "params": repr(span.params)[:200],
+                    "error": str(error) if error else None,
+                })
+        if elapsed * 1000 >= self.slow_ms:
+            log.warning("slow query %s (%s) %.0f ms, %d rows, phases %s",
+                        span.name, span.caller, elapsed * 1000, span.rows,
+                        {k: round(v * 1000, 1) for k, v in span.phases.items()})
+
+    def cache_hit(self, sql):
+        with self._lock:
+            self._entry(query_name(sql), current_caller(), sql).cache_hits += 1
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._slow.clear()
+            self.since = time.time()
+
+    def summary(self):
+        # One row per (query, caller), slowest total time first
+        with self._lock:
+            rows = []
+            for (name, caller), s in self._stats.items():
+                calls = s.calls or 1
+                row = {
+                    "query": name,
+                    "caller": caller,
+                    "calls": s.calls,
+                    "cache_hits": s.cache_hits,
+                    "errors": s.errors,
+                    "avg_rows": s.rows / calls,
+                    "total_ms": s.total * 1000,
+                    "avg_ms": s.total * 1000 / calls,
+                    "p50_ms": s.quantile_ms(50),
+                    "p95_ms": s.quantile_ms(95),
+                    "max_ms": s.max * 1000,
+                }
+                for phase in PHASES:
+                    row[f"{phase}_ms"] = s.phases.get(phase, 0.0) * 1000 / calls
+                row["sql"] = s.sql
+                rows.append(row)
+        return sorted(rows, key=lambda r: r["total_ms"], reverse=True)
+
+    def slow_queries(self):
+        with self._lock:
+            return list(reversed(self._slow))
+
+    # -------------------------------------------------
+    # Exports
+    # -------------------------------------------------
+    def json_lines(self):
+        with self._lock:
+            lines = []
+            for (name, caller), s in self._stats.items():
+                lines.append(json.dumps({
+                    "ts": time.time(),
+                    "query": name,
+                    "caller": caller,
+                    "calls": s.calls,
+                    "cache_hits": s.cache_hits,
+                    "errors": s.errors,
+                    "rows": s.rows,
+                    "seconds": s.total,
+                    "max_seconds": s.max,
+                    "phase_seconds": {k: v for k, v in s.phases.items() if v},
+                    "buckets_ms": dict(zip([str(b) for b in BUCKETS_MS] + ["+Inf"], s.buckets)),
+                }))
+        return "\n".join(lines) + "\n"
+
+    def prometheus_text(self):
+        out = [
+            "# HELP portal_query_duration_seconds Time spent per query, connect to DataFrame.",
+            "# TYPE portal_query_duration_seconds histogram",
+        ]
+        counters = {
+            "portal_query_rows_total": [],
+            "portal_query_cache_hits_total": [],
+            "portal_query_errors_total": [],
+            "portal_query_phase_seconds_total": [],
+        }
+        with self._lock:
+            for (name, caller), s in sorted(self._stats.items()):
+                labels = f'query="{_escape(name)}",caller="{_escape(caller)}"'
+                cumulative = 0
+                for bound, count in zip(BUCKETS_MS, s.buckets):
+                    cumulative += count
+                    out.append(f'portal_query_duration_seconds_bucket{{{labels},le="{bound / 1000:g}"}} {cumulative}')
+                out.append(f'portal_query_duration_seconds_bucket{{{labels},le="+Inf"}} {s.calls}')
+                out.append(f"portal_query_duration_seconds_sum{{{labels}}} {s.total:.6f}")
+                out.append(f"portal_query_duration_seconds_count{{{labels}}} {s.calls}")
+                counters["portal_query_rows_total"].append(f"{{{labels}}} {s.rows}")
+                counters["portal_query_cache_hits_total"].append(f"{{{labels}}} {s.cache_hits}")
+                counters["portal_query_errors_total"].append(f"{{{labels}}} {s.errors}")
+                for phase, seconds in s.phases.items():
+                    if seconds:
+                        counters["portal_query_phase_seconds_total"].append(
+                            f'{{{labels},phase="{phase}"}} {seconds:.6f}')
+        for metric, samples in counters.items():
+            out.append(f"# TYPE {metric} counter")
+            out.extend(metric + sample for sample in samples)
+        return "\n".join(out) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+tracer = QueryTracer()
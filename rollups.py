@@ -0,0 +1,186 @@
+# =====================================================
+# 📈 VENDOR PERFORMANCE ROLLUPS (day / week / month)
+# =====================================================
+# Keeps Vendor_Performance_Rollup and Platform_Performance_Rollup current so
+# trend charts read a few hundred pre-aggregated rows instead of scanning
+# Review / Orders / Payment.
+#
+# Each refresh recomputes the daily rows from the last watermark (minus a
+# lookback) with set-based INSERT ... SELECT statements, then re-derives the
+# weeks and months those days fall in from the daily rows. One transaction
+# per refresh, so charts never see a half-built period.
+#
+# Older days are recomputed when an order or payment bucketed there was
+# changed since the last run (Orders / Payment Updated_At), so a late status
+# change or refund still reaches its period. Deleted rows (customer or
+# product cascades) leave no trace, so run a `--rebuild` now and then.
+#
+# Run `python maintenance.py rollup-performance` every few minutes (cron).
+import time
+from datetime import date, timedelta
+
+ROLLUP_NAME = "vendor_performance"
+ROLLUP_LOOKBACK_DAYS = 7          # days re-aggregated before the watermark
+REBUILD_SINCE = date(1970, 1, 1)
+OPEN_END = date(9999, 12, 31)
+
+# Period_Start of the week / month containing a day's Period_Start
+GRAIN_PERIODS = {
+    "week": "DATE_SUB(Period_Start, INTERVAL WEEKDAY(Period_Start) DAY)",
+    "month": "DATE_SUB(Period_Start, INTERVAL DAYOFMONTH(Period_Start) - 1 DAY)",
+}
+
+# Source tables; a rebuild also reads the archives so history survives archival
+_LIVE = {"reviews": "Review", "orders": "Orders", "payments": "Payment"}
+_WITH_ARCHIVE = {
+    "reviews": "(SELECT * FROM Review UNION ALL SELECT * FROM Review_Archive)",
+    "orders": "(SELECT * FROM Orders UNION ALL SELECT * FROM Orders_Archive)",
+    "payments": "(SELECT * FROM Payment UNION ALL SELECT * FROM Payment_Archive)",
+}
+
+MEASURES = ["Review_Count", "Rated_Count", "Rating_Sum", "Positive_Count",
+            "Orders_Count", "Delivered_Count", "Cancelled_Count", "Revenue"]
+
+READ_WATERMARK = "SELECT Watermark FROM Rollup_Watermark WHERE Name = %s FOR UPDATE"
+WRITE_WATERMARK = """
+    INSERT INTO Rollup_Watermark (Name, Watermark) VALUES (%s, %s)
+    ON DUPLICATE KEY UPDATE Watermark = VALUES(Watermark)
+"""
+
+DELETE_VENDOR_PERIODS = "DELETE FROM Vendor_Performance_Rollup WHERE Grain = %s AND Period_Start >= %s"
+DELETE_VENDOR_DAY = "DELETE FROM Vendor_Performance_Rollup WHERE Grain = 'day' AND Period_Start = %s"
+DELETE_PLATFORM_PERIODS = "DELETE FROM Platform_Performance_Rollup WHERE Grain = %s AND Period_Start >= %s"
+
+REVIEW_DAYS = """
+    INSERT INTO Vendor_Performance_Rollup
+        (Vendor_ID, Grain, Period_Start, Review_Count, Rated_Count, Rating_Sum, Positive_Count)
+    SELECT R.Vendor_ID, 'day', DATE(R.Review_Date),
+           COUNT(*), COUNT(R.Rating), IFNULL(SUM(R.Rating), 0), SUM(R.Rating >= 4 OR R.Sentiment = 'Positive')
+    FROM {reviews} R
+    WHERE R.Review_Date >= %s AND R.Review_Date < %s
+    GROUP BY R.Vendor_ID, DATE(R.Review_Date)
+    ON DUPLICATE KEY UPDATE
+        Review_Count = VALUES(Review_Count),
+        Rated_Count = VALUES(Rated_Count),
+        Rating_Sum = VALUES(Rating_Sum),
+        Positive_Count = VALUES(Positive_Count)
+"""
+
+ORDER_DAYS = """
+    INSERT INTO Vendor_Performance_Rollup
+        (Vendor_ID, Grain, Period_Start, Orders_Count, Delivered_Count, Cancelled_Count)
+    SELECT P.Vendor_ID, 'day', DATE(O.Order_Date),
+           COUNT(*), SUM(O.Status = 'Delivered'), SUM(O.Status = 'Cancelled')
+    FROM {orders} O
+    JOIN Product P ON P.Product_ID = O.Product_ID
+    WHERE O.Order_Date >= %s AND O.Order_Date < %s
+    GROUP BY P.Vendor_ID, DATE(O.Order_Date)
+    ON DUPLICATE KEY UPDATE
+        Orders_Count = VALUES(Orders_Count),
+        Delivered_Count = VALUES(Delivered_Count),
+        Cancelled_Count = VALUES(Cancelled_Count)
+"""
+
+REVENUE_DAYS = """
+    INSERT INTO Vendor_Performance_Rollup (Vendor_ID, Grain, Period_Start, Revenue)
+    SELECT P.Vendor_ID, 'day', DATE(Pay.Payment_Date), SUM(Pay.Amount)
+    FROM {payments} Pay
+    JOIN {orders} O ON O.Order_ID = Pay.Order_ID
+    JOIN Product P ON P.Product_ID = O.Product_ID
+    WHERE Pay.Payment_Status = 'Completed' AND Pay.Payment_Date >= %s AND Pay.Payment_Date < %s
+    GROUP BY P.Vendor_ID, DATE(Pay.Payment_Date)
+    ON DUPLICATE KEY UPDATE Revenue = VALUES(Revenue)
+"""
+
+# Days before the refresh window holding orders / payments changed since the last run
+LATE_DAYS = """
+    SELECT DATE(Order_Date) FROM Orders WHERE Updated_At >= %s AND Order_Date < %s
+    UNION
+    SELECT DATE(Payment_Date) FROM Payment WHERE Updated_At >= %s AND Payment_Date < %s
+"""
+
+_SUMS = ", ".join(f"SUM({m})" for m in MEASURES)
+
+VENDOR_PERIODS = f"""
+    INSERT INTO Vendor_Performance_Rollup (Vendor_ID, Grain, Period_Start, {", ".join(MEASURES)})
+    SELECT Vendor_ID, %s, {{period}} AS Period, {_SUMS}
+    FROM Vendor_Performance_Rollup
+    WHERE Grain = 'day' AND Period_Start >= %s
+    GROUP BY Vendor_ID, Period
+"""
+
+PLATFORM_PERIODS = f"""
+    INSERT INTO Platform_Performance_Rollup (Grain, Period_Start, Active_Vendors, {", ".join(MEASURES)})
+    SELECT Grain, Period_Start, COUNT(*), {_SUMS}
+    FROM Vendor_Performance_Rollup
+    WHERE Grain = %s AND Period_Start >= %s
+    GROUP BY Grain, Period_Start
+"""
+
+# Tables written by a refresh (for cache invalidation)
+ROLLUP_WRITES = {"vendor_performance_rollup", "platform_performance_rollup", "rollup_watermark"}
+
+
+def period_start(day, grain):
+    if grain == "week":
+        return day - timedelta(days=day.weekday())
+    if grain == "month":
+        return day.replace(day=1)
+    return day
+
+
+def refresh_rollups(conn, rebuild=False, lookback_days=ROLLUP_LOOKBACK_DAYS):
+    started = time.perf_counter()
+    conn.rollback()
+    cur = conn.cursor()
+    try:
+        # Consistent reads without locking the source rows the INSERT ... SELECTs scan
+        conn.start_transaction(isolation_level="READ COMMITTED")
+        cur.execute("SELECT NOW()")
+        now = cur.fetchone()[0]
+        cur.execute(READ_WATERMARK, (ROLLUP_NAME,))   # also serialises concurrent refreshes
+        row = cur.fetchone()
+        rebuild = rebuild or row is None
+        since = REBUILD_SINCE if rebuild else row[0].date() - timedelta(days=lookback_days)
+        sources = _WITH_ARCHIVE if rebuild else _LIVE
+
+        late_days = []
+        if not rebuild:
+            # Reaching back by the lookback also catches changes committed while the last run was reading
+            changed = row[0] - timedelta(days=lookback_days)
+            cur.execute(LATE_DAYS, (changed, since, changed, since))
+            late_days = sorted(d for (d,) in cur.fetchall())
+
+        periods = {}
+        cur.execute(DELETE_VENDOR_PERIODS, ("day", since))
+        for sql in (REVIEW_DAYS, ORDER_DAYS, REVENUE_DAYS):
+            cur.execute(sql.format(**sources), (since, OPEN_END))
+        for day in late_days:
+            # Old days may already be partly archived
+            cur.execute(DELETE_VENDOR_DAY, (day,))
+            for sql in (REVIEW_DAYS, ORDER_DAYS, REVENUE_DAYS):
+                cur.execute(sql.format(**_WITH_ARCHIVE), (day, day + timedelta(days=1)))
+        cur.execute("SELECT COUNT(*) FROM Vendor_Performance_Rollup WHERE Grain = 'day' AND Period_Start >= %s",
+                    (since,))
+        periods["day"] = cur.fetchone()[0]
+        first_day = min([since, *late_days])
+        for grain, expr in GRAIN_PERIODS.items():
+            # Whole weeks / months are re-derived, from days kept by earlier runs as well
+            start = period_start(first_day, grain)
+            cur.execute(DELETE_VENDOR_PERIODS, (grain, start))
+            cur.execute(VENDOR_PERIODS.format(period=expr), (grain, start))
+            periods[grain] = cur.rowcount
+        for grain in ("day", *GRAIN_PERIODS):
+            start = period_start(first_day, grain)
+            cur.execute(DELETE_PLATFORM_PERIODS, (grain, start))
+            cur.execute(PLATFORM_PERIODS, (grain, start))
+
+        cur.execute(WRITE_WATERMARK, (ROLLUP_NAME, now))
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+    return {"rebuild": rebuild, "since": since, "late_days": len(late_days), "watermark": now, "periods": periods,
+            "elapsed_s": time.perf_counter() - started}
@@ -0,0 +1,218 @@
+# =====================================================
+# 🧾 BULK VENDOR SCORING
+# =====================================================
+# Re-scores many vendors at once: review, order-status and payment aggregates
+# are pulled with three set-based queries per chunk of vendors, scores are
+# computed column-wise in pandas, and results are written back through a
+# temporary table with one UPDATE ... JOIN and one INSERT ... SELECT upsert.
+# Same formula as fn_calculate_performance (used by sp_evaluate_vendor).
+# Order and payment counts include Orders_Archive / Payment_Archive, so an
+# archive run doesn't change anyone's score.
+import time
+
+import numpy as np
+import pandas as pd
+
+# Score weights (sum to 1); keep in sync with fn_calculate_performance
+W_RATING = 0.40
+W_SATISFACTION = 0.20
+W_DELIVERED = 0.20
+W_NOT_CANCELLED = 0.10
+W_PAYMENT = 0.10
+
+RESCORE_CHUNK = 20000       # vendor IDs per chunk
+WRITE_BATCH = 5000          # rows per multi-row INSERT into the temp table
+
+# Tables written by a rescore (for cache invalidation)
+SCORING_WRITES = {"vendor", "vendor_performance"}
+
+REVIEW_AGGREGATES = """
+    SELECT v.Vendor_ID,
+           IFNULL(s.Review_Count, 0) AS Review_Count,
+           IFNULL(s.Rated_Count, 0) AS Rated_Count,
+           IFNULL(s.Rating_Sum, 0) AS Rating_Sum,
+           IFNULL(s.Positive_Count, 0) AS Positive_Count
+    FROM Vendor v
+    LEFT JOIN Vendor_Review_Stats s ON s.Vendor_ID = v.Vendor_ID
+    WHERE {vendors}
+"""
+
+# The vendor filter sits in each branch so both halves use the Product_ID indexes
+ORDER_AGGREGATES = """
+    SELECT Vendor_ID,
+           COUNT(*) AS Orders_Total,
+           SUM(Status = 'Delivered') AS Delivered,
+           SUM(Status = 'Cancelled') AS Cancelled
+    FROM (
+        SELECT P.Vendor_ID, O.Status
+        FROM Orders O
+        JOIN Product P ON P.Product_ID = O.Product_ID
+        WHERE {vendors}
+        UNION ALL
+        SELECT P.Vendor_ID, O.Status
+        FROM Orders_Archive O
+        JOIN Product P ON P.Product_ID = O.Product_ID
+        WHERE {vendors}
+    ) o
+    GROUP BY Vendor_ID
+"""
+
+# Payments are archived together with their orders
+PAYMENT_AGGREGATES = """
+    SELECT Vendor_ID,
+           COUNT(*) AS Payments_Total,
+           SUM(Payment_Status = 'Completed') AS Payments_Completed
+    FROM (
+        SELECT P.Vendor_ID, Pay.Payment_Status
+        FROM Payment Pay
+        JOIN Orders O ON O.Order_ID = Pay.Order_ID
+        JOIN Product P ON P.Product_ID = O.Product_ID
+        WHERE {vendors}
+        UNION ALL
+        SELECT P.Vendor_ID, Pay.Payment_Status
+        FROM Payment_Archive Pay
+        JOIN Orders_Archive O ON O.Order_ID = Pay.Order_ID
+        JOIN Product P ON P.Product_ID = O.Product_ID
+        WHERE {vendors}
+    ) pay
+    GROUP BY Vendor_ID
+"""
+
+CREATE_SCORES_TABLE = """
+    CREATE TEMPORARY TABLE IF NOT EXISTS tmp_vendor_scores (
+        Vendor_ID INT PRIMARY KEY,
+        Avg_Review_Rating DECIMAL(3,2),
+        Customer_Satisfaction_Rate DECIMAL(5,2),
+        Performance_Score DECIMAL(5,2)
+    )
+"""
+INSERT_SCORES = """
+    INSERT INTO tmp_vendor_scores (Vendor_ID, Avg_Review_Rating, Customer_Satisfaction_Rate, Performance_Score)
+    VALUES (%s,%s,%s,%s)
+"""
+APPLY_SCORES = """
+    UPDATE Vendor v
+    JOIN tmp_vendor_scores t ON t.Vendor_ID = v.Vendor_ID
+    SET v.Avg_Review_Rating = t.Avg_Review_Rating,
+        v.Customer_Satisfaction_Rate = t.Customer_Satisfaction_Rate,
+        v.Performance_Score = t.Performance_Score,
+        v.Last_Evaluation_Date = CURRENT_DATE
+"""
+RECORD_SCORES = """
+    INSERT INTO Vendor_Performance (Vendor_ID, Avg_Review_Rating, Customer_Satisfaction_Rate,
+                                    Performance_Score, Last_Feedback_Date, Updated_By)
+    SELECT Vendor_ID, IFNULL(Avg_Review_Rating, 0), Customer_Satisfaction_Rate, Performance_Score, CURRENT_DATE, 'Batch'
+    FROM tmp_vendor_scores
+    ON DUPLICATE KEY UPDATE
+        Avg_Review_Rating = VALUES(Avg_Review_Rating),
+        Customer_Satisfaction_Rate = VALUES(Customer_Satisfaction_Rate),
+        Performance_Score = VALUES(Performance_Score),
+        Updated_By = VALUES(Updated_By)
+"""
+
+
+def vendor_filter(column, vendor_ids=None, id_range=None):
+    if vendor_ids is not None:
+        ids = list(vendor_ids)
+        return f"{column} IN ({', '.join(['%s'] * len(ids))})", tuple(ids)
+    return f"{column} BETWEEN %s AND %s", tuple(id_range)
+
+
+def _frame(conn, sql, params):
+    cur = conn.cursor()
+    cur.execute(sql, params)
+    df = pd.DataFrame.from_records(cur.fetchall(), columns=[d[0] for d in cur.description], coerce_float=True)
+    cur.close()
+    return df
+
+
+def load_aggregates(conn, vendor_ids=None, id_range=None):
+    # One row per vendor with every input the score needs (zeros where there is no data)
+    where, params = vendor_filter("v.Vendor_ID", vendor_ids, id_range)
+    df = _frame(conn, REVIEW_AGGREGATES.format(vendors=where), params)
+    where, params = vendor_filter("P.Vendor_ID", vendor_ids, id_range)
+    for sql in (ORDER_AGGREGATES, PAYMENT_AGGREGATES):
+        df = df.merge(_frame(conn, sql.format(vendors=where), params * 2), on="Vendor_ID", how="left")
+    conn.rollback()
+    return df.fillna(0)
+
+
+def _percent(part, whole):
+    whole = whole.astype(float)
+    return (part * 100.0 / whole.where(whole > 0)).fillna(0.0)
+
+
+def compute_scores(agg):
+    avg_rating = agg["Rating_Sum"] / agg["Rated_Count"].where(agg["Rated_Count"] > 0)
+    satisfaction = _percent(agg["Positive_Count"], agg["Review_Count"])
+    delivered = _percent(agg["Delivered"], agg["Orders_Total"])
+    not_cancelled = _percent(agg["Orders_Total"] - agg["Cancelled"], agg["Orders_Total"])
+    paid = _percent(agg["Payments_Completed"], agg["Payments_Total"])
+
+    score = (W_RATING * avg_rating.fillna(0) * 20
+             + W_SATISFACTION * satisfaction
+             + W_DELIVERED * delivered
+             + W_NOT_CANCELLED * not_cancelled
+             + W_PAYMENT * paid)
+    return pd.DataFrame({
+        "Vendor_ID": agg["Vendor_ID"].astype(int),
+        "Avg_Review_Rating": avg_rating.round(2),
+        "Customer_Satisfaction_Rate": satisfaction.round(2),
+        "Performance_Score": np.clip(score, 0, 100).round(2),
+    })
+
+
+def write_scores(conn, scores):
+    cur = conn.cursor()
+    try:
+        cur.execute(CREATE_SCORES_TABLE)
+        cur.execute("DELETE FROM tmp_vendor_scores")
+        rows = list(scores.astype(object).where(scores.notna(), None).itertuples(index=False, name=None))
+        for i in range(0, len(rows), WRITE_BATCH):
+            cur.executemany(INSERT_SCORES, rows[i:i + WRITE_BATCH])
+        cur.execute(APPLY_SCORES)
+        cur.execute(RECORD_SCORES)
+        conn.commit()
+    except BaseException:
+        conn.rollback()
+        raise
+    finally:
+        cur.close()
+    return len(scores)
+
+
+def score_vendors(conn, vendor_ids):
+    # Re-scores the given vendors in one pass (used by the evaluation worker)
+    if not vendor_ids:
+        return 0
+    return write_scores(conn, compute_scores(load_aggregates(conn, vendor_ids=vendor_ids)))
+
+
+def rescore_all(conn, chunk_size=RESCORE_CHUNK, dry_run=False, progress=None):
+    cur = conn.cursor()
+    cur.execute("SELECT IFNULL(MIN(Vendor_ID), 0), IFNULL(MAX(Vendor_ID), -1) FROM Vendor")
+    first, last = cur.fetchone()
+    cur.close()
+    conn.rollback()
+
+    started = time.perf_counter()
+    vendors = 0
+    totals = {"read_s": 0.0, "compute_s": 0.0, "write_s": 0.0}
+    for lo in range(first, last + 1, chunk_size):
+        t0 = time.perf_counter()
+        agg = load_aggregates(conn, id_range=(lo, lo + chunk_size - 1))
+        t1 = time.perf_counter()
+        scores = compute_scores(agg)
+        t2 = time.perf_counter()
+        if not dry_run and len(scores):
+            write_scores(conn, scores)
+        t3 = time.perf_counter()
+        totals["read_s"] += t1 - t0
+        totals["compute_s"] += t2 - t1
+        totals["write_s"] += t3 - t2
+        vendors += len(scores)
+        if progress:
+            progress(vendors, lo + chunk_size - 1, last)
+    elapsed = time.perf_counter() - started
+    return {"vendors": vendors, "elapsed_s": elapsed,
+            "vendors_per_s": vendors / elapsed if elapsed else 0.0, **totals}
@@ -0,0 +1,80 @@
+# =====================================================
+# 🔎 PRODUCT SEARCH (InnoDB FULLTEXT)
+# =====================================================
+# Replaces LIKE '%term%' (always a full scan) with a ranked FULLTEXT lookup on
+# Product(Name, Description), an indexed Category match, and an indexed name
+# prefix match for terms too short for the full-text parser.
+import re
+
+CATEGORIES = ["Electronics", "Clothing", "Grocery", "Books", "Home", "Others"]
+
+MIN_TERM_LENGTH = 2       # shorter terms show the regular product listing
+FT_MIN_TOKEN_SIZE = 3     # innodb_ft_min_token_size (server default)
+SEARCH_PAGE_SIZE = 25
+
+_OPERATORS = re.compile(r'[+\-<>()~*"@]')
+
+_COLUMNS = """P.Product_ID, P.Name, P.Description, P.Price, P.Stock, P.Category,
+              V.Name AS Vendor, V.Avg_Review_Rating AS Vendor_Rating"""
+_MATCH = "MATCH(P.Name, P.Description) AGAINST (%s IN BOOLEAN MODE)"
+
+
+def normalize_term(term):
+    # "  Phone ", "phone" and "PHONE" share one cache entry and one query
+    return " ".join((term or "").split()).lower()
+
+
+def boolean_query(term):
+    # every word required, each as a prefix: "blue sh" -> "+blue* +sh*" (short words dropped)
+    words = _OPERATORS.sub(" ", term).split()
+    words = [w for w in words if len(w) >= FT_MIN_TOKEN_SIZE]
+    return " ".join(f"+{w}*" for w in words) or None
+
+
+def matching_categories(term):
+    words = [w for w in term.split() if len(w) >= MIN_TERM_LENGTH]
+    return [c for c in CATEGORIES if any(c.lower().startswith(w) for w in words)]
+
+
+def search_query(term, page=0, page_size=SEARCH_PAGE_SIZE):
+    # Returns (sql, params) fetching page_size + 1 rows so the caller can tell if
+    # there is a next page without counting matches; None if nothing is searchable.
+    term = normalize_term(term)
+    ft = boolean_query(term)
+    prefix = _OPERATORS.sub("", term).replace("\\", "").replace("%", "").replace("_", "")
+    if len(term) < MIN_TERM_LENGTH or not (ft or prefix):
+        return None
+    categories = matching_categories(term)
+    branches, params = [], []
+
+    if ft:
+        branches.append(f"""
+            SELECT {_COLUMNS}, {_MATCH} AS Relevance
+            FROM Product P
+            JOIN Vendor V ON P.Vendor_ID = V.Vendor_ID
+            WHERE {_MATCH}""")
+        params += [ft, ft]
+    else:
+        # Too short for the full-text index: prefix match on idx_product_name
+        branches.append(f"""
+            SELECT {_COLUMNS}, 1 AS Relevance
+            FROM Product P
+            JOIN Vendor V ON P.Vendor_ID = V.Vendor_ID
+            WHERE P.Name LIKE %s""")
+        params.append(prefix + "%")
+
+    if categories:
+        placeholders = ", ".join(["%s"] * len(categories))
+        exclude = f" AND NOT {_MATCH}" if ft else " AND P.Name NOT LIKE %s"
+        branches.append(f"""
+            SELECT {_COLUMNS}, 0 AS Relevance
+            FROM Product P
+            JOIN Vendor V ON P.Vendor_ID = V.Vendor_ID
+            WHERE P.Category IN ({placeholders}){exclude}""")
+        params += categories + [ft if ft else params[-1]]
+
+    sql = ("SELECT * FROM (" + " UNION ALL ".join(branches) + "\n) hits"
+           "\nORDER BY Relevance DESC, Vendor_Rating DESC, Product_ID"
+           "\nLIMIT %s OFFSET %s")
+    params += [page_size + 1, page * page_size]
+    return sql, tuple(params)
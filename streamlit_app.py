@@ -2,61 +2,260 @@
 # 🚀 Vendor Performance Management System (Final Streamlit Version)
 # =====================================================
 
+import os
+from datetime import datetime, timedelta
+
 import streamlit as st
-import mysql.connector
 import pandas as pd
 from mysql.connector import Error
 
+import queries as q
+from auth import Identity, client_address, hash_password, login_limiter, sessions, verify_password
+from db import REPLICA_MAX_LAG, get_pool, get_read_pool, get_router
+from evaluation_queue import evaluation_worker
+from export import EXPORT_CHUNK, FORMATS, date_window, stream_export
+from product_import import import_products, read_upload, template_csv, upsert_sql, validate
+from orders import ORDER_WRITES, InsufficientStock, InvalidProduct, OrderError, place_order
+from order_status import STATUS_WRITES, TRANSITIONS, transition_orders
+from query_cache import DEFAULT_TTL, make_key, result_cache, tables_read, tables_written
+from query_stats import set_caller, tracer
+from search import SEARCH_PAGE_SIZE, normalize_term, search_query
+
 # =====================================================
-# 🔗 DATABASE CONNECTION
+# 🔗 DATABASE CONNECTION (pooled, reused per session)
 # =====================================================
-def create_connection():
-    return mysql.connector.connect(
-        host="localhost",
-        user="root",                # ⚠️ change this
-        password="home3120",   # ⚠️ change this
-        database="vendor_performance_db"
-    )
-
-def run_query_df(query, params=None):
-    conn = create_connection()
-    df = pd.read_sql(query, conn, params=params)
-    conn.close()
+def session_connection():
+    # Each browser session pins one pooled connection and reuses it across reruns;
+    # the pool takes it back once the session goes idle, or sooner when the pool runs out.
+    lease = st.session_state.get("_db_lease")
+    if lease is None:
+        lease = get_pool().lease()
+        st.session_state._db_lease = lease
+    return lease.connection()
+
+def read_connection(query):
+    # Read-only queries go to a read replica, except right after this process
+    # wrote one of their tables (a lagging replica could hand back stale rows,
+    # which would then be cached for everyone).
+    pool = get_read_pool()
+    if pool is get_pool() or result_cache.written_within(tables_read(query), REPLICA_MAX_LAG):
+        return session_connection()
+    return pool.connection()
+
+def release_session_connection():
+    lease = st.session_state.pop("_db_lease", None)
+    if lease is not None:
+        lease.release()
+
+def fetch_df(query, params=None):
+    # Traced read: connect / execute / fetch / DataFrame construction timed separately
+    with tracer.trace(query, params) as span:
+        span.start("connect")
+        with read_connection(query) as conn:
+            span.start("execute")
+            cur = conn.cursor()
+            cur.execute(query, params or ())
+            span.start("fetch")
+            rows = cur.fetchall()
+            columns = [d[0] for d in cur.description]
+            cur.close()
+        span.start("frame")
+        df = pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+        span.rows = len(df)
+    return df
+
+def run_query_df(query, params=None, ttl=DEFAULT_TTL):
+    # Results are shared across sessions; callers must not mutate the returned frame.
+    if not ttl:
+        return fetch_df(query, params)
+
+    key = make_key(query, params)
+    df = result_cache.get(key)
+    if df is not None:
+        tracer.cache_hit(query)
+        return df
+    tables = tables_read(query)
+    version = result_cache.version(tables)
+    df = fetch_df(query, params)
+    result_cache.put(key, df, ttl, tables, version)
     return df
 
 def run_exec(query, params=None):
-    conn = create_connection()
-    cur = conn.cursor()
-    cur.execute(query, params or ())
-    conn.commit()
-    conn.close()
+    with tracer.trace(query, params) as span:
+        span.start("connect")
+        with session_connection() as conn:
+            span.start("execute")
+            cur = conn.cursor()
+            cur.execute(query, params or ())
+            span.rows = cur.rowcount
+            span.start("commit")
+            conn.commit()
+            cur.close()
+    result_cache.invalidate(tables_written(query))
+
+def fetch_one(query, params=None):
+    with tracer.trace(query, params) as span:
+        span.start("connect")
+        with session_connection() as conn:
+            span.start("execute")
+            cur = conn.cursor()
+            cur.execute(query, params or ())
+            span.start("fetch")
+            data = cur.fetchone()
+            cur.close()
+        span.rows = int(data is not None)
+    return data
+
+def logout():
+    sessions.revoke(st.query_params.get("session"))
+    st.query_params.clear()
+    release_session_connection()
+    st.session_state.clear()
+    st.rerun()
 
 # =====================================================
-# 🧠 AUTHENTICATION FUNCTIONS
+# 🗂️ LAZY DASHBOARD SECTIONS
 # =====================================================
-def login_admin(username, password):
-    conn = create_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT * FROM Admin WHERE Username=%s AND Password=%s", (username, password))
-    data = cur.fetchone()
-    conn.close()
-    return data
+LAZY_FRAMES_PER_SESSION = 32
+
+def lazy_tabs(names, key):
+    # st.tabs executes every tab body on each rerun; a horizontal radio renders
+    # (and queries) only the selected section.
+    tab = st.radio("Section", names, horizontal=True, key=key, label_visibility="collapsed")
+    set_caller(f"{key.split('_')[0]}/{tab}")
+    return tab
+
+def section_df(query, params=None, ttl=DEFAULT_TTL):
+    # Frames fetched by a section are kept in the session and reused until one of
+    # the tables they read is written (or the user hits Refresh).
+    frames = st.session_state.setdefault("_lazy_frames", {})
+    key = make_key(query, params)
+    version = result_cache.version(tables_read(query))
+    entry = frames.pop(key, None)
+    if entry is None or entry[1] != version:
+        entry = (run_query_df(query, params, ttl=ttl), version)
+    frames[key] = entry
+    while len(frames) > LAZY_FRAMES_PER_SESSION:
+        frames.pop(next(iter(frames)))
+    return entry[0]
+
+def refresh_button(key):
+    if st.button("🔄 Refresh", key=key):
+        # Drop the shared cached results too, or the next render would just get them back
+        frames = st.session_state.pop("_lazy_frames", None) or {}
+        result_cache.discard(frames)
 
-def login_vendor(email, password):
-    conn = create_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT Vendor_ID, Name FROM Vendor WHERE Email=%s AND Password=%s", (email, password))
-    data = cur.fetchone()
-    conn.close()
-    return data
+# =====================================================
+# 📄 PAGINATED TABLES (keyset / seek pagination)
+# =====================================================
+PAGE_SIZES = [25, 50, 100, 250]
+# Time-bounded tables default to recent rows so reads stay on hot (and, for
+# Audit_Log, the most recent partitions') data as history accumulates
+PAGE_WINDOWS = {"Last 7 days": 7, "Last 30 days": 30, "Last 90 days": 90, "Last year": 365, "All time": None}
+DEFAULT_PAGE_WINDOW = "Last 30 days"
+
+def estimated_row_count(table):
+    # InnoDB's statistics estimate: no table scan, unlike COUNT(*)
+    df = run_query_df(q.ESTIMATED_ROW_COUNT, (table,), ttl=300)
+    if df.empty or pd.isna(df.iloc[0, 0]):
+        return None
+    return int(df.iloc[0, 0])
+
+def _to_param(value):
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    return value.item() if hasattr(value, "item") else value
+
+def _page_first(state):
+    state["cursors"] = [None]
+
+def _page_prev(state):
+    state["cursors"].pop()
+
+def _page_next(state):
+    state["cursors"].append(state["next"])
+
+def _window_start(label):
+    days = PAGE_WINDOWS[label]
+    if days is None:
+        return None
+    # Day-aligned so the query (and its cache key) is stable across reruns
+    return datetime.combine(datetime.now().date() - timedelta(days=days), datetime.min.time())
+
+def paginated_table(key, spec, ttl=DEFAULT_TTL):
+    state = st.session_state.setdefault(f"_page_{key}", {"cursors": [None], "next": None, "page_size": PAGE_SIZES[1],
+                                                         "window": DEFAULT_PAGE_WINDOW})
+
+    nav = st.columns([1, 1, 1, 2, 3])
+    page_size = nav[3].selectbox("Rows per page", PAGE_SIZES, index=PAGE_SIZES.index(state["page_size"]),
+                                 key=f"{key}_size", label_visibility="collapsed")
+    if page_size != state["page_size"]:
+        state.update(cursors=[None], next=None, page_size=page_size)
+    since = None
+    if spec.window_column:
+        windows = list(PAGE_WINDOWS)
+        window = st.selectbox("Window", windows, index=windows.index(state["window"]), key=f"{key}_window")
+        if window != state["window"]:
+            state.update(cursors=[None], next=None, window=window)
+        since = _window_start(window)
+
+    # One extra row tells us whether a next page exists
+    query, params = q.keyset_query(spec, state["cursors"][-1], page_size + 1, since)
+    df = section_df(query, params, ttl=ttl)
+    if len(df) > page_size:
+        df = df.head(page_size)
+        last = df.iloc[-1]
+        state["next"] = tuple(_to_param(last[col]) for _, col in spec.keys)
+    else:
+        state["next"] = None
+
+    # Buttons act through callbacks, so they can be drawn after the page is known
+    first_page = len(state["cursors"]) == 1
+    nav[0].button("⏮ First", key=f"{key}_first", disabled=first_page, on_click=_page_first, args=(state,))
+    nav[1].button("◀ Prev", key=f"{key}_prev", disabled=first_page, on_click=_page_prev, args=(state,))
+    nav[2].button("Next ▶", key=f"{key}_next", disabled=state["next"] is None, on_click=_page_next, args=(state,))
+
+    total = estimated_row_count(spec.count_table)
+    page_no = len(state["cursors"])
+    nav[4].caption(f"Page {page_no}" + (f" · ~{total:,} rows" if total is not None else ""))
+    st.dataframe(df, use_container_width=True)
+    return df
 
-def login_customer(email, password):
-    conn = create_connection()
-    cur = conn.cursor()
-    cur.execute("SELECT Customer_ID, Name FROM Customer WHERE Email=%s AND Password=%s", (email, password))
-    data = cur.fetchone()
-    conn.close()
-    return data
+# =====================================================
+# 🧠 AUTHENTICATION FUNCTIONS
+# =====================================================
+LOGIN_ERRORS = {"Admin": "Invalid Admin credentials ❌", "Vendor": "Invalid Vendor login ❌",
+                "Customer": "Invalid Customer login ❌"}
+
+def client_ip():
+    # X-Forwarded-For is only read as far as AUTH_TRUSTED_PROXY_HOPS allows
+    ctx = getattr(st, "context", None)
+    if ctx is None:
+        return None
+    return client_address(getattr(ctx, "ip_address", None), ctx.headers.get("X-Forwarded-For", ""))
+
+def login(role, identifier, password):
+    # Returns (Identity, None) or (None, error message)
+    wait = login_limiter.check(role, identifier, client_ip())
+    if wait:
+        return None, f"Too many login attempts. Try again in {wait:.0f}s ⏳"
+    row = fetch_one(q.LOGIN_QUERIES[role], (identifier,))
+    ok, rehash = verify_password(password, row[-1] if row else None)
+    if not ok:
+        return None, LOGIN_ERRORS[role]
+    login_limiter.succeeded(role, identifier)
+    if rehash:
+        run_exec(q.REHASH_PASSWORD[role], (hash_password(password), row[0]))
+    return Identity(role, row[0], row[1]), None
+
+def start_session(identity, token=None):
+    st.session_state.logged_in = True
+    st.session_state.role = identity.role
+    st.session_state.user_id = identity.user_id
+    st.session_state.username = identity.name
+    # The signed token in the URL signs a reconnecting browser back in without a query
+    # (a bearer credential: see the limits next to auth.SESSION_SECRET)
+    st.query_params["session"] = token or sessions.issue(identity)
 
 # =====================================================
 # 👑 ADMIN DASHBOARD
@@ -64,167 +263,203 @@ def login_customer(email, password):
 def admin_dashboard():
     st.title("👑 Admin Dashboard")
 
-    tabs = st.tabs(["Vendors", "Products", "Orders", "Payments", "Reviews", "Vendor Performance", "Audit Log", "Sales Report"])
+    tab = lazy_tabs(["Vendors", "Products", "Orders", "Payments", "Reviews", "Vendor Performance", "Audit Log", "Sales Report", "Export", "Performance"], key="admin_tab")
+    refresh_button("admin_tab_refresh")
 
-    with tabs[0]:
+    if tab == "Vendors":
         st.subheader("Vendor Records")
-        df = run_query_df("SELECT * FROM Vendor")
-        st.dataframe(df, use_container_width=True)
+        paginated_table("admin_vendors", q.ADMIN_VENDORS_PAGE, ttl=300)
 
-    with tabs[1]:
-        df = run_query_df("SELECT * FROM Product")
-        st.dataframe(df, use_container_width=True)
+    elif tab == "Products":
+        paginated_table("admin_products", q.ADMIN_PRODUCTS_PAGE, ttl=300)
 
-    with tabs[2]:
-        df = run_query_df("""
-            SELECT O.Order_ID, C.Name AS Customer, P.Name AS Product, O.Quantity, O.Status, O.Order_Date
-            FROM Orders O
-            JOIN Customer C ON O.Customer_ID = C.Customer_ID
-            JOIN Product P ON O.Product_ID = P.Product_ID
-        """)
-        st.dataframe(df, use_container_width=True)
+    elif tab == "Orders":
+        paginated_table("admin_orders", q.ADMIN_ORDERS_PAGE)
 
-    with tabs[3]:
-        df = run_query_df("SELECT * FROM Payment")
-        st.dataframe(df, use_container_width=True)
+    elif tab == "Payments":
+        paginated_table("admin_payments", q.ADMIN_PAYMENTS_PAGE)
 
-    with tabs[4]:
-        df = run_query_df("""
-            SELECT R.Review_ID, C.Name AS Customer, V.Name AS Vendor, P.Name AS Product,
-                   R.Rating, R.Sentiment, R.Comment, R.Review_Date
-            FROM Review R
-            JOIN Customer C ON R.Customer_ID = C.Customer_ID
-            JOIN Vendor V ON R.Vendor_ID = V.Vendor_ID
-            JOIN Product P ON R.Product_ID = P.Product_ID
-        """)
-        st.dataframe(df, use_container_width=True)
+    elif tab == "Reviews":
+        paginated_table("admin_reviews", q.ADMIN_REVIEWS_PAGE)
 
-    with tabs[5]:
-        df = run_query_df("""
-            SELECT Vendor_ID, Avg_Review_Rating, Last_Feedback_Date
-            FROM Vendor_Performance
-            ORDER BY Avg_Review_Rating DESC
-        """)
+    elif tab == "Vendor Performance":
+        df = section_df(q.ADMIN_VENDOR_PERFORMANCE, ttl=300)
         st.dataframe(df, use_container_width=True)
+        st.subheader("📉 Marketplace Trends")
+        trend_charts(q.PLATFORM_PERFORMANCE_TREND, (), key="admin_trend")
 
-    with tabs[6]:
-        df = run_query_df("SELECT Log_ID, Table_Name, Operation, Record_ID, Operation_Time FROM Audit_Log ORDER BY Operation_Time DESC")
-        st.dataframe(df, use_container_width=True)
+    elif tab == "Audit Log":
+        paginated_table("admin_audit", q.ADMIN_AUDIT_PAGE, ttl=15)
 
-    with tabs[7]:
+    elif tab == "Sales Report":
         st.subheader("📊 Vendor Sales Report")
-        df = run_query_df("""
-            SELECT 
-                v.Vendor_ID,
-                v.Name,
-                v.Business_Type,
-                v.Avg_Review_Rating,
-                IFNULL(SUM(p.Amount), 0) AS Total_Sales
-            FROM Vendor v
-            LEFT JOIN Product pr ON v.Vendor_ID = pr.Vendor_ID
-            LEFT JOIN Orders o ON pr.Product_ID = o.Product_ID
-            LEFT JOIN Payment p ON o.Order_ID = p.Order_ID AND p.Payment_Status = 'Completed'
-            GROUP BY v.Vendor_ID, v.Name, v.Business_Type, v.Avg_Review_Rating
-            ORDER BY Total_Sales DESC
-        """)
+        df = section_df(q.SALES_REPORT)
         st.dataframe(df, use_container_width=True)
 
+    elif tab == "Export":
+        export_panel()
+
+    elif tab == "Performance":
+        performance_panel()
+
     if st.button("Logout"):
-        st.session_state.clear()
-        st.rerun()
+        logout()
+
+# =====================================================
+# 📉 PERFORMANCE TRENDS (read from the rollup tables only)
+# =====================================================
+TREND_GRAINS = {"Daily": ("day", 90), "Weekly": ("week", 365), "Monthly": ("month", 3 * 365)}
+
+def trend_charts(query, params, key):
+    label = st.radio("Granularity", list(TREND_GRAINS), index=1, horizontal=True, key=f"{key}_grain")
+    grain, days = TREND_GRAINS[label]
+    since = datetime.now().date() - timedelta(days=days)
+    df = section_df(query, (*params, grain, since), ttl=300)
+    watermark = section_df(q.ROLLUP_WATERMARK, ttl=300)
+    if not watermark.empty:
+        st.caption(f"Up to {watermark.iloc[0]['Watermark']:%Y-%m-%d %H:%M}")
+    if df.empty:
+        st.info("No history yet. Rollups are built by `python maintenance.py rollup-performance`.")
+        return
+
+    df = df.set_index("Period_Start")
+    left, right = st.columns(2)
+    left.markdown("**⭐ Average rating**")
+    left.line_chart(df["Avg_Rating"])
+    right.markdown("**😊 Satisfaction rate (%)**")
+    right.line_chart(df["Satisfaction_Rate"])
+    left.markdown("**📦 Orders and cancellations**")
+    left.bar_chart(df[["Orders", "Cancelled"]])
+    right.markdown("**💵 Revenue**")
+    right.area_chart(df["Revenue"])
+
+EXPORT_DOWNLOAD_LIMIT = 200 * 1024 * 1024   # larger files stay on the server only
+
+def export_panel():
+    st.subheader("📤 Export")
+    name = st.selectbox("Dataset", list(q.EXPORTS), format_func=lambda n: n.replace("_", " ").title())
+    start = end = None
+    if q.EXPORTS[name].date_column:
+        window = st.date_input("Date range (inclusive)", value=())
+        if len(window) == 2:
+            start, end = date_window(*window)
+    fmt = st.selectbox("Format", FORMATS)
+
+    if st.button("Export"):
+        status = st.empty()
+
+        def progress(rows, elapsed):
+            if rows % (EXPORT_CHUNK * 5) == 0:
+                status.caption(f"… {rows:,} rows ({rows / elapsed:,.0f} rows/s)")
+
+        sql, params = q.export_query(q.EXPORTS[name], start, end)
+        try:
+            # Long-running: uses its own pooled connection rather than the session's
+            with tracer.trace(sql, params, name=f"admin.export.{name}") as span:
+                span.start("execute")
+                with get_read_pool().connection() as conn:
+                    result = stream_export(conn, name, start, end, fmt, progress=progress)
+                span.rows = result.rows
+        except Error as e:
+            st.error(f"Database error: {e}")
+            return
+        status.empty()
+        st.success(f"✅ {result.rows:,} rows in {result.elapsed_s:.1f}s ({result.rows_per_s:,.0f} rows/s), "
+                   f"{result.bytes / 1024 / 1024:,.1f} MB")
+        st.caption(f"Saved on the server at `{result.path}`")
+        st.session_state["_last_export"] = result
+
+    result = st.session_state.get("_last_export")
+    if result is not None and result.bytes <= EXPORT_DOWNLOAD_LIMIT:
+        with open(result.path, "rb") as f:
+            st.download_button("⬇️ Download", f, file_name=os.path.basename(result.path))
+
+def performance_panel():
+    st.subheader("🩺 Query Performance")
+    summary = pd.DataFrame(tracer.summary())
+    slow = tracer.slow_queries()
+
+    cols = st.columns(4)
+    calls = int(summary["calls"].sum()) if not summary.empty else 0
+    hits = int(summary["cache_hits"].sum()) if not summary.empty else 0
+    cols[0].metric("DB queries", f"{calls:,}")
+    cols[1].metric("Cache hit ratio", f"{hits / (hits + calls):.0%}" if hits + calls else "–")
+    cols[2].metric("DB time", f"{summary['total_ms'].sum() / 1000:,.1f} s" if not summary.empty else "0 s")
+    cols[3].metric(f"Slow (≥ {tracer.slow_ms} ms)", len(slow))
+
+    if summary.empty:
+        st.info("No queries recorded yet.")
+    else:
+        st.markdown("**Per query** (bucketed p50/p95, slowest total time first)")
+        st.dataframe(summary.round(1), use_container_width=True)
+        st.markdown("**Where the time goes** (avg ms per call)")
+        phases = summary.groupby("query")[["connect_ms", "execute_ms", "fetch_ms", "frame_ms", "commit_ms"]].mean()
+        st.bar_chart(phases.sort_values("execute_ms", ascending=False).head(15))
+
+    st.markdown("**Slow queries**")
+    if slow:
+        st.dataframe(pd.DataFrame(slow), use_container_width=True)
+    else:
+        st.caption("None so far.")
+
+    exports = st.columns(3)
+    exports[0].download_button("⬇️ Prometheus", tracer.prometheus_text(), "portal_queries.prom", "text/plain")
+    exports[1].download_button("⬇️ JSON lines", tracer.json_lines(), "portal_queries.jsonl", "application/json")
+    exports[2].button("🧹 Reset stats", on_click=tracer.reset)
+
+    with st.expander("🔌 Connection Pool"):
+        st.json(get_pool().stats())
+    with st.expander("🔐 Login Rate Limiter"):
+        st.json(login_limiter.stats())
+    router = get_router()
+    if router is not None:
+        with st.expander("🪞 Read Replicas"):
+            st.json(router.stats())
+    with st.expander("🗃️ Query Cache"):
+        st.json(result_cache.stats())
+    with st.expander("🧮 Vendor Evaluation Queue"):
+        queue = run_query_df(q.EVALUATION_QUEUE_STATS, ttl=0)
+        st.json({**queue.iloc[0].astype(int).to_dict(), **evaluation_worker.stats()})
 
 # =====================================================
 # 🧑‍💼 VENDOR DASHBOARD (With Delivery Status Fix)
 # =====================================================
 def vendor_dashboard(vendor_id, vendor_name):
     st.title(f"🧑‍💼 Vendor Dashboard — {vendor_name}")
-    tabs = st.tabs(["My Products", "Orders", "Reviews", "Performance", "Sales Summary", "Add Product"])
+    tab = lazy_tabs(["My Products", "Orders", "Reviews", "Performance", "Sales Summary", "Add Product"], key="vendor_tab")
+    refresh_button("vendor_tab_refresh")
 
     # PRODUCTS TAB
-    with tabs[0]:
+    if tab == "My Products":
         st.subheader("📦 My Products")
-        df = run_query_df("SELECT * FROM Product WHERE Vendor_ID=%s", (vendor_id,))
+        df = section_df(q.VENDOR_PRODUCTS, (vendor_id,))
         st.dataframe(df, use_container_width=True)
 
     # ORDERS TAB
-    with tabs[1]:
+    elif tab == "Orders":
         st.subheader("📜 Orders and Delivery Status")
-        df = run_query_df("""
-            SELECT 
-                O.Order_ID, 
-                C.Name AS Customer, 
-                P.Name AS Product, 
-                O.Quantity, 
-                O.Status, 
-                O.Order_Date
-            FROM Orders O
-            JOIN Customer C ON O.Customer_ID = C.Customer_ID
-            JOIN Product P ON O.Product_ID = P.Product_ID
-            WHERE P.Vendor_ID=%s
-            ORDER BY O.Order_Date DESC;
-        """, (vendor_id,))
-        if df.empty:
-            st.info("No orders found yet.")
-        else:
-            st.dataframe(df, use_container_width=True)
-
-            st.markdown("---")
-            st.subheader("🚚 Update Delivery Status")
-            order_id = st.number_input("Enter Order ID to update:", min_value=1, step=1)
-            new_status = st.selectbox("Select New Status", ["Pending", "Processing", "Shipped", "Delivered", "Cancelled"])
-
-            if st.button("Update Order Status"):
-                try:
-                    verify = run_query_df("""
-                        SELECT COUNT(*) AS cnt
-                        FROM Orders O
-                        JOIN Product P ON O.Product_ID = P.Product_ID
-                        WHERE O.Order_ID=%s AND P.Vendor_ID=%s
-                    """, (order_id, vendor_id))
-
-                    if verify.iloc[0]['cnt'] == 0:
-                        st.error("❌ This order does not belong to you.")
-                    else:
-                        run_exec("UPDATE Orders SET Status=%s WHERE Order_ID=%s", (new_status, order_id))
-                        st.success(f"✅ Order #{order_id} status updated to '{new_status}'")
-                        st.rerun()
-                except Error as e:
-                    st.error(f"Database error: {e}")
+        orders_panel(vendor_id)
 
     # REVIEWS TAB
-    with tabs[2]:
+    elif tab == "Reviews":
         st.subheader("💬 Reviews Received")
-        df = run_query_df("""
-            SELECT R.Review_ID, C.Name AS Customer, R.Rating, R.Sentiment, R.Comment, R.Review_Date
-            FROM Review R
-            JOIN Customer C ON R.Customer_ID = C.Customer_ID
-            WHERE R.Vendor_ID=%s
-            ORDER BY R.Review_Date DESC
-        """, (vendor_id,))
+        df = section_df(q.VENDOR_REVIEWS, (vendor_id,))
         st.dataframe(df, use_container_width=True)
 
     # PERFORMANCE TAB
-    with tabs[3]:
+    elif tab == "Performance":
         st.subheader("📈 Vendor Performance Metrics")
-        df = run_query_df("""
-            SELECT Vendor_ID, Avg_Review_Rating, Last_Feedback_Date
-            FROM Vendor
-            WHERE Vendor_ID=%s
-        """, (vendor_id,))
+        df = section_df(q.VENDOR_PERFORMANCE, (vendor_id,))
         st.dataframe(df, use_container_width=True)
+        st.subheader("📉 Trends")
+        trend_charts(q.VENDOR_PERFORMANCE_TREND, (vendor_id,), key="vendor_trend")
 
     # SALES SUMMARY TAB
-    with tabs[4]:
+    elif tab == "Sales Summary":
         st.subheader("💰 Sales Summary")
         
         # Total Sales
-        df_total = run_query_df("""
-            SELECT IFNULL(SUM(p.Amount), 0) AS Total_Sales
-            FROM Payment p
-            JOIN Orders o ON p.Order_ID = o.Order_ID
-            JOIN Product pr ON o.Product_ID = pr.Product_ID
-            WHERE pr.Vendor_ID = %s AND p.Payment_Status = 'Completed'
-        """, (vendor_id,))
+        df_total = section_df(q.VENDOR_TOTAL_SALES, (vendor_id,))
         
         total_sales = df_total.iloc[0]['Total_Sales']
         st.metric("💵 Total Sales Revenue", f"₹{total_sales:,.2f}")
@@ -233,19 +468,7 @@ def vendor_dashboard(vendor_id, vendor_name):
         
         # Product-wise Sales
         st.subheader("📊 Product-wise Sales Breakdown")
-        df_product_sales = run_query_df("""
-            SELECT 
-                pr.Name AS Product,
-                COUNT(o.Order_ID) AS Orders_Count,
-                SUM(o.Quantity) AS Units_Sold,
-                IFNULL(SUM(p.Amount), 0) AS Revenue
-            FROM Product pr
-            LEFT JOIN Orders o ON pr.Product_ID = o.Product_ID
-            LEFT JOIN Payment p ON o.Order_ID = p.Order_ID AND p.Payment_Status = 'Completed'
-            WHERE pr.Vendor_ID = %s
-            GROUP BY pr.Product_ID, pr.Name
-            ORDER BY Revenue DESC
-        """, (vendor_id,))
+        df_product_sales = section_df(q.VENDOR_PRODUCT_SALES, (vendor_id,))
         
         if df_product_sales.empty:
             st.info("No sales data available yet.")
@@ -253,7 +476,7 @@ def vendor_dashboard(vendor_id, vendor_name):
             st.dataframe(df_product_sales, use_container_width=True)
 
     # ADD PRODUCT TAB
-    with tabs[5]:
+    elif tab == "Add Product":
         st.subheader("➕ Add Product")
         name = st.text_input("Product Name")
         desc = st.text_area("Description")
@@ -263,96 +486,177 @@ def vendor_dashboard(vendor_id, vendor_name):
 
         if st.button("Add Product"):
             try:
-                run_exec("""
-                    INSERT INTO Product (Name, Description, Price, Stock, Category, Vendor_ID)
-                    VALUES (%s,%s,%s,%s,%s,%s)
-                """, (name, desc, price, stock, category, vendor_id))
+                run_exec(q.INSERT_PRODUCT, (name, desc, price, stock, category, vendor_id))
                 st.success("✅ Product Added Successfully!")
                 st.rerun()
             except Error as e:
                 st.error(f"Database Error: {e}")
 
+        st.markdown("---")
+        bulk_import_panel(vendor_id)
+
     if st.button("Logout"):
-        st.session_state.clear()
-        st.rerun()
+        logout()
+
+@st.fragment
+def orders_panel(vendor_id):
+    # A fragment: status updates rerun only this panel, not the whole dashboard
+    df = section_df(q.VENDOR_ORDERS, (vendor_id,))
+    if df.empty:
+        st.info("No orders found yet.")
+        return
+    st.dataframe(df, use_container_width=True)
+
+    st.markdown("---")
+    st.subheader("🚚 Update Delivery Status")
+    result = st.session_state.pop("_status_notice", None)
+    if result is not None:
+        if result.updated:
+            st.success(f"✅ {len(result.updated)} order(s) updated in {result.elapsed_s * 1000:.0f} ms")
+        if result.illegal:
+            st.warning("⚠️ Skipped (status changed meanwhile): "
+                       + ", ".join(f"#{i} ({s})" for i, s in result.illegal.items()))
+        if result.not_found:
+            st.error("❌ Not your orders: " + ", ".join(f"#{i}" for i in result.not_found))
+
+    movable = [s for s, targets in TRANSITIONS.items() if targets]
+    cols = st.columns(3)
+    current = cols[0].selectbox("Orders currently", movable, key="status_from")
+    new_status = cols[1].selectbox("Move to", TRANSITIONS[current], key="status_to")
+    select_all = cols[2].checkbox("Select all", key="status_all")
+
+    candidates = df[df["Status"] == current][["Order_ID", "Customer", "Product", "Quantity", "Order_Date"]]
+    if candidates.empty:
+        st.caption(f"No {current} orders.")
+        return
+    # Editor key changes after each update so its checkboxes start fresh
+    generation = st.session_state.setdefault("_status_generation", 0)
+    edited = st.data_editor(candidates.assign(Select=select_all), hide_index=True, use_container_width=True,
+                            disabled=list(candidates.columns), key=f"status_editor_{generation}_{current}_{select_all}")
+    chosen = edited.loc[edited["Select"], "Order_ID"].tolist()
+
+    if st.button(f"Move {len(chosen)} order(s) to {new_status}", disabled=not chosen):
+        try:
+            with tracer.trace(q.UPDATE_ORDER_STATUSES, None, name="vendor.bulk_status") as span:
+                span.start("execute")
+                with session_connection() as conn:
+                    result = transition_orders(conn, vendor_id, chosen, new_status)
+                span.rows = len(result.updated)
+        except Error as e:
+            st.error(f"Database error: {e}")
+            return
+        result_cache.invalidate(STATUS_WRITES)
+        st.session_state["_status_notice"] = result
+        st.session_state["_status_generation"] = generation + 1
+        st.rerun(scope="fragment")
+
+def bulk_import_panel(vendor_id):
+    st.subheader("📥 Bulk Upload")
+    st.caption("CSV or Excel with columns Name, Price and optionally Description, Stock, Category. "
+               "Existing products with the same name are updated.")
+    st.download_button("⬇️ Template", template_csv(), "products_template.csv", "text/csv")
+    upload = st.file_uploader("Products file", type=["csv", "xlsx"])
+    if upload is None:
+        return
+
+    try:
+        clean, errors = validate(read_upload(upload, upload.name))
+    except (ValueError, ImportError) as e:
+        st.error(f"Could not read file: {e}")
+        return
+    st.write(f"{len(clean):,} valid row(s), {len(errors):,} rejected")
+    if len(errors):
+        st.dataframe(errors, use_container_width=True)
+
+    if len(clean) and st.button(f"Import {len(clean):,} product(s)"):
+        bar = st.progress(0.0)
+        sql = upsert_sql(1)
+        try:
+            with tracer.trace(sql, (vendor_id,), name="vendor.bulk_import") as span:
+                span.start("connect")
+                with session_connection() as conn:
+                    span.start("execute")
+                    result = import_products(conn, vendor_id, clean,
+                                             progress=lambda done, total: bar.progress(done / total))
+                span.rows = result.inserted + result.updated
+        except Error as e:
+            st.error(f"Database error: {e}")
+            return
+        result_cache.invalidate(tables_written(sql))
+        st.success(f"✅ {result.inserted:,} added, {result.updated:,} updated in {result.elapsed_s:.1f}s "
+                   f"({result.rows_per_s:,.0f} rows/s)")
+        rejected = pd.concat([errors, result.errors], ignore_index=True)
+        if len(rejected):
+            st.warning(f"{len(rejected):,} row(s) were not imported")
+            st.download_button("⬇️ Rejected rows", rejected.to_csv(index=False), "rejected_rows.csv", "text/csv")
 
 # =====================================================
 # 🛒 CUSTOMER DASHBOARD
 # =====================================================
 def customer_dashboard(customer_id, customer_name):
     st.title(f"🛒 Welcome, {customer_name}")
-    tabs = st.tabs(["Browse Products", "My Orders", "Write Review", "Vendor Leaderboard"])
+    tab = lazy_tabs(["Browse Products", "My Orders", "Write Review", "Vendor Leaderboard"], key="customer_tab")
+    refresh_button("customer_tab_refresh")
 
     # Browse Products
-    with tabs[0]:
+    if tab == "Browse Products":
         search = st.text_input("Search Product or Category")
-        if search:
-            df = run_query_df("""
-                SELECT P.Product_ID, P.Name, P.Description, P.Price, P.Stock, P.Category,
-                       V.Name AS Vendor, V.Avg_Review_Rating AS Vendor_Rating
-                FROM Product P
-                JOIN Vendor V ON P.Vendor_ID = V.Vendor_ID
-                WHERE P.Name LIKE %s OR P.Category LIKE %s
-            """, (f"%{search}%", f"%{search}%"))
+        # The term is normalized before querying, so re-submitting the same text
+        # (or only changing case/spacing) reuses the previous result page.
+        term = normalize_term(search)
+        state = st.session_state.setdefault("_search", {"term": "", "page": 0, "has_next": False})
+        if term != state["term"]:
+            state.update(term=term, page=0, has_next=False)
+
+        found = search_query(term, state["page"], SEARCH_PAGE_SIZE)
+        if found:
+            query, params = found
+            df = section_df(query, params, ttl=30)
         else:
-            df = run_query_df("""
-                SELECT P.Product_ID, P.Name, P.Description, P.Price, P.Stock, P.Category,
-                       V.Name AS Vendor, V.Avg_Review_Rating AS Vendor_Rating
-                FROM Product P
-                JOIN Vendor V ON P.Vendor_ID = V.Vendor_ID
-                ORDER BY V.Avg_Review_Rating DESC
-            """)
-        st.dataframe(df, use_container_width=True)
+            df = section_df(q.PRODUCT_BROWSE, (SEARCH_PAGE_SIZE + 1, state["page"] * SEARCH_PAGE_SIZE))
+        state["has_next"] = len(df) > SEARCH_PAGE_SIZE
+
+        nav = st.columns([1, 1, 6])
+        nav[0].button("◀ Prev", key="search_prev", disabled=state["page"] == 0,
+                      on_click=lambda: state.update(page=state["page"] - 1))
+        nav[1].button("Next ▶", key="search_next", disabled=not state["has_next"],
+                      on_click=lambda: state.update(page=state["page"] + 1))
+        nav[2].caption(f"Page {state['page'] + 1}")
+        st.dataframe(df.head(SEARCH_PAGE_SIZE), use_container_width=True)
 
         pid = st.number_input("Product ID", min_value=1, step=1)
         qty = st.number_input("Quantity", min_value=1, step=1)
         pay = st.selectbox("Payment Method", ["UPI", "Credit Card", "Debit Card", "Cash", "Wallet"])
 
         if st.button("🛍️ Place Order"):
-            conn = create_connection()
-            cur = conn.cursor()
-            cur.execute("SELECT Price, Stock FROM Product WHERE Product_ID=%s", (pid,))
-            data = cur.fetchone()
-            if not data:
+            try:
+                with tracer.trace(q.INSERT_ORDER, (customer_id, pid, qty), name="customer.place_order") as span:
+                    span.start("connect")
+                    with session_connection() as conn:
+                        span.start("execute")
+                        order = place_order(conn, customer_id, pid, qty, pay)
+                    span.rows = 1
+                result_cache.invalidate(ORDER_WRITES)
+                st.success(f"✅ Order #{order.order_id} placed successfully for ₹{order.amount}")
+            except InvalidProduct:
                 st.error("Invalid Product ID!")
-            else:
-                price, stock = data
-                if qty > stock:
-                    st.error("Insufficient stock ❌")
-                else:
-                    cur.execute("INSERT INTO Orders (Customer_ID, Product_ID, Quantity, Status) VALUES (%s,%s,%s,'Pending')",
-                                (customer_id, pid, qty))
-                    order_id = cur.lastrowid
-                    amount = price * qty
-                    cur.execute("""
-                        INSERT INTO Payment (Order_ID, Customer_ID, Payment_Method, Payment_Status, Amount)
-                        VALUES (%s,%s,%s,'Completed',%s)
-                    """, (order_id, customer_id, pay, amount))
-                    conn.commit()
-                    st.success(f"✅ Order #{order_id} placed successfully for ₹{amount}")
-            conn.close()
+            except InsufficientStock as e:
+                st.error(f"Insufficient stock ❌ ({e.available} available)")
+            except OrderError as e:
+                st.error(str(e))
+            except Error as e:
+                st.error(f"Database error: {e}")
 
     # My Orders
-    with tabs[1]:
+    elif tab == "My Orders":
         st.subheader("📦 My Orders")
-        df = run_query_df("""
-            SELECT O.Order_ID, P.Name AS Product, O.Quantity, O.Status, O.Order_Date
-            FROM Orders O
-            JOIN Product P ON O.Product_ID = P.Product_ID
-            WHERE O.Customer_ID=%s
-            ORDER BY O.Order_Date DESC
-        """, (customer_id,))
+        df = section_df(q.CUSTOMER_ORDERS, (customer_id,))
         st.dataframe(df, use_container_width=True)
 
     # Write Review
-    with tabs[2]:
+    elif tab == "Write Review":
         st.subheader("⭐ Write a Review")
-        df_orders = run_query_df("""
-            SELECT DISTINCT O.Product_ID, P.Name
-            FROM Orders O
-            JOIN Product P ON O.Product_ID = P.Product_ID
-            WHERE O.Customer_ID=%s AND O.Status='Delivered'
-        """, (customer_id,))
+        df_orders = section_df(q.REVIEWABLE_PRODUCTS, (customer_id,))
         if df_orders.empty:
             st.info("You can only review delivered products.")
         else:
@@ -363,60 +667,53 @@ def customer_dashboard(customer_id, customer_name):
             comment = st.text_area("Comment")
 
             if st.button("Submit Review"):
-                conn = create_connection()
-                cur = conn.cursor()
-                cur.execute("SELECT Vendor_ID FROM Product WHERE Product_ID=%s", (product_id,))
-                vendor_id = cur.fetchone()[0]
-
-                cur.execute("SELECT COUNT(*) FROM Review WHERE Customer_ID=%s AND Product_ID=%s",
-                            (customer_id, product_id))
-                if cur.fetchone()[0] > 0:
-                    st.warning("❌ You have already reviewed this product!")
-                else:
-                    cur.execute("""
-                        INSERT INTO Review (Customer_ID, Vendor_ID, Product_ID, Comment, Rating, Sentiment)
-                        VALUES (%s,%s,%s,%s,%s,%s)
-                    """, (customer_id, vendor_id, product_id, comment, rating, sentiment))
-                    conn.commit()
-
-                    # call stored procedure
-                    cur.callproc('sp_evaluate_vendor', [vendor_id])
-                    conn.commit()
-                    st.success("✅ Review Submitted Successfully!")
-                conn.close()
+                with tracer.trace(q.INSERT_REVIEW, (customer_id, product_id), name="customer.submit_review") as span:
+                    span.start("connect")
+                    with session_connection() as conn:
+                        span.start("execute")
+                        cur = conn.cursor()
+                        cur.execute(q.PRODUCT_VENDOR, (product_id,))
+                        vendor_id = cur.fetchone()[0]
+
+                        cur.execute(q.REVIEW_EXISTS, (customer_id, product_id) * 2)
+                        if cur.fetchone()[0] > 0:
+                            st.warning("❌ You have already reviewed this product!")
+                        else:
+                            # trg_enqueue_vendor_evaluation queues the vendor re-score;
+                            # the evaluation worker picks it up in the background
+                            cur.execute(q.INSERT_REVIEW, (customer_id, vendor_id, product_id, comment, rating, sentiment))
+                            span.rows = 1
+                            span.start("commit")
+                            conn.commit()
+                            result_cache.invalidate(tables_written(q.INSERT_REVIEW))
+                            st.success("✅ Review Submitted Successfully!")
+                        cur.close()
 
     # Leaderboard
-    with tabs[3]:
+    elif tab == "Vendor Leaderboard":
         st.subheader("🏆 Vendor Leaderboard")
-        df = run_query_df("""
-            SELECT 
-                v.Vendor_ID,
-                v.Name,
-                v.Business_Type,
-                v.Avg_Review_Rating,
-                IFNULL(SUM(p.Amount), 0) AS Total_Sales
-            FROM Vendor v
-            LEFT JOIN Product pr ON v.Vendor_ID = pr.Vendor_ID
-            LEFT JOIN Orders o ON pr.Product_ID = o.Product_ID
-            LEFT JOIN Payment p ON o.Order_ID = p.Order_ID AND p.Payment_Status = 'Completed'
-            GROUP BY v.Vendor_ID, v.Name, v.Business_Type, v.Avg_Review_Rating
-            ORDER BY v.Avg_Review_Rating DESC, Total_Sales DESC
-        """)
+        df = section_df(q.LEADERBOARD)
         st.dataframe(df, use_container_width=True)
 
     if st.button("Logout"):
-        st.session_state.clear()
-        st.rerun()
+        logout()
 
 # =====================================================
 # 🏁 MAIN FUNCTION
 # =====================================================
 def main():
     st.set_page_config(page_title="Vendor Performance Portal", layout="wide")
+    set_caller("login")
+    # Background vendor re-scoring; one set of worker threads per server process
+    evaluation_worker.start()
     st.title("🚀 Vendor Performance Management System")
 
     if "logged_in" not in st.session_state:
         st.session_state.logged_in = False
+        token = st.query_params.get("session")
+        identity = sessions.resolve(token)
+        if identity is not None:
+            start_session(identity, token)
 
     if st.session_state.logged_in:
         role = st.session_state.role
@@ -438,37 +735,12 @@ def main():
         pwd = st.text_input("Password", type="password")
 
         if st.button("Login"):
-            if role == "Admin":
-                data = login_admin(user, pwd)
-                if data:
-                    st.session_state.logged_in = True
-                    st.session_state.role = "Admin"
-                    st.session_state.username = user
-                    st.rerun()
-                else:
-                    st.error("Invalid Admin credentials ❌")
-
-            elif role == "Vendor":
-                data = login_vendor(user, pwd)
-                if data:
-                    st.session_state.logged_in = True
-                    st.session_state.role = "Vendor"
-                    st.session_state.user_id = data[0]
-                    st.session_state.username = data[1]
-                    st.rerun()
-                else:
-                    st.error("Invalid Vendor login ❌")
-
+            identity, error = login(role, user, pwd)
+            if identity:
+                start_session(identity)
+                st.rerun()
             else:
-                data = login_customer(user, pwd)
-                if data:
-                    st.session_state.logged_in = True
-                    st.session_state.role = "Customer"
-                    st.session_state.user_id = data[0]
-                    st.session_state.username = data[1]
-                    st.rerun()
-                else:
-                    st.error("Invalid Customer login ❌")
+                st.error(error)
 
     else:
         role = st.selectbox("Register As", ["Vendor", "Customer"])
@@ -480,10 +752,7 @@ def main():
             business = st.selectbox("Business Type", ["Electronics", "Clothing", "Grocery", "Books", "Home", "Others"])
 
             if st.button("Register"):
-                run_exec("""
-                    INSERT INTO Vendor (Name, Email, Password, Contact_No, Business_Type)
-                    VALUES (%s,%s,%s,%s,%s)
-                """, (name, email, pwd, contact, business))
+                run_exec(q.INSERT_VENDOR, (name, email, hash_password(pwd), contact, business))
                 st.success("✅ Vendor Registered Successfully!")
 
         else:
@@ -495,10 +764,7 @@ def main():
             gender = st.selectbox("Gender", ["Male", "Female", "Other"])
 
             if st.button("Register"):
-                run_exec("""
-                    INSERT INTO Customer (Name, Email, Password, Phone, Address, Gender)
-                    VALUES (%s,%s,%s,%s,%s,%s)
-                """, (name, email, pwd, phone, addr, gender))
+                run_exec(q.INSERT_CUSTOMER, (name, email, hash_password(pwd), phone, addr, gender))
                 st.success("✅ Customer Registered Successfully!")
 
 if __name__ == "__main__":
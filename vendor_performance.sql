@@ -13,7 +13,7 @@ CREATE TABLE Vendor (
     Vendor_ID INT AUTO_INCREMENT PRIMARY KEY,
     Name VARCHAR(100) NOT NULL,
     Email VARCHAR(100) UNIQUE NOT NULL,
-    Password VARCHAR(100) NOT NULL,
+    Password VARCHAR(255) NOT NULL,           -- pbkdf2_sha256$... hash (auth.py)
     Contact_No VARCHAR(15) CHECK (Contact_No REGEXP '^[0-9]{10,15}$'),
     Business_Type ENUM('Electronics','Clothing','Grocery','Books','Home','Others') DEFAULT 'Others',
     Avg_Review_Rating DECIMAL(3,2) DEFAULT 0.00 CHECK (Avg_Review_Rating BETWEEN 0 AND 5),
@@ -49,7 +49,7 @@ CREATE TABLE Customer (
     Customer_ID INT AUTO_INCREMENT PRIMARY KEY,
     Name VARCHAR(100) NOT NULL,
     Email VARCHAR(100) UNIQUE NOT NULL,
-    Password VARCHAR(100) NOT NULL,
+    Password VARCHAR(255) NOT NULL,           -- pbkdf2_sha256$... hash (auth.py)
     Phone VARCHAR(15) CHECK (Phone REGEXP '^[0-9]{10,15}$'),
     Address VARCHAR(255),
     Gender ENUM('Male','Female','Other') DEFAULT 'Other',
@@ -67,6 +67,7 @@ CREATE TABLE Orders (
     Quantity INT DEFAULT 1 CHECK (Quantity > 0),
     Status ENUM('Pending','Processing','Shipped','Delivered','Cancelled') DEFAULT 'Pending',
     Order_Date DATETIME DEFAULT CURRENT_TIMESTAMP,
+    Updated_At DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (Customer_ID) REFERENCES Customer(Customer_ID)
         ON DELETE CASCADE
         ON UPDATE CASCADE,
@@ -87,6 +88,7 @@ CREATE TABLE Payment (
     Amount DECIMAL(10,2) NOT NULL CHECK (Amount >= 0),
     Currency CHAR(3) DEFAULT 'INR',
     Payment_Date DATETIME DEFAULT CURRENT_TIMESTAMP,
+    Updated_At DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
     FOREIGN KEY (Order_ID) REFERENCES Orders(Order_ID)
         ON DELETE CASCADE
         ON UPDATE CASCADE,
@@ -140,13 +142,33 @@ CREATE TABLE Vendor_Performance (
 -- =====================
 -- 8️⃣ Audit Log Table
 -- =====================
+-- Partitioned by month so old months can be archived / dropped instantly and
+-- time-bounded reads only touch recent partitions. New months are added by
+-- `python maintenance.py partitions` (also run by `archive`).
 CREATE TABLE Audit_Log (
-    Log_ID INT AUTO_INCREMENT PRIMARY KEY,
+    Log_ID INT AUTO_INCREMENT,
     Table_Name VARCHAR(100),
     Operation ENUM('INSERT','UPDATE','DELETE'),
     Record_ID INT,
     User_Executed VARCHAR(100),
-    Operation_Time DATETIME DEFAULT CURRENT_TIMESTAMP
+    Operation_Time DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (Log_ID, Operation_Time)   -- the partitioning column must be in every unique key
+)
+PARTITION BY RANGE COLUMNS (Operation_Time) (
+    PARTITION p_history VALUES LESS THAN ('2026-01-01'),
+    PARTITION p202601 VALUES LESS THAN ('2026-02-01'),
+    PARTITION p202602 VALUES LESS THAN ('2026-03-01'),
+    PARTITION p202603 VALUES LESS THAN ('2026-04-01'),
+    PARTITION p202604 VALUES LESS THAN ('2026-05-01'),
+    PARTITION p202605 VALUES LESS THAN ('2026-06-01'),
+    PARTITION p202606 VALUES LESS THAN ('2026-07-01'),
+    PARTITION p202607 VALUES LESS THAN ('2026-08-01'),
+    PARTITION p202608 VALUES LESS THAN ('2026-09-01'),
+    PARTITION p202609 VALUES LESS THAN ('2026-10-01'),
+    PARTITION p202610 VALUES LESS THAN ('2026-11-01'),
+    PARTITION p202611 VALUES LESS THAN ('2026-12-01'),
+    PARTITION p202612 VALUES LESS THAN ('2027-01-01'),
+    PARTITION pmax VALUES LESS THAN (MAXVALUE)
 );
 
 -- =====================
@@ -155,17 +177,188 @@ CREATE TABLE Audit_Log (
 CREATE TABLE Admin (
     Admin_ID INT AUTO_INCREMENT PRIMARY KEY,
     Username VARCHAR(100) UNIQUE NOT NULL,
-    Password VARCHAR(100) NOT NULL
+    Password VARCHAR(255) NOT NULL            -- pbkdf2_sha256$... hash (auth.py)
 );
 
+-- Plaintext seed: hashed on first login (or by `python maintenance.py migrate-passwords`)
 INSERT INTO Admin (Username, Password) VALUES ('admin', 'admin123');
 
+-- =====================
+-- 🔟 Vendor Review Stats (running aggregates maintained by trg_update_vendor_rating)
+-- =====================
+CREATE TABLE Vendor_Review_Stats (
+    Vendor_ID INT PRIMARY KEY,
+    Review_Count INT NOT NULL DEFAULT 0,
+    Rated_Count INT NOT NULL DEFAULT 0,
+    Rating_Sum INT NOT NULL DEFAULT 0,
+    Positive_Count INT NOT NULL DEFAULT 0,
+    FOREIGN KEY (Vendor_ID) REFERENCES Vendor(Vendor_ID)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE
+);
+
+-- =====================
+-- 1️⃣1️⃣ Sales Summary (per-vendor / per-product rollups maintained by triggers)
+-- =====================
+CREATE TABLE Vendor_Sales_Summary (
+    Vendor_ID INT PRIMARY KEY,
+    Total_Revenue DECIMAL(14,2) NOT NULL DEFAULT 0.00,   -- completed payments only
+    Orders_Count INT NOT NULL DEFAULT 0,
+    Units_Sold INT NOT NULL DEFAULT 0,
+    FOREIGN KEY (Vendor_ID) REFERENCES Vendor(Vendor_ID)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE,
+    INDEX idx_vendor_sales_revenue (Total_Revenue)
+);
+
+CREATE TABLE Product_Sales_Summary (
+    Product_ID INT PRIMARY KEY,
+    Vendor_ID INT NOT NULL,
+    Revenue DECIMAL(14,2) NOT NULL DEFAULT 0.00,         -- completed payments only
+    Orders_Count INT NOT NULL DEFAULT 0,
+    Units_Sold INT NOT NULL DEFAULT 0,
+    FOREIGN KEY (Product_ID) REFERENCES Product(Product_ID)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE,
+    INDEX idx_product_sales_vendor (Vendor_ID, Revenue)
+);
+
+-- =====================
+-- 1️⃣2️⃣ Vendor Evaluation Queue (one row per vendor awaiting re-evaluation; see evaluation_queue.py)
+-- =====================
+CREATE TABLE Vendor_Evaluation_Queue (
+    Vendor_ID INT PRIMARY KEY,                       -- repeated requests coalesce into one row
+    Requested_Count INT NOT NULL DEFAULT 1,
+    First_Requested_At DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+    Last_Requested_At DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+    Not_Before DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),   -- retry backoff
+    Claimed_At DATETIME(3) DEFAULT NULL,
+    Claimed_By VARCHAR(100) DEFAULT NULL,
+    Attempts INT NOT NULL DEFAULT 0,
+    Last_Error VARCHAR(255) DEFAULT NULL,
+    FOREIGN KEY (Vendor_ID) REFERENCES Vendor(Vendor_ID)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE,
+    INDEX idx_eval_queue_first (First_Requested_At)
+);
+
+-- =====================
+-- 1️⃣3️⃣ Vendor Performance Rollups (day / week / month history; built by rollups.py)
+-- =====================
+-- Sums and counts rather than averages, so coarser periods roll up exactly.
+-- Orders are bucketed by Order_Date, revenue by Payment_Date, reviews by Review_Date.
+CREATE TABLE Vendor_Performance_Rollup (
+    Vendor_ID INT NOT NULL,
+    Grain ENUM('day','week','month') NOT NULL,
+    Period_Start DATE NOT NULL,                      -- weeks start on Monday
+    Review_Count INT NOT NULL DEFAULT 0,
+    Rated_Count INT NOT NULL DEFAULT 0,
+    Rating_Sum INT NOT NULL DEFAULT 0,
+    Positive_Count INT NOT NULL DEFAULT 0,
+    Orders_Count INT NOT NULL DEFAULT 0,
+    Delivered_Count INT NOT NULL DEFAULT 0,
+    Cancelled_Count INT NOT NULL DEFAULT 0,
+    Revenue DECIMAL(14,2) NOT NULL DEFAULT 0.00,     -- completed payments only
+    PRIMARY KEY (Vendor_ID, Grain, Period_Start),
+    FOREIGN KEY (Vendor_ID) REFERENCES Vendor(Vendor_ID)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE,
+    INDEX idx_rollup_grain_period (Grain, Period_Start)
+);
+
+-- Marketplace totals per period (admin trends), summed from the vendor rollups
+CREATE TABLE Platform_Performance_Rollup (
+    Grain ENUM('day','week','month') NOT NULL,
+    Period_Start DATE NOT NULL,
+    Active_Vendors INT NOT NULL DEFAULT 0,
+    Review_Count INT NOT NULL DEFAULT 0,
+    Rated_Count INT NOT NULL DEFAULT 0,
+    Rating_Sum INT NOT NULL DEFAULT 0,
+    Positive_Count INT NOT NULL DEFAULT 0,
+    Orders_Count INT NOT NULL DEFAULT 0,
+    Delivered_Count INT NOT NULL DEFAULT 0,
+    Cancelled_Count INT NOT NULL DEFAULT 0,
+    Revenue DECIMAL(14,2) NOT NULL DEFAULT 0.00,
+    PRIMARY KEY (Grain, Period_Start)
+);
+
+-- How far each incremental job has got
+CREATE TABLE Rollup_Watermark (
+    Name VARCHAR(50) PRIMARY KEY,
+    Watermark DATETIME NOT NULL,
+    Updated_At DATETIME DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+-- =========================================
+-- 📇 SECONDARY INDEXES (app access paths; see index_advisor.py)
+-- =========================================
+-- Customer "My Orders" (WHERE Customer_ID ORDER BY Order_Date) and review eligibility
+CREATE INDEX idx_orders_customer_date ON Orders (Customer_ID, Order_Date);
+CREATE INDEX idx_orders_customer_status ON Orders (Customer_ID, Status, Product_ID);
+-- Vendor orders: join from the vendor's products, newest first
+CREATE INDEX idx_orders_product_date ON Orders (Product_ID, Order_Date);
+CREATE INDEX idx_orders_date ON Orders (Order_Date);
+-- Rollup refresh: days of orders changed since the last run (rollups.py)
+CREATE INDEX idx_orders_updated ON Orders (Updated_At, Order_Date);
+
+-- Vendor "Reviews Received" (WHERE Vendor_ID ORDER BY Review_Date)
+CREATE INDEX idx_review_vendor_date ON Review (Vendor_ID, Review_Date);
+CREATE INDEX idx_review_date ON Review (Review_Date);
+
+-- Audit log newest-first pagination (InnoDB appends Log_ID to the key)
+CREATE INDEX idx_audit_time ON Audit_Log (Operation_Time);
+
+-- Covering index for revenue lookups per order
+CREATE INDEX idx_payment_order_status_amount ON Payment (Order_ID, Payment_Status, Amount);
+CREATE INDEX idx_payment_status ON Payment (Payment_Status);
+-- Date-range exports (export.py)
+CREATE INDEX idx_payment_date ON Payment (Payment_Date);
+CREATE INDEX idx_payment_updated ON Payment (Updated_At, Payment_Date);
+
+-- Category filter and rating-ordered browse / leaderboard
+CREATE INDEX idx_product_category ON Product (Category);
+
+-- Product search (search.py): ranked full-text match, plus name prefix for short terms
+CREATE FULLTEXT INDEX ft_product_name_desc ON Product (Name, Description);
+CREATE INDEX idx_product_name ON Product (Name);
+CREATE INDEX idx_vendor_rating ON Vendor (Avg_Review_Rating);
+CREATE INDEX idx_vendor_perf_rating ON Vendor_Performance (Avg_Review_Rating);
+
+-- =========================================
+-- 🗄️ ARCHIVE TABLES (cold rows moved by `python maintenance.py archive`, see archive.py)
+-- =========================================
+-- Orders, Payment and Review are linked by foreign keys, which MySQL does not
+-- allow on partitioned tables, so their history is moved out in chunks instead.
+-- Same columns and indexes as the live tables (CREATE TABLE ... LIKE), no foreign
+-- keys, compressed. Keep them in step with any column added to the live tables.
+CREATE TABLE Orders_Archive LIKE Orders;
+ALTER TABLE Orders_Archive ROW_FORMAT=COMPRESSED;
+
+CREATE TABLE Payment_Archive LIKE Payment;
+ALTER TABLE Payment_Archive ROW_FORMAT=COMPRESSED;
+
+CREATE TABLE Review_Archive LIKE Review;
+ALTER TABLE Review_Archive ROW_FORMAT=COMPRESSED;
+
+-- Archived Audit_Log partitions (not partitioned itself)
+CREATE TABLE Audit_Log_Archive (
+    Log_ID INT NOT NULL,
+    Table_Name VARCHAR(100),
+    Operation ENUM('INSERT','UPDATE','DELETE'),
+    Record_ID INT,
+    User_Executed VARCHAR(100),
+    Operation_Time DATETIME NOT NULL,
+    PRIMARY KEY (Log_ID, Operation_Time),
+    INDEX idx_audit_archive_time (Operation_Time)
+) ROW_FORMAT=COMPRESSED;
+
 -- =========================================
 -- ⚡ TRIGGERS
 -- =========================================
 DELIMITER //
 
 -- 🔸 Update vendor rating safely (no recursion)
+-- O(1) per review: bumps the vendor's running aggregates instead of re-scanning Review
 CREATE TRIGGER trg_update_vendor_rating
 AFTER INSERT ON Review
 FOR EACH ROW
@@ -174,13 +367,32 @@ BEGIN
     DECLARE satisfaction_rate DECIMAL(5,2);
     DECLARE positive_count INT;
     DECLARE total_count INT;
-    
-    SET new_avg = (SELECT AVG(Rating) FROM Review WHERE Vendor_ID = NEW.Vendor_ID);
-    
-    -- Calculate satisfaction rate as percentage of positive reviews (rating >= 4 or sentiment = 'Positive')
-    SET total_count = (SELECT COUNT(*) FROM Review WHERE Vendor_ID = NEW.Vendor_ID);
-    SET positive_count = (SELECT COUNT(*) FROM Review WHERE Vendor_ID = NEW.Vendor_ID AND (Rating >= 4 OR Sentiment = 'Positive'));
-    
+    DECLARE rated_count INT;
+    DECLARE rating_sum INT;
+
+    -- Positive review: rating >= 4 or sentiment = 'Positive'
+    INSERT INTO Vendor_Review_Stats (Vendor_ID, Review_Count, Rated_Count, Rating_Sum, Positive_Count)
+    VALUES (NEW.Vendor_ID, 1, IF(NEW.Rating IS NULL, 0, 1), IFNULL(NEW.Rating, 0),
+            IF(NEW.Rating >= 4 OR NEW.Sentiment = 'Positive', 1, 0))
+    ON DUPLICATE KEY UPDATE
+        Review_Count = Review_Count + 1,
+        Rated_Count = Rated_Count + IF(NEW.Rating IS NULL, 0, 1),
+        Rating_Sum = Rating_Sum + IFNULL(NEW.Rating, 0),
+        Positive_Count = Positive_Count + IF(NEW.Rating >= 4 OR NEW.Sentiment = 'Positive', 1, 0);
+
+    SELECT Review_Count, Rated_Count, Rating_Sum, Positive_Count
+    INTO total_count, rated_count, rating_sum, positive_count
+    FROM Vendor_Review_Stats
+    WHERE Vendor_ID = NEW.Vendor_ID;
+
+    -- Same semantics as AVG(Rating): NULL ratings are ignored
+    IF rated_count > 0 THEN
+        SET new_avg = rating_sum / rated_count;
+    ELSE
+        SET new_avg = NULL;
+    END IF;
+
+    -- Calculate satisfaction rate as percentage of positive reviews
     IF total_count > 0 THEN
         SET satisfaction_rate = (positive_count * 100.0 / total_count);
     ELSE
@@ -202,6 +414,20 @@ BEGIN
 END;
 //
 
+-- 🔸 Queue the vendor for re-evaluation (coalesced per vendor, processed by evaluation_queue.py)
+CREATE TRIGGER trg_enqueue_vendor_evaluation
+AFTER INSERT ON Review
+FOR EACH ROW
+FOLLOWS trg_update_vendor_rating
+BEGIN
+    INSERT INTO Vendor_Evaluation_Queue (Vendor_ID)
+    VALUES (NEW.Vendor_ID)
+    ON DUPLICATE KEY UPDATE
+        Requested_Count = Requested_Count + 1,
+        Last_Requested_At = CURRENT_TIMESTAMP(3);
+END;
+//
+
 -- 🔸 Reduce stock after an order
 CREATE TRIGGER trg_reduce_stock
 AFTER INSERT ON Orders
@@ -213,6 +439,62 @@ BEGIN
 END;
 //
 
+-- 🔸 Count orders and units in the sales summary
+CREATE TRIGGER trg_sales_order_insert
+AFTER INSERT ON Orders
+FOR EACH ROW
+BEGIN
+    DECLARE vendor INT;
+    SELECT Vendor_ID INTO vendor FROM Product WHERE Product_ID = NEW.Product_ID;
+
+    INSERT INTO Product_Sales_Summary (Product_ID, Vendor_ID, Orders_Count, Units_Sold)
+    VALUES (NEW.Product_ID, vendor, 1, NEW.Quantity)
+    ON DUPLICATE KEY UPDATE
+        Orders_Count = Orders_Count + 1,
+        Units_Sold = Units_Sold + NEW.Quantity;
+
+    INSERT INTO Vendor_Sales_Summary (Vendor_ID, Orders_Count, Units_Sold)
+    VALUES (vendor, 1, NEW.Quantity)
+    ON DUPLICATE KEY UPDATE
+        Orders_Count = Orders_Count + 1,
+        Units_Sold = Units_Sold + NEW.Quantity;
+END;
+//
+
+-- 🔸 Add revenue when a payment is recorded as completed
+CREATE TRIGGER trg_sales_payment_insert
+AFTER INSERT ON Payment
+FOR EACH ROW
+BEGIN
+    IF NEW.Payment_Status = 'Completed' THEN
+        CALL sp_apply_sales_delta(NEW.Order_ID, NEW.Amount);
+    END IF;
+END;
+//
+
+-- 🔸 Move revenue when a payment completes, is refunded or fails
+CREATE TRIGGER trg_sales_payment_update
+AFTER UPDATE ON Payment
+FOR EACH ROW
+BEGIN
+    IF OLD.Payment_Status = 'Completed' THEN
+        CALL sp_apply_sales_delta(OLD.Order_ID, -OLD.Amount);
+    END IF;
+    IF NEW.Payment_Status = 'Completed' THEN
+        CALL sp_apply_sales_delta(NEW.Order_ID, NEW.Amount);
+    END IF;
+END;
+//
+
+-- 🔸 Every vendor gets a sales summary row (so reports can read it directly)
+CREATE TRIGGER trg_sales_vendor_insert
+AFTER INSERT ON Vendor
+FOR EACH ROW
+BEGIN
+    INSERT IGNORE INTO Vendor_Sales_Summary (Vendor_ID) VALUES (NEW.Vendor_ID);
+END;
+//
+
 -- 🔸 Log vendor insertions
 CREATE TRIGGER trg_audit_insert_vendor
 AFTER INSERT ON Vendor
@@ -223,6 +505,23 @@ BEGIN
 END;
 //
 
+-- 🔸 Only legal order-status moves (same table as order_status.TRANSITIONS):
+--    Pending -> Processing / Cancelled, Processing -> Shipped / Cancelled, Shipped -> Delivered
+CREATE TRIGGER trg_orders_status_transition
+BEFORE UPDATE ON Orders
+FOR EACH ROW
+BEGIN
+    IF NEW.Status <> OLD.Status AND NOT (
+           (OLD.Status = 'Pending' AND NEW.Status IN ('Processing', 'Cancelled'))
+        OR (OLD.Status = 'Processing' AND NEW.Status IN ('Shipped', 'Cancelled'))
+        OR (OLD.Status = 'Shipped' AND NEW.Status = 'Delivered')
+    ) THEN
+        SIGNAL SQLSTATE '45000'
+            SET MESSAGE_TEXT = 'Illegal order status transition';
+    END IF;
+END;
+//
+
 DELIMITER ;
 
 -- =========================================
@@ -230,23 +529,93 @@ DELIMITER ;
 -- =========================================
 DELIMITER //
 
--- Calculate vendor total sales
+-- Calculate vendor total sales (reads the maintained rollup)
 CREATE FUNCTION fn_total_sales(vendorId INT)
-RETURNS DECIMAL(10,2)
-DETERMINISTIC
+RETURNS DECIMAL(14,2)
+READS SQL DATA
 BEGIN
-    DECLARE total DECIMAL(10,2);
+    DECLARE total DECIMAL(14,2);
     SET total = (
-        SELECT IFNULL(SUM(P.Amount),0)
-        FROM Payment P
-        JOIN Orders O ON O.Order_ID = P.Order_ID
-        JOIN Product PR ON PR.Product_ID = O.Product_ID
-        WHERE PR.Vendor_ID = vendorId AND P.Payment_Status='Completed'
+        SELECT IFNULL(MAX(Total_Revenue), 0)
+        FROM Vendor_Sales_Summary
+        WHERE Vendor_ID = vendorId
     );
     RETURN total;
 END;
 //
 
+-- Performance score 0-100 (same weights as scoring.py, keep them in sync):
+--   40% average rating, 20% satisfaction (positive reviews), 20% delivered orders,
+--   10% orders not cancelled, 10% completed payments. Components without data score 0.
+-- Archived orders and payments still count, so archival doesn't move scores.
+CREATE FUNCTION fn_calculate_performance(vendorId INT)
+RETURNS DECIMAL(5,2)
+READS SQL DATA
+BEGIN
+    DECLARE rated INT DEFAULT 0;
+    DECLARE rating_sum INT DEFAULT 0;
+    DECLARE reviews INT DEFAULT 0;
+    DECLARE positive INT DEFAULT 0;
+    DECLARE orders_total INT DEFAULT 0;
+    DECLARE delivered INT DEFAULT 0;
+    DECLARE cancelled INT DEFAULT 0;
+    DECLARE payments_total INT DEFAULT 0;
+    DECLARE completed INT DEFAULT 0;
+    DECLARE score DECIMAL(9,4) DEFAULT 0;
+
+    SELECT IFNULL(SUM(Rated_Count), 0), IFNULL(SUM(Rating_Sum), 0),
+           IFNULL(SUM(Review_Count), 0), IFNULL(SUM(Positive_Count), 0)
+    INTO rated, rating_sum, reviews, positive
+    FROM Vendor_Review_Stats
+    WHERE Vendor_ID = vendorId;
+
+    SELECT COUNT(*), IFNULL(SUM(o.Status = 'Delivered'), 0), IFNULL(SUM(o.Status = 'Cancelled'), 0)
+    INTO orders_total, delivered, cancelled
+    FROM (
+        SELECT O.Status
+        FROM Orders O
+        JOIN Product P ON P.Product_ID = O.Product_ID
+        WHERE P.Vendor_ID = vendorId
+        UNION ALL
+        SELECT O.Status
+        FROM Orders_Archive O
+        JOIN Product P ON P.Product_ID = O.Product_ID
+        WHERE P.Vendor_ID = vendorId
+    ) o;
+
+    SELECT COUNT(*), IFNULL(SUM(pay.Payment_Status = 'Completed'), 0)
+    INTO payments_total, completed
+    FROM (
+        SELECT Pay.Payment_Status
+        FROM Payment Pay
+        JOIN Orders O ON O.Order_ID = Pay.Order_ID
+        JOIN Product P ON P.Product_ID = O.Product_ID
+        WHERE P.Vendor_ID = vendorId
+        UNION ALL
+        SELECT Pay.Payment_Status
+        FROM Payment_Archive Pay
+        JOIN Orders_Archive O ON O.Order_ID = Pay.Order_ID
+        JOIN Product P ON P.Product_ID = O.Product_ID
+        WHERE P.Vendor_ID = vendorId
+    ) pay;
+
+    IF rated > 0 THEN
+        SET score = score + 0.40 * (rating_sum / rated) * 20;
+    END IF;
+    IF reviews > 0 THEN
+        SET score = score + 0.20 * positive * 100 / reviews;
+    END IF;
+    IF orders_total > 0 THEN
+        SET score = score + 0.20 * delivered * 100 / orders_total
+                          + 0.10 * (orders_total - cancelled) * 100 / orders_total;
+    END IF;
+    IF payments_total > 0 THEN
+        SET score = score + 0.10 * completed * 100 / payments_total;
+    END IF;
+    RETURN LEAST(GREATEST(ROUND(score, 2), 0), 100);
+END;
+//
+
 DELIMITER ;
 
 -- =========================================
@@ -258,15 +627,24 @@ DELIMITER //
 CREATE PROCEDURE sp_evaluate_vendor(IN vendorId INT)
 BEGIN
     DECLARE score DECIMAL(5,2);
-    DECLARE satisfaction_rate DECIMAL(5,2);
-    DECLARE positive_count INT;
-    DECLARE total_count INT;
+    DECLARE satisfaction_rate DECIMAL(5,2) DEFAULT 0.00;
+    DECLARE positive_count INT DEFAULT 0;
+    DECLARE total_count INT DEFAULT 0;
     
     -- Calculate performance score
     SET score = fn_calculate_performance(vendorId);
+
+    SELECT IFNULL(SUM(Positive_Count), 0), IFNULL(SUM(Review_Count), 0)
+    INTO positive_count, total_count
+    FROM Vendor_Review_Stats
+    WHERE Vendor_ID = vendorId;
+    IF total_count > 0 THEN
+        SET satisfaction_rate = positive_count * 100.0 / total_count;
+    END IF;
     
     UPDATE Vendor
     SET Performance_Score = score,
+        Customer_Satisfaction_Rate = satisfaction_rate,
         Last_Evaluation_Date = CURRENT_DATE
     WHERE Vendor_ID = vendorId;
 
@@ -279,12 +657,146 @@ BEGIN
 END;
 //
 
+-- Rebuild running review aggregates from Review + Review_Archive (reconciliation / backfill)
+CREATE PROCEDURE sp_rebuild_vendor_review_stats()
+BEGIN
+    START TRANSACTION;
+
+    DELETE FROM Vendor_Review_Stats;
+
+    INSERT INTO Vendor_Review_Stats (Vendor_ID, Review_Count, Rated_Count, Rating_Sum, Positive_Count)
+    SELECT Vendor_ID,
+           COUNT(*),
+           COUNT(Rating),
+           IFNULL(SUM(Rating), 0),
+           SUM(IF(Rating >= 4 OR Sentiment = 'Positive', 1, 0))
+    FROM (
+        SELECT Vendor_ID, Rating, Sentiment FROM Review
+        UNION ALL
+        SELECT Vendor_ID, Rating, Sentiment FROM Review_Archive
+    ) r
+    GROUP BY Vendor_ID;
+
+    UPDATE Vendor v
+    JOIN Vendor_Review_Stats s ON s.Vendor_ID = v.Vendor_ID
+    SET v.Avg_Review_Rating = IF(s.Rated_Count > 0, s.Rating_Sum / s.Rated_Count, NULL),
+        v.Customer_Satisfaction_Rate = s.Positive_Count * 100.0 / s.Review_Count;
+
+    COMMIT;
+END;
+//
+
+-- List vendors whose running aggregates disagree with Review + Review_Archive
+CREATE PROCEDURE sp_check_vendor_review_stats()
+BEGIN
+    SELECT ids.Vendor_ID,
+           a.Review_Count AS Expected_Review_Count, s.Review_Count AS Stored_Review_Count,
+           a.Rating_Sum AS Expected_Rating_Sum, s.Rating_Sum AS Stored_Rating_Sum,
+           a.Positive_Count AS Expected_Positive_Count, s.Positive_Count AS Stored_Positive_Count
+    FROM (
+        SELECT Vendor_ID FROM Review
+        UNION
+        SELECT Vendor_ID FROM Review_Archive
+        UNION
+        SELECT Vendor_ID FROM Vendor_Review_Stats
+    ) ids
+    LEFT JOIN (
+        SELECT Vendor_ID,
+               COUNT(*) AS Review_Count,
+               COUNT(Rating) AS Rated_Count,
+               IFNULL(SUM(Rating), 0) AS Rating_Sum,
+               SUM(IF(Rating >= 4 OR Sentiment = 'Positive', 1, 0)) AS Positive_Count
+        FROM (
+            SELECT Vendor_ID, Rating, Sentiment FROM Review
+            UNION ALL
+            SELECT Vendor_ID, Rating, Sentiment FROM Review_Archive
+        ) r
+        GROUP BY Vendor_ID
+    ) a ON a.Vendor_ID = ids.Vendor_ID
+    LEFT JOIN Vendor_Review_Stats s ON s.Vendor_ID = ids.Vendor_ID
+    WHERE NOT (IFNULL(a.Review_Count, 0) <=> IFNULL(s.Review_Count, 0)
+               AND IFNULL(a.Rated_Count, 0) <=> IFNULL(s.Rated_Count, 0)
+               AND IFNULL(a.Rating_Sum, 0) <=> IFNULL(s.Rating_Sum, 0)
+               AND IFNULL(a.Positive_Count, 0) <=> IFNULL(s.Positive_Count, 0));
+END;
+//
+
+-- Apply a revenue change for one order to the product and vendor rollups
+CREATE PROCEDURE sp_apply_sales_delta(IN orderId INT, IN delta DECIMAL(14,2))
+BEGIN
+    DECLARE prod INT;
+    DECLARE vendor INT;
+
+    SELECT O.Product_ID, PR.Vendor_ID INTO prod, vendor
+    FROM Orders O
+    JOIN Product PR ON PR.Product_ID = O.Product_ID
+    WHERE O.Order_ID = orderId;
+
+    INSERT INTO Product_Sales_Summary (Product_ID, Vendor_ID, Revenue)
+    VALUES (prod, vendor, delta)
+    ON DUPLICATE KEY UPDATE Revenue = Revenue + delta;
+
+    INSERT INTO Vendor_Sales_Summary (Vendor_ID, Total_Revenue)
+    VALUES (vendor, delta)
+    ON DUPLICATE KEY UPDATE Total_Revenue = Total_Revenue + delta;
+END;
+//
+
+-- Rebuild the sales rollups from Orders / Payment and their archives (backfill / reconciliation)
+CREATE PROCEDURE sp_rebuild_sales_summary()
+BEGIN
+    START TRANSACTION;
+
+    DELETE FROM Product_Sales_Summary;
+    DELETE FROM Vendor_Sales_Summary;
+
+    INSERT INTO Product_Sales_Summary (Product_ID, Vendor_ID, Revenue, Orders_Count, Units_Sold)
+    SELECT pr.Product_ID, pr.Vendor_ID,
+           IFNULL(rev.Revenue, 0), IFNULL(ord.Orders_Count, 0), IFNULL(ord.Units_Sold, 0)
+    FROM Product pr
+    LEFT JOIN (
+        SELECT Product_ID, COUNT(*) AS Orders_Count, SUM(Quantity) AS Units_Sold
+        FROM (
+            SELECT Product_ID, Quantity FROM Orders
+            UNION ALL
+            SELECT Product_ID, Quantity FROM Orders_Archive
+        ) o
+        GROUP BY Product_ID
+    ) ord ON ord.Product_ID = pr.Product_ID
+    LEFT JOIN (
+        SELECT Product_ID, SUM(Amount) AS Revenue
+        FROM (
+            SELECT o.Product_ID, p.Amount
+            FROM Payment p
+            JOIN Orders o ON o.Order_ID = p.Order_ID
+            WHERE p.Payment_Status = 'Completed'
+            UNION ALL
+            SELECT o.Product_ID, p.Amount
+            FROM Payment_Archive p
+            JOIN Orders_Archive o ON o.Order_ID = p.Order_ID
+            WHERE p.Payment_Status = 'Completed'
+        ) paid
+        GROUP BY Product_ID
+    ) rev ON rev.Product_ID = pr.Product_ID;
+
+    INSERT INTO Vendor_Sales_Summary (Vendor_ID, Total_Revenue, Orders_Count, Units_Sold)
+    SELECT v.Vendor_ID,
+           IFNULL(SUM(s.Revenue), 0), IFNULL(SUM(s.Orders_Count), 0), IFNULL(SUM(s.Units_Sold), 0)
+    FROM Vendor v
+    LEFT JOIN Product_Sales_Summary s ON s.Vendor_ID = v.Vendor_ID
+    GROUP BY v.Vendor_ID;
+
+    COMMIT;
+END;
+//
+
 -- Generate vendor leaderboard report
 CREATE PROCEDURE sp_vendor_report()
 BEGIN
     SELECT v.Vendor_ID, v.Name, v.Business_Type, v.Performance_Score,
-           fn_total_sales(v.Vendor_ID) AS Total_Sales
+           IFNULL(s.Total_Revenue, 0) AS Total_Sales
     FROM Vendor v
+    LEFT JOIN Vendor_Sales_Summary s ON s.Vendor_ID = v.Vendor_ID
     ORDER BY Performance_Score DESC;
 END;
 //